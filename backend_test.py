@@ -4,20 +4,48 @@ Comprehensive Backend API Testing for BuildCRM SaaS System
 Tests all API endpoints with proper authentication and multi-tenant isolation
 """
 
+import argparse
+import sys
+import threading
 import requests
 import json
 import uuid
 from datetime import datetime, timedelta
 import time
 
-# Configuration
-BASE_URL = "https://expense-fix.preview.emergentagent.com/api"
-SUPER_ADMIN_EMAIL = "admin@buildcrm.com"
-SUPER_ADMIN_PASSWORD = "admin123"
+from harness.baseline import add_baseline_arguments, handle_baseline_options
+from harness.cassette import add_cassette_arguments, close_cassette, install_cassette
+from harness.config import BASE_URL, SUPER_ADMIN_EMAIL, SUPER_ADMIN_PASSWORD
+from harness.ledger import ResourceLedger, print_teardown_summary, teardown
+from harness.listing import ListReadError, count_records, find_record
+from harness.results import add_result_arguments, get_result_sink, handle_result_options
+from harness.scheduler import run_scheduled
+from harness.schemas import validate
+from harness.session import get_session, print_connection_summary, print_latency_report
+from harness.tokens import cached_login, cached_tenant
+
+# Declared test dependencies for the parallel scheduler (client_registration gates every tenant-scoped test)
+TENANT_TESTS = [
+    'auth_me', 'client_stats', 'leads_crud', 'projects_crud', 'tasks_crud',
+    'expenses_crud', 'user_management', 'reports', 'client_modules',
+    'multi_tenant', 'webhook'
+]
+TEST_DEPENDENCIES = {
+    'super_admin_stats': ['super_admin_login'],
+    'super_admin_clients': ['super_admin_login', 'client_registration'],
+    **{name: ['client_registration'] for name in TENANT_TESTS},
+    # super_admin_clients pauses the client for a moment, and the webhook rejects paused clients
+    'webhook': ['client_registration', 'super_admin_clients']
+}
 
 class BuildCRMTester:
-    def __init__(self):
-        self.base_url = BASE_URL
+    def __init__(self, base_url=BASE_URL, fresh_tenant=None, tenant_name='backend'):
+        self.base_url = base_url
+        self.session = get_session()
+        self.fresh_tenant = fresh_tenant
+        # Cache key of the throwaway client tenant; sharded workers each get their own
+        self.tenant_name = tenant_name
+        self.results = get_result_sink('backend')
         self.super_admin_token = None
         self.client_token = None
         self.test_client_id = None
@@ -29,16 +57,31 @@ class BuildCRMTester:
             'expenses': [],
             'users': []
         }
+        self.ledger = ResourceLedger()
+        # Failed log_test records per thread, which decide the checks that return nothing
+        self.failures = threading.local()
+        
+    def track(self, kind, resource_id):
+        """Remember a created tenant resource, persisting it to the ledger for teardown"""
+        self.created_resources[kind].append(resource_id)
+        self.ledger.record(self.base_url, kind, resource_id, token=self.client_token, owner=self.test_client_id)
+        
+    def untrack(self, kind, resource_id):
+        self.created_resources[kind].remove(resource_id)
+        self.ledger.release(self.base_url, kind, resource_id)
         
     def log_test(self, test_name, success, message="", response_data=None):
-        """Log test results with detailed information"""
-        status = "✅ PASS" if success else "❌ FAIL"
-        print(f"{status} {test_name}")
-        if message:
-            print(f"   {message}")
-        if not success and response_data:
-            print(f"   Response: {response_data}")
-        print()
+        """Log test results with detailed information, attaching the request that preceded them"""
+        request = self.session.take_last_request() or {}
+        self.results.record(test_name, success, message, response=response_data, suite='backend', **request)
+        if not success:
+            self.failures.count = getattr(self.failures, 'count', 0) + 1
+        
+    def run_test(self, test):
+        """Run one check: its own verdict when it returns one, otherwise whether it logged no failure"""
+        failures = getattr(self.failures, 'count', 0)
+        result = test()
+        return getattr(self.failures, 'count', 0) == failures if result is None else bool(result)
         
     def make_request(self, method, endpoint, data=None, token=None, expected_status=200):
         """Make HTTP request with proper error handling"""
@@ -49,16 +92,9 @@ class BuildCRMTester:
             headers['Authorization'] = f'Bearer {token}'
             
         try:
-            if method == 'GET':
-                response = requests.get(url, headers=headers, timeout=30)
-            elif method == 'POST':
-                response = requests.post(url, headers=headers, json=data, timeout=30)
-            elif method == 'PUT':
-                response = requests.put(url, headers=headers, json=data, timeout=30)
-            elif method == 'DELETE':
-                response = requests.delete(url, headers=headers, timeout=30)
-            else:
+            if method not in ('GET', 'POST', 'PUT', 'DELETE'):
                 raise ValueError(f"Unsupported method: {method}")
+            response = self.session.request(method, url, headers=headers, json=data)
                 
             return response
             
@@ -103,17 +139,12 @@ class BuildCRMTester:
         """Test super admin authentication"""
         print("=== TESTING SUPER ADMIN AUTHENTICATION ===")
         
-        login_data = {
-            "email": SUPER_ADMIN_EMAIL,
-            "password": SUPER_ADMIN_PASSWORD
-        }
-        
-        response = self.make_request('POST', '/auth/login', login_data)
-        if response and response.status_code == 200:
-            data = response.json()
-            if 'token' in data and data['user']['role'] == 'super_admin':
+        data, response = cached_login(self.make_request, self.base_url, SUPER_ADMIN_EMAIL, SUPER_ADMIN_PASSWORD)
+        if data:
+            if not validate('POST /auth/login', data) and data['user']['role'] == 'super_admin':
                 self.super_admin_token = data['token']
-                self.log_test("Super Admin Login", True, f"Logged in as {data['user']['email']}")
+                source = "cached token for" if response is None else "Logged in as"
+                self.log_test("Super Admin Login", True, f"{source} {data['user']['email']}")
                 return True
             else:
                 self.log_test("Super Admin Login", False, "Invalid response structure")
@@ -126,36 +157,38 @@ class BuildCRMTester:
         """Test client registration and login"""
         print("=== TESTING CLIENT REGISTRATION ===")
         
-        # Generate unique test data
-        timestamp = int(time.time())
-        business_name = f"Test Construction Co {timestamp}"
-        email = f"test{timestamp}@buildcrm.com"
-        password = "testpass123"
-        
-        register_data = {
-            "businessName": business_name,
-            "email": email,
-            "password": password,
-            "phone": "+91 9876543210",
-            "planId": "basic"
-        }
+        def register_data():
+            # Generate unique test data
+            timestamp = int(time.time())
+            return {
+                "businessName": f"Test Construction Co {timestamp}",
+                "email": f"{self.tenant_name}{timestamp}@buildcrm.com",
+                "password": "testpass123",
+                "phone": "+91 9876543210",
+                "planId": "basic"
+            }
         
-        response = self.make_request('POST', '/auth/register', register_data)
-        if response and response.status_code == 200:
-            data = response.json()
-            if 'token' in data and 'client' in data:
-                self.client_token = data['token']
-                self.test_client_id = data['client']['id']
-                self.test_user_id = data['user']['id']
-                self.log_test("Client Registration", True, f"Registered {business_name}")
+        tenant, response, reused = cached_tenant(self.make_request, self.base_url, self.tenant_name, register_data,
+                                                 fresh=self.fresh_tenant)
+        if tenant:
+            if 'token' in tenant and 'client' in tenant:
+                self.client_token = tenant['token']
+                self.test_client_id = tenant['client']['id']
+                self.test_user_id = tenant['user']['id']
+                if reused:
+                    self.log_test("Client Registration", True, f"Reusing cached tenant {tenant['businessName']}")
+                    return True
+                self.ledger.record(self.base_url, 'clients', self.test_client_id, token=self.client_token,
+                                   email=tenant['email'], password=tenant['password'])
+                self.log_test("Client Registration", True, f"Registered {tenant['businessName']}")
                 
                 # Test login with new credentials
-                login_data = {"email": email, "password": password}
+                login_data = {"email": tenant['email'], "password": tenant['password']}
                 login_response = self.make_request('POST', '/auth/login', login_data)
                 if login_response and login_response.status_code == 200:
                     login_data = login_response.json()
                     self.client_token = login_data['token']  # Update token
-                    self.log_test("Client Login", True, f"Logged in as {email}")
+                    self.log_test("Client Login", True, f"Logged in as {tenant['email']}")
                     return True
                 else:
                     self.log_test("Client Login", False, "Failed to login after registration")
@@ -177,11 +210,12 @@ class BuildCRMTester:
         response = self.make_request('GET', '/auth/me', token=self.client_token)
         if response and response.status_code == 200:
             data = response.json()
-            if 'user' in data and 'client' in data:
+            error = validate('GET /auth/me', data)
+            if not error:
                 self.log_test("Auth Me Endpoint", True, f"Retrieved user: {data['user']['email']}")
                 return True
             else:
-                self.log_test("Auth Me Endpoint", False, "Invalid response structure")
+                self.log_test("Auth Me Endpoint", False, f"Invalid response structure: {error}")
         else:
             self.log_test("Auth Me Endpoint", False, "Failed to get user info")
             
@@ -198,12 +232,12 @@ class BuildCRMTester:
         response = self.make_request('GET', '/admin/stats', token=self.super_admin_token)
         if response and response.status_code == 200:
             stats = response.json()
-            required_fields = ['totalClients', 'activeClients', 'totalUsers', 'monthlyRevenue']
-            if all(field in stats for field in required_fields):
+            error = validate('GET /admin/stats#flat', stats)
+            if not error:
                 self.log_test("Super Admin Stats", True, f"Total Clients: {stats['totalClients']}, Revenue: ₹{stats['monthlyRevenue']}")
                 return True
             else:
-                self.log_test("Super Admin Stats", False, "Missing required fields in stats")
+                self.log_test("Super Admin Stats", False, f"Missing required fields in stats: {error}")
         else:
             self.log_test("Super Admin Stats", False, "Failed to get admin stats")
             
@@ -239,6 +273,8 @@ class BuildCRMTester:
         if response and response.status_code == 200:
             result = response.json()
             self.log_test("Toggle Client Status", True, f"New status: {result.get('newStatus', 'unknown')}")
+            # Toggle back: the webhook rejects a paused client, and the cached tenant is reused next run
+            self.make_request('POST', f'/admin/clients/{self.test_client_id}/toggle-status', token=self.super_admin_token)
         else:
             self.log_test("Toggle Client Status", False, "Failed to toggle status")
             
@@ -255,13 +291,13 @@ class BuildCRMTester:
         response = self.make_request('GET', '/client/stats', token=self.client_token)
         if response and response.status_code == 200:
             stats = response.json()
-            required_fields = ['totalLeads', 'totalProjects', 'totalTasks', 'totalExpenses']
-            if all(field in stats for field in required_fields):
+            error = validate('GET /client/stats', stats)
+            if not error:
                 self.log_test("Client Dashboard Stats", True, 
                             f"Leads: {stats['totalLeads']}, Projects: {stats['totalProjects']}, Tasks: {stats['totalTasks']}")
                 return True
             else:
-                self.log_test("Client Dashboard Stats", False, "Missing required fields")
+                self.log_test("Client Dashboard Stats", False, f"Missing required fields: {error}")
         else:
             self.log_test("Client Dashboard Stats", False, "Failed to get client stats")
             
@@ -276,11 +312,10 @@ class BuildCRMTester:
             return False
             
         # Test GET leads
-        response = self.make_request('GET', '/leads', token=self.client_token)
-        if response and response.status_code == 200:
-            leads = response.json()
-            self.log_test("Get Leads", True, f"Found {len(leads)} existing leads")
-        else:
+        try:
+            lead_count = count_records(self.base_url, '/leads', token=self.client_token, session=self.session)
+            self.log_test("Get Leads", True, f"Found {lead_count} existing leads")
+        except ListReadError:
             self.log_test("Get Leads", False, "Failed to get leads")
             return False
             
@@ -295,10 +330,11 @@ class BuildCRMTester:
         }
         
         response = self.make_request('POST', '/leads', new_lead, token=self.client_token)
-        if response and response.status_code == 200:
-            created_lead = response.json()
+        # The live route answers 201 with {lead, contactCreated}
+        if response and response.status_code in (200, 201) and not validate('POST /leads', response.json()):
+            created_lead = response.json()['lead']
             lead_id = created_lead['id']
-            self.created_resources['leads'].append(lead_id)
+            self.track('leads', lead_id)
             self.log_test("Create Lead", True, f"Created lead: {created_lead['name']}")
             
             # Test UPDATE lead
@@ -313,7 +349,7 @@ class BuildCRMTester:
             response = self.make_request('DELETE', f'/leads/{lead_id}', token=self.client_token)
             if response and response.status_code == 200:
                 self.log_test("Delete Lead", True, "Lead deleted successfully")
-                self.created_resources['leads'].remove(lead_id)
+                self.untrack('leads', lead_id)
             else:
                 self.log_test("Delete Lead", False, "Failed to delete lead")
                 
@@ -350,10 +386,10 @@ class BuildCRMTester:
         }
         
         response = self.make_request('POST', '/projects', new_project, token=self.client_token)
-        if response and response.status_code == 200:
+        if response and response.status_code in (200, 201):
             created_project = response.json()
             project_id = created_project['id']
-            self.created_resources['projects'].append(project_id)
+            self.track('projects', project_id)
             self.log_test("Create Project", True, f"Created project: {created_project['name']}")
             
             # Test UPDATE project
@@ -368,7 +404,7 @@ class BuildCRMTester:
             response = self.make_request('DELETE', f'/projects/{project_id}', token=self.client_token)
             if response and response.status_code == 200:
                 self.log_test("Delete Project", True, "Project deleted successfully")
-                self.created_resources['projects'].remove(project_id)
+                self.untrack('projects', project_id)
             else:
                 self.log_test("Delete Project", False, "Failed to delete project")
                 
@@ -404,10 +440,10 @@ class BuildCRMTester:
         }
         
         response = self.make_request('POST', '/tasks', new_task, token=self.client_token)
-        if response and response.status_code == 200:
+        if response and response.status_code in (200, 201):
             created_task = response.json()
             task_id = created_task['id']
-            self.created_resources['tasks'].append(task_id)
+            self.track('tasks', task_id)
             self.log_test("Create Task", True, f"Created task: {created_task['title']}")
             
             # Test UPDATE task
@@ -422,7 +458,7 @@ class BuildCRMTester:
             response = self.make_request('DELETE', f'/tasks/{task_id}', token=self.client_token)
             if response and response.status_code == 200:
                 self.log_test("Delete Task", True, "Task deleted successfully")
-                self.created_resources['tasks'].remove(task_id)
+                self.untrack('tasks', task_id)
             else:
                 self.log_test("Delete Task", False, "Failed to delete task")
                 
@@ -458,10 +494,10 @@ class BuildCRMTester:
         }
         
         response = self.make_request('POST', '/expenses', new_expense, token=self.client_token)
-        if response and response.status_code == 200:
+        if response and response.status_code in (200, 201):
             created_expense = response.json()
             expense_id = created_expense['id']
-            self.created_resources['expenses'].append(expense_id)
+            self.track('expenses', expense_id)
             self.log_test("Create Expense", True, f"Created expense: ₹{created_expense['amount']}")
             
             # Test UPDATE expense
@@ -476,7 +512,7 @@ class BuildCRMTester:
             response = self.make_request('DELETE', f'/expenses/{expense_id}', token=self.client_token)
             if response and response.status_code == 200:
                 self.log_test("Delete Expense", True, "Expense deleted successfully")
-                self.created_resources['expenses'].remove(expense_id)
+                self.untrack('expenses', expense_id)
             else:
                 self.log_test("Delete Expense", False, "Failed to delete expense")
                 
@@ -506,7 +542,7 @@ class BuildCRMTester:
         # Test CREATE user
         timestamp = int(time.time())
         new_user = {
-            "email": f"newuser{timestamp}@buildcrm.com",
+            "email": f"{self.tenant_name}-user{timestamp}@buildcrm.com",
             "password": "userpass123",
             "name": "New Sales Rep",
             "role": "sales_rep"
@@ -516,7 +552,7 @@ class BuildCRMTester:
         if response and response.status_code == 200:
             created_user = response.json()
             user_id = created_user['id']
-            self.created_resources['users'].append(user_id)
+            self.track('users', user_id)
             self.log_test("Create User", True, f"Created user: {created_user['name']}")
             
             # Test UPDATE user
@@ -531,7 +567,7 @@ class BuildCRMTester:
             response = self.make_request('DELETE', f'/users/{user_id}', token=self.client_token)
             if response and response.status_code == 200:
                 self.log_test("Delete User", True, "User deleted successfully")
-                self.created_resources['users'].remove(user_id)
+                self.untrack('users', user_id)
             else:
                 self.log_test("Delete User", False, "Failed to delete user")
                 
@@ -553,11 +589,11 @@ class BuildCRMTester:
         response = self.make_request('GET', '/reports/sales', token=self.client_token)
         if response and response.status_code == 200:
             sales_report = response.json()
-            required_fields = ['byStatus', 'bySource', 'monthlyData']
-            if all(field in sales_report for field in required_fields):
+            error = validate('GET /reports/sales', sales_report)
+            if not error:
                 self.log_test("Sales Report", True, f"Generated sales report with {len(sales_report['monthlyData'])} months")
             else:
-                self.log_test("Sales Report", False, "Missing required fields in sales report")
+                self.log_test("Sales Report", False, f"Missing required fields in sales report: {error}")
         else:
             self.log_test("Sales Report", False, "Failed to get sales report")
             
@@ -565,12 +601,12 @@ class BuildCRMTester:
         response = self.make_request('GET', '/reports/expenses', token=self.client_token)
         if response and response.status_code == 200:
             expenses_report = response.json()
-            required_fields = ['byCategory', 'monthlyData']
-            if all(field in expenses_report for field in required_fields):
+            error = validate('GET /reports/expenses', expenses_report)
+            if not error:
                 self.log_test("Expenses Report", True, f"Generated expenses report with {len(expenses_report['monthlyData'])} months")
                 return True
             else:
-                self.log_test("Expenses Report", False, "Missing required fields in expenses report")
+                self.log_test("Expenses Report", False, f"Missing required fields in expenses report: {error}")
         else:
             self.log_test("Expenses Report", False, "Failed to get expenses report")
             
@@ -596,9 +632,10 @@ class BuildCRMTester:
         }
         
         response = self.make_request('POST', '/webhook/leads', webhook_data)
-        if response and response.status_code == 200:
+        if response and response.status_code in (200, 201):  # the live route answers 201 Created
             result = response.json()
             if 'leadId' in result:
+                self.track('leads', result['leadId'])
                 self.log_test("Webhook Endpoint", True, f"Lead created via webhook: {result['leadId']}")
                 return True
             else:
@@ -644,20 +681,25 @@ class BuildCRMTester:
         }
         
         response = self.make_request('POST', '/leads', test_lead, token=self.client_token)
-        if response and response.status_code == 200:
-            created_lead = response.json()
+        if response and response.status_code in (200, 201) and not validate('POST /leads', response.json()):
+            created_lead = response.json()['lead']
             lead_id = created_lead['id']
+            self.track('leads', lead_id)
             
             # Verify the lead appears in client's leads
-            response = self.make_request('GET', '/leads', token=self.client_token)
-            if response and response.status_code == 200:
-                leads = response.json()
-                lead_found = any(lead['id'] == lead_id for lead in leads)
+            try:
+                lead_found = find_record(self.base_url, '/leads', lead_id, token=self.client_token,
+                                         session=self.session) is not None
+            except ListReadError:
+                lead_found = None
+            if lead_found is not None:
                 if lead_found:
                     self.log_test("Multi-tenant Data Access", True, "Client can access their own data")
                     
                     # Clean up
-                    self.make_request('DELETE', f'/leads/{lead_id}', token=self.client_token)
+                    response = self.make_request('DELETE', f'/leads/{lead_id}', token=self.client_token)
+                    if response and response.status_code == 200:
+                        self.untrack('leads', lead_id)
                     return True
                 else:
                     self.log_test("Multi-tenant Data Access", False, "Client cannot find their own lead")
@@ -668,35 +710,45 @@ class BuildCRMTester:
             
         return False
         
-    def run_all_tests(self):
-        """Run comprehensive test suite"""
+    def test_plan(self):
+        """(name, test) pairs in declaration order; TEST_DEPENDENCIES holds the order that matters"""
+        return [
+            # Core functionality tests (High Priority)
+            ('health_check', self.test_health_check),
+            ('public_endpoints', self.test_public_endpoints),
+            ('super_admin_login', self.test_super_admin_login),
+            ('client_registration', self.test_client_registration),
+            ('auth_me', self.test_auth_me_endpoint),
+            ('super_admin_stats', self.test_super_admin_stats),
+            ('super_admin_clients', self.test_super_admin_client_management),
+            ('client_stats', self.test_client_dashboard_stats),
+            ('leads_crud', self.test_leads_crud),
+            ('projects_crud', self.test_projects_crud),
+            ('tasks_crud', self.test_tasks_crud),
+            ('expenses_crud', self.test_expenses_crud),
+            ('user_management', self.test_user_management),
+            
+            # Additional functionality tests (Medium Priority)
+            ('reports', self.test_reports_api),
+            ('client_modules', self.test_client_modules),
+            ('multi_tenant', self.test_multi_tenant_isolation),
+            
+            # Integration tests (Low Priority)
+            ('webhook', self.test_webhook_endpoint),
+        ]
+        
+    def run_all_tests(self, workers=1, latency_json=None, cleanup=True):
+        """Run comprehensive test suite, independent tests in parallel when workers > 1"""
         print("🚀 STARTING BUILDCRM BACKEND API TESTING")
         print("=" * 60)
         
-        test_results = {}
-        
-        # Core functionality tests (High Priority)
-        test_results['health_check'] = self.test_health_check()
-        test_results['public_endpoints'] = self.test_public_endpoints()
-        test_results['super_admin_login'] = self.test_super_admin_login()
-        test_results['client_registration'] = self.test_client_registration()
-        test_results['auth_me'] = self.test_auth_me_endpoint()
-        test_results['super_admin_stats'] = self.test_super_admin_stats()
-        test_results['super_admin_clients'] = self.test_super_admin_client_management()
-        test_results['client_stats'] = self.test_client_dashboard_stats()
-        test_results['leads_crud'] = self.test_leads_crud()
-        test_results['projects_crud'] = self.test_projects_crud()
-        test_results['tasks_crud'] = self.test_tasks_crud()
-        test_results['expenses_crud'] = self.test_expenses_crud()
-        test_results['user_management'] = self.test_user_management()
-        
-        # Additional functionality tests (Medium Priority)
-        test_results['reports'] = self.test_reports_api()
-        test_results['client_modules'] = self.test_client_modules()
-        test_results['multi_tenant'] = self.test_multi_tenant_isolation()
-        
-        # Integration tests (Low Priority)
-        test_results['webhook'] = self.test_webhook_endpoint()
+        plan = [(name, lambda test=test: self.run_test(test)) for name, test in self.test_plan()]
+        test_results = run_scheduled(plan, TEST_DEPENDENCIES, workers)
+        
+        if cleanup:
+            # Also replays anything a crashed earlier run left in the ledger
+            print("=== TEARDOWN ===")
+            print_teardown_summary(teardown(self.make_request, self.base_url, self.ledger))
         
         # Summary
         print("=" * 60)
@@ -711,6 +763,8 @@ class BuildCRMTester:
             print(f"{status} {test_name.replace('_', ' ').title()}")
             
         print(f"\nOverall Result: {passed}/{total} tests passed")
+        print_connection_summary()
+        print_latency_report(json_path=latency_json)
         
         if passed == total:
             print("🎉 ALL TESTS PASSED! Backend API is working correctly.")
@@ -719,6 +773,35 @@ class BuildCRMTester:
             
         return test_results
 
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="BuildCRM backend API tests")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Run independent tests in parallel on N threads (default: 1, sequential)")
+    parser.add_argument('--base-url', default=BASE_URL,
+                        help="API root to test (default: HARNESS_BASE_URL or the preview host)")
+    parser.add_argument('--latency-json', metavar='PATH',
+                        help="Also write per-route latency percentiles to PATH as JSON")
+    parser.add_argument('--fresh-tenant', action='store_true', default=None,
+                        help="Register a new test client instead of reusing the cached one")
+    parser.add_argument('--no-teardown', action='store_true',
+                        help="Leave created resources in place (they stay in the ledger for a later teardown)")
+    add_baseline_arguments(parser)
+    add_cassette_arguments(parser)
+    add_result_arguments(parser)
+    args = parser.parse_args(argv)
+    results_sink = handle_result_options(args, 'backend')
+    install_cassette(args, get_session())
+    
+    tester = BuildCRMTester(base_url=args.base_url, fresh_tenant=args.fresh_tenant)
+    results = tester.run_all_tests(workers=args.workers, latency_json=args.latency_json,
+                                   cleanup=not args.no_teardown)
+    close_cassette(get_session())
+    results_sink.close()
+    
+    # Record or gate the baseline whether or not the tests passed
+    baseline_ok = handle_baseline_options(args, tester.session.latency, 'backend')
+    return 0 if baseline_ok and all(results.values()) else 1
+
+
 if __name__ == "__main__":
-    tester = BuildCRMTester()
-    results = tester.run_all_tests()
\ No newline at end of file
+    sys.exit(main())
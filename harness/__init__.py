@@ -0,0 +1,4 @@
+"""
+Shared building blocks for the BuildCRM Python API test harness
+Used by backend_test.py, test_modular_api.py and test_modular_focused.py, and run as `python -m harness <command>`
+"""
@@ -0,0 +1,207 @@
+"""
+AIMD adaptive concurrency for load and seed runs
+Each route gets its own in-flight limit. The limit grows by one request per round of successful
+responses while latency holds, and is cut multiplicatively on a 429, a 5xx or timeout, or a latency
+spike, at most once per round. Where the limit settles is the route's sustainable concurrency.
+
+A latency spike is the short-term EWMA of response times rising past --latency-tolerance times the
+long-term EWMA, so a slow route is judged against its own history rather than a fixed threshold.
+"""
+
+import asyncio
+import threading
+from collections import deque
+
+SHORT_ALPHA = 0.1
+LONG_ALPHA = 0.01
+# Samples a route needs before latency may cut its limit
+WARMUP_SAMPLES = 20
+SETTLE_SAMPLES = 500
+
+
+class AIMDLimit:
+    """The concurrency limit of one route, adjusted after every response"""
+
+    def __init__(self, initial=4, minimum=1, maximum=100, increase=1.0, decrease=0.5, tolerance=1.5):
+        self.limit = float(min(max(initial, minimum), maximum))
+        self.minimum = minimum
+        self.maximum = maximum
+        self.increase = increase
+        self.decrease = decrease
+        self.tolerance = tolerance
+        self.samples = 0
+        self.short = None
+        self.long = None
+        self.peak = self.limit
+        self.since_cut = 0
+        self.cuts = {'throttled': 0, 'errors': 0, 'latency': 0}
+        self.recent = deque(maxlen=SETTLE_SAMPLES)
+
+    @property
+    def allowed(self):
+        return max(self.minimum, int(self.limit))
+
+    def _cause(self, status):
+        if status == 429:
+            return 'throttled'
+        if status is None or status >= 500:
+            return 'errors'
+        if self.samples > WARMUP_SAMPLES and self.short > self.tolerance * self.long:
+            return 'latency'
+        return None
+
+    def observe(self, status, elapsed, in_flight=None):
+        """Feed one response (status None for a transport error), returning the cut cause or None
+
+        in_flight is how many requests were outstanding, this one included; a limit less than half used
+        is not grown, since latency at low use says nothing about the next step up.
+        """
+        self.samples += 1
+        self.since_cut += 1
+        if self.short is None:
+            self.short = self.long = elapsed
+        else:
+            self.short += SHORT_ALPHA * (elapsed - self.short)
+            self.long += LONG_ALPHA * (elapsed - self.long)
+
+        cause = self._cause(status)
+        if cause:
+            # Everything still in flight was sent at the old limit, and the short-term average needs
+            # about 1/SHORT_ALPHA samples to reflect the new one; cut once per such round, like TCP
+            if self.since_cut >= max(self.limit, 1 / SHORT_ALPHA):
+                self.limit = max(self.minimum, self.limit * self.decrease)
+                self.since_cut = 0
+                self.cuts[cause] += 1
+            else:
+                cause = None
+        elif in_flight is None or in_flight * 2 >= self.limit:
+            self.limit = min(self.maximum, self.limit + self.increase / self.limit)
+            self.peak = max(self.peak, self.limit)
+        self.recent.append(self.limit)
+        return cause
+
+    def summary(self):
+        return {
+            'limit': self.allowed,
+            'settled': sum(self.recent) / len(self.recent) if self.recent else self.limit,
+            'peak': self.peak,
+            'samples': self.samples,
+            'latency_ms': (self.long or 0.0) * 1000,
+            'cuts': dict(self.cuts)
+        }
+
+
+class AdaptiveLimiter:
+    """Per-route AIMD limits; AsyncAdaptiveLimiter and ThreadAdaptiveLimiter add the waiting"""
+
+    def __init__(self, initial=4, minimum=1, maximum=100, increase=1.0, decrease=0.5, tolerance=1.5):
+        self.settings = {'initial': initial, 'minimum': minimum, 'maximum': maximum,
+                         'increase': increase, 'decrease': decrease, 'tolerance': tolerance}
+        self.limits = {}
+        self.in_flight = {}
+
+    def _route(self, route):
+        limit = self.limits.get(route)
+        if limit is None:
+            limit = self.limits[route] = AIMDLimit(**self.settings)
+            self.in_flight[route] = 0
+        return limit
+
+    def _admit(self, route):
+        if self.in_flight[route] < self._route(route).allowed:
+            self.in_flight[route] += 1
+            return True
+        return False
+
+    def _finish(self, route, status, elapsed):
+        in_flight = self.in_flight[route]
+        self.in_flight[route] -= 1
+        # A request abandoned before it completed (elapsed None) says nothing about the server
+        return self.limits[route].observe(status, elapsed, in_flight) if elapsed is not None else None
+
+    def summary(self):
+        return {route: limit.summary() for route, limit in sorted(self.limits.items())}
+
+
+class AsyncAdaptiveLimiter(AdaptiveLimiter):
+    """For coroutines on one event loop: await acquire(route), then release(route, status, elapsed)"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.waiters = {}
+
+    async def acquire(self, route):
+        self._route(route)
+        waiters = self.waiters.setdefault(route, deque())
+        # Queue behind earlier waiters so a freed slot is never taken out of turn
+        if not waiters and self._admit(route):
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just before the cancel landed; pass it on
+                self.in_flight[route] -= 1
+                self._wake(route)
+            elif waiter in waiters:
+                waiters.remove(waiter)
+            raise
+
+    def _wake(self, route):
+        """Hand free slots to waiters in arrival order"""
+        waiters = self.waiters.get(route)
+        while waiters and self.in_flight[route] < self.limits[route].allowed:
+            waiter = waiters.popleft()
+            if not waiter.done():
+                self.in_flight[route] += 1
+                waiter.set_result(None)
+
+    def release(self, route, status, elapsed):
+        self._finish(route, status, elapsed)
+        self._wake(route)
+
+
+class ThreadAdaptiveLimiter(AdaptiveLimiter):
+    """For worker threads: acquire(route) blocks until the route has room"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.condition = threading.Condition()
+
+    def acquire(self, route):
+        with self.condition:
+            self._route(route)
+            self.condition.wait_for(lambda: self._admit(route))
+
+    def release(self, route, status, elapsed):
+        with self.condition:
+            self._finish(route, status, elapsed)
+            self.condition.notify_all()
+
+
+def add_adaptive_arguments(parser, maximum_flag):
+    group = parser.add_argument_group('adaptive concurrency')
+    group.add_argument('--adaptive', action='store_true',
+                       help=f"Find each route's sustainable concurrency with AIMD, up to {maximum_flag}")
+    group.add_argument('--adaptive-start', type=int, default=4, help="Initial in-flight limit per route")
+    group.add_argument('--backoff', type=float, default=0.5, help="Factor the limit is cut by on 429/5xx/latency")
+    group.add_argument('--latency-tolerance', type=float, default=1.5,
+                       help="Cut when recent latency exceeds the route's long-run latency by this factor")
+
+
+def adaptive_settings(args, maximum):
+    """Keyword arguments for an AdaptiveLimiter from add_adaptive_arguments options, or None when disabled"""
+    if not args.adaptive:
+        return None
+    return {'initial': args.adaptive_start, 'maximum': maximum, 'decrease': args.backoff,
+            'tolerance': args.latency_tolerance}
+
+
+def print_concurrency_table(summary):
+    print(f"\n{'Route':<32} {'Settled':>8} {'Peak':>7} {'Now':>5} {'429':>5} {'5xx':>5} {'Slow':>5} {'Lat ms':>8}")
+    for route, entry in summary.items():
+        cuts = entry['cuts']
+        print(f"{route:<32} {entry['settled']:>8.1f} {entry['peak']:>7.1f} {entry['limit']:>5} "
+              f"{cuts['throttled']:>5} {cuts['errors']:>5} {cuts['latency']:>5} {entry['latency_ms']:>8.1f}")
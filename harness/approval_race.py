@@ -0,0 +1,217 @@
+"""
+Concurrent module-request approval race and throughput test
+Many tenants file module requests at once, then several super-admin workers drain the same pending queue
+concurrently, each approving every request in its own order, as independent admin consoles would
+
+Exactly one approval per request should succeed. More than one is a double approval; an approved request
+whose module never lands on the client (or lands twice) is a lost update. Approvals/second counts the
+first successful approval of each request over the racing phase.
+
+Usage:
+    python -m harness.approval_race --tenants 20 --modules 3 --admins 4
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from harness.config import BASE_URL, SUPER_ADMIN_EMAIL, SUPER_ADMIN_PASSWORD
+from harness.ledger import ResourceLedger, print_teardown_summary, teardown
+from harness.seeder import register_tenant
+from harness.session import HarnessSession, bind_requests
+from harness.tokens import cached_login
+
+DEFAULT_MODULES = ('wooden-flooring', 'doors-windows', 'paints-coatings')
+CREATED_STATUSES = (200, 201)
+
+
+class ApprovalRace:
+    def __init__(self, base_url=BASE_URL, workers=32, ledger=None):
+        self.base_url = base_url
+        self.workers = workers
+        self.ledger = ledger or ResourceLedger()
+        self.make_request = bind_requests(base_url, HarnessSession(pool_size=workers))
+
+    def _map(self, function, items, workers=None):
+        with ThreadPoolExecutor(max_workers=workers or self.workers) as executor:
+            return list(executor.map(function, items))
+
+    def admin_token(self):
+        data, _ = cached_login(self.make_request, self.base_url, SUPER_ADMIN_EMAIL, SUPER_ADMIN_PASSWORD)
+        if not data:
+            raise SystemExit("Super admin login failed; cannot approve module requests")
+        return data['token']
+
+    def file_requests(self, tenants, run_id, modules):
+        """Every tenant requests every module at once, returning {request id: (tenant, module)}"""
+        registered = [tenant for tenant in self._map(
+            lambda index: register_tenant(self.make_request, run_id, index, prefix='approval'), range(tenants))
+            if tenant]
+        for tenant in registered:
+            self.ledger.record(self.base_url, 'clients', tenant['client_id'], token=tenant['token'],
+                               email=tenant['email'], password=tenant['password'])
+
+        def file(work):
+            tenant, module = work
+            response = self.make_request('POST', '/module-requests', {
+                "moduleId": module,
+                "message": f"Approval race {run_id}"
+            }, token=tenant['token'])
+            if not response or response.status_code not in CREATED_STATUSES:
+                return None
+            request_id = response.json()['request']['id']
+            self.ledger.record(self.base_url, 'module_requests', request_id)
+            return request_id, (tenant, module)
+
+        filed = self._map(file, [(tenant, module) for tenant in registered for module in modules])
+        return registered, dict(item for item in filed if item)
+
+    def race(self, token, filed, admins, seed=0):
+        """admins workers each list the queue and approve this run's pending requests in a shuffled order"""
+        def approve_all(worker):
+            response = self.make_request('GET', '/module-requests', token=token)
+            if not response or response.status_code != 200:
+                return []
+            queue = [request['id'] for request in response.json()
+                     if request.get('id') in filed and request.get('status') == 'pending']
+            random.Random(f"{seed}:{worker}").shuffle(queue)
+            attempts = []
+            for request_id in queue:
+                response = self.make_request('PUT', '/module-requests', {
+                    "requestId": request_id,
+                    "action": "approve",
+                    "adminMessage": f"Approved by race worker {worker}"
+                }, token=token)
+                status = response.status_code if response is not None else None
+                approved = status == 200 and response.json().get('status') == 'approved'
+                attempts.append((request_id, worker, status, approved, time.perf_counter()))
+            return attempts
+
+        started = time.perf_counter()
+        # One thread per admin; each keeps its own pooled connection
+        attempts = [attempt for batch in self._map(approve_all, range(admins), workers=admins) for attempt in batch]
+        return attempts, started, time.perf_counter()
+
+    def verify(self, token, tenants, filed):
+        """Final request states and enabled modules per client, as (requests by id, modules by client id)"""
+        response = self.make_request('GET', '/module-requests', token=token)
+        requests = {}
+        if response and response.status_code == 200:
+            requests = {request['id']: request for request in response.json() if request.get('id') in filed}
+
+        def modules(tenant):
+            response = self.make_request('GET', f"/admin/clients/{tenant['client_id']}", token=token)
+            if not response or response.status_code != 200:
+                return tenant['client_id'], None
+            return tenant['client_id'], response.json().get('modules') or []
+
+        return requests, dict(self._map(modules, tenants))
+
+    def run(self, tenants=10, modules=DEFAULT_MODULES, admins=4, seed=0, cleanup=True):
+        run_id = int(time.time())
+        registered, filed = self.file_requests(tenants, run_id, modules)
+        if not filed:
+            raise SystemExit("No module requests were filed; nothing to approve")
+        token = self.admin_token()
+        attempts, started, finished = self.race(token, filed, admins, seed)
+        requests, client_modules = self.verify(token, registered, filed)
+
+        by_request = {}
+        for request_id, worker, status, approved, at in attempts:
+            entry = by_request.setdefault(request_id, {'attempts': 0, 'approvals': [], 'statuses': {}})
+            entry['attempts'] += 1
+            entry['statuses'][str(status)] = entry['statuses'].get(str(status), 0) + 1
+            if approved:
+                entry['approvals'].append((at, worker))
+
+        report = {'tenants': len(registered), 'requests': len(filed), 'admins': admins,
+                  'attempts': len(attempts), 'seconds': finished - started,
+                  'approved': 0, 'double_approvals': [], 'lost_updates': [], 'unapproved': [],
+                  'statuses': {}}
+        first_approvals = []
+        for request_id, (tenant, module) in filed.items():
+            entry = by_request.get(request_id, {'attempts': 0, 'approvals': [], 'statuses': {}})
+            for status, count in entry['statuses'].items():
+                report['statuses'][status] = report['statuses'].get(status, 0) + count
+            final = requests.get(request_id) or {}
+            enabled = client_modules.get(tenant['client_id'])
+            case = {'id': request_id, 'client': tenant['client_id'], 'module': module,
+                    'approvals': len(entry['approvals']), 'final': final.get('status')}
+
+            if not entry['approvals']:
+                report['unapproved'].append(case)
+                continue
+            report['approved'] += 1
+            first_approvals.append(min(entry['approvals'])[0])
+            if len(entry['approvals']) > 1:
+                case['workers'] = sorted(worker for _, worker in entry['approvals'])
+                report['double_approvals'].append(case)
+            if final.get('status') != 'approved':
+                report['lost_updates'].append({**case, 'reason': f"request ended {final.get('status') or 'missing'}"})
+            elif enabled is not None and enabled.count(module) != 1:
+                report['lost_updates'].append({**case, 'reason': f"module enabled {enabled.count(module)} times"})
+
+            if final.get('status') == 'approved':
+                self.ledger.release(self.base_url, 'module_requests', request_id)
+                self.ledger.record(self.base_url, 'client_modules', f"{tenant['client_id']}/{module}")
+
+        span = (max(first_approvals) - started) if first_approvals else 0.0
+        report['approvals_per_second'] = len(first_approvals) / span if span else 0.0
+        report['attempts_per_second'] = len(attempts) / report['seconds'] if report['seconds'] else 0.0
+        if cleanup:
+            report['teardown'] = teardown(self.make_request, self.base_url, self.ledger, self.workers)
+        return report
+
+
+def print_approval_report(report):
+    print("=" * 60)
+    print("🏁 MODULE REQUEST APPROVAL RACE")
+    print("=" * 60)
+    print(f"Tenants: {report['tenants']}, requests: {report['requests']}, admin workers: {report['admins']}")
+    print(f"Approvals: {report['approved']}/{report['requests']} at {report['approvals_per_second']:.1f}/s, "
+          f"{report['attempts']} attempts at {report['attempts_per_second']:.1f}/s over {report['seconds']:.2f}s")
+    statuses = ', '.join(f"{status}: {count}" for status, count in sorted(report['statuses'].items()))
+    print(f"Attempt statuses: {statuses or 'none'}")
+    for case in report['double_approvals'][:10]:
+        print(f"🚨 DOUBLE request {case['id']} ({case['module']}) approved by workers {case['workers']}")
+    for case in report['lost_updates'][:10]:
+        print(f"🚨 LOST request {case['id']} ({case['module']} for {case['client']}): {case['reason']}")
+    if report['unapproved']:
+        print(f"⚠️  {len(report['unapproved'])} requests were never approved by any worker")
+    if 'teardown' in report:
+        print_teardown_summary(report['teardown'])
+    if report['double_approvals'] or report['lost_updates']:
+        print(f"❌ {len(report['double_approvals'])} double approvals, {len(report['lost_updates'])} lost updates")
+    else:
+        print("🎉 Every request was approved exactly once.")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Race several super-admin workers over one module-request queue")
+    parser.add_argument('--base-url', default=BASE_URL)
+    parser.add_argument('--tenants', type=int, default=10, help="Tenants filing requests")
+    parser.add_argument('--modules', default=','.join(DEFAULT_MODULES),
+                        help="Comma-separated module ids each tenant requests")
+    parser.add_argument('--admins', type=int, default=4, help="Concurrent super-admin approval workers")
+    parser.add_argument('--workers', type=int, default=32, help="Concurrent requests during setup and teardown")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-teardown', action='store_true', help="Leave the tenants and approved modules in place")
+    parser.add_argument('--json', metavar='PATH', help="Also write the report to PATH as JSON")
+    args = parser.parse_args(argv)
+
+    race = ApprovalRace(base_url=args.base_url, workers=max(args.workers, args.admins))
+    report = race.run(tenants=args.tenants,
+                      modules=[module.strip() for module in args.modules.split(',') if module.strip()],
+                      admins=args.admins, seed=args.seed, cleanup=not args.no_teardown)
+    print_approval_report(report)
+    if args.json:
+        with open(args.json, 'w') as handle:
+            json.dump(report, handle, indent=2)
+    return 1 if report['double_approvals'] or report['lost_updates'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
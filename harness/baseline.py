@@ -0,0 +1,308 @@
+"""
+Latency baselines across harness runs
+Stores each run's per-route latency and throughput in SQLite keyed by git SHA and flags p95 regressions
+
+Usage:
+    python backend_test.py --save-baseline                 # record this run
+    python backend_test.py --compare-baseline              # gate against the latest other SHA
+    python -m harness.baseline list
+    python -m harness.baseline compare --suite backend --baseline abc123 --current def456
+"""
+
+import argparse
+import json
+import math
+import os
+import sqlite3
+import subprocess
+import sys
+from datetime import datetime
+
+from harness.latency import LatencyHistogram
+
+DEFAULT_DB = os.environ.get('HARNESS_BASELINE_DB', '.harness/baselines.sqlite')
+DEFAULT_THRESHOLD = 0.10
+DEFAULT_ALPHA = 0.05
+MIN_SAMPLES = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    suite TEXT NOT NULL,
+    git_sha TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    duration REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_suite_sha ON runs (suite, git_sha);
+CREATE TABLE IF NOT EXISTS route_stats (
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    route TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    errors INTEGER NOT NULL,
+    p50 REAL NOT NULL,
+    p95 REAL NOT NULL,
+    p99 REAL NOT NULL,
+    max REAL NOT NULL,
+    rps REAL NOT NULL,
+    histogram TEXT NOT NULL,
+    PRIMARY KEY (run_id, route)
+);
+"""
+
+
+def current_git_sha():
+    """SHA of the checked-out commit, overridable with HARNESS_GIT_SHA"""
+    if os.environ.get('HARNESS_GIT_SHA'):
+        return os.environ['HARNESS_GIT_SHA']
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short=12', 'HEAD'], capture_output=True, text=True, timeout=5)
+        if result.returncode == 0 and result.stdout.strip():
+            return result.stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        pass
+    return 'unknown'
+
+
+class BaselineStore:
+    def __init__(self, path=DEFAULT_DB):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.executescript(SCHEMA)
+
+    def save_run(self, suite, recorder, git_sha=None):
+        """Persist the recorder's per-route histograms and throughput as one run"""
+        histograms, errors = recorder.snapshot()
+        duration = recorder.elapsed()
+        with self.db:
+            cursor = self.db.execute(
+                "INSERT INTO runs (suite, git_sha, created_at, duration) VALUES (?, ?, ?, ?)",
+                (suite, git_sha or current_git_sha(), datetime.now().isoformat(timespec='seconds'), duration)
+            )
+            run_id = cursor.lastrowid
+            self.db.executemany(
+                "INSERT INTO route_stats VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (run_id, route, histogram.total, errors.get(route, 0),
+                     histogram.percentile(50), histogram.percentile(95), histogram.percentile(99),
+                     histogram.max / 1000, histogram.total / duration if duration else 0.0,
+                     json.dumps(histogram.to_dict()))
+                    for route, histogram in histograms.items()
+                ]
+            )
+        return run_id
+
+    def list_runs(self, suite=None):
+        query = "SELECT id, suite, git_sha, created_at, duration FROM runs"
+        params = ()
+        if suite:
+            query += " WHERE suite = ?"
+            params = (suite,)
+        rows = self.db.execute(query + " ORDER BY id", params).fetchall()
+        return [dict(zip(('id', 'suite', 'git_sha', 'created_at', 'duration'), row)) for row in rows]
+
+    def latest_sha(self, suite, exclude_sha=None):
+        """Most recently recorded SHA for the suite, skipping exclude_sha"""
+        row = self.db.execute(
+            "SELECT git_sha FROM runs WHERE suite = ? AND git_sha != ? ORDER BY id DESC LIMIT 1",
+            (suite, exclude_sha or '')
+        ).fetchone()
+        return row[0] if row else None
+
+    def load_routes(self, suite, git_sha):
+        """Merge every run recorded for a SHA into one histogram, error count and mean rps per route"""
+        rows = self.db.execute(
+            "SELECT s.route, s.errors, s.rps, s.histogram FROM route_stats s JOIN runs r ON r.id = s.run_id "
+            "WHERE r.suite = ? AND r.git_sha = ?",
+            (suite, git_sha)
+        ).fetchall()
+        routes = {}
+        for route, errors, rps, histogram_json in rows:
+            entry = routes.setdefault(route, {'histogram': LatencyHistogram(), 'errors': 0, 'rps': []})
+            entry['histogram'].merge(LatencyHistogram.from_dict(json.loads(histogram_json)))
+            entry['errors'] += errors
+            entry['rps'].append(rps)
+        for entry in routes.values():
+            entry['rps'] = sum(entry['rps']) / len(entry['rps'])
+        return routes
+
+    def close(self):
+        self.db.close()
+
+
+def mann_whitney_p(baseline, current):
+    """One-sided Mann-Whitney U p-value that current latencies are stochastically larger than baseline"""
+    n1, n2 = baseline.total, current.total
+    if not n1 or not n2:
+        return 1.0
+
+    merged = {}
+    for value, count in baseline.values():
+        merged.setdefault(value, [0, 0])[0] += count
+    for value, count in current.values():
+        merged.setdefault(value, [0, 0])[1] += count
+
+    rank = 0
+    rank_sum_current = 0.0
+    tie_term = 0
+    for value in sorted(merged):
+        in_baseline, in_current = merged[value]
+        ties = in_baseline + in_current
+        average_rank = rank + (ties + 1) / 2
+        rank_sum_current += average_rank * in_current
+        tie_term += ties ** 3 - ties
+        rank += ties
+
+    n = n1 + n2
+    u_current = rank_sum_current - n2 * (n2 + 1) / 2
+    mean = n1 * n2 / 2
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    z = (u_current - mean - 0.5) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def compare_routes(baseline, current, threshold=DEFAULT_THRESHOLD, alpha=DEFAULT_ALPHA, min_samples=MIN_SAMPLES):
+    """Compare per-route p95 against the baseline, returning one row per route"""
+    rows = []
+    for route in sorted(set(baseline) | set(current)):
+        if route not in current:
+            continue
+        current_histogram = current[route]['histogram']
+        row = {
+            'route': route,
+            'current_p95': current_histogram.percentile(95),
+            'current_count': current_histogram.total,
+            'current_rps': current[route].get('rps', 0.0)
+        }
+        if route not in baseline:
+            row.update(status='new', regressed=False)
+            rows.append(row)
+            continue
+
+        baseline_histogram = baseline[route]['histogram']
+        baseline_p95 = baseline_histogram.percentile(95)
+        change = (row['current_p95'] - baseline_p95) / baseline_p95 if baseline_p95 else 0.0
+        p_value = mann_whitney_p(baseline_histogram, current_histogram)
+        row.update(
+            baseline_p95=baseline_p95,
+            baseline_count=baseline_histogram.total,
+            baseline_rps=baseline[route].get('rps', 0.0),
+            change=change,
+            p_value=p_value
+        )
+
+        if min(baseline_histogram.total, current_histogram.total) < min_samples:
+            row.update(status='few samples', regressed=False)
+        elif change > threshold and p_value < alpha:
+            row.update(status='REGRESSED', regressed=True)
+        elif change > threshold:
+            row.update(status='slower (noise)', regressed=False)
+        else:
+            row.update(status='ok', regressed=False)
+        rows.append(row)
+    return rows
+
+
+def print_comparison(rows, baseline_sha, threshold=DEFAULT_THRESHOLD):
+    print("=" * 60)
+    print(f"📈 LATENCY BASELINE COMPARISON (vs {baseline_sha}, p95 threshold +{threshold * 100:.0f}%)")
+    print("=" * 60)
+    width = max([len(row['route']) for row in rows] + [5]) + 2
+    print(f"{'Route':<{width}} {'Base p95':>9} {'Now p95':>9} {'Change':>8} {'p-value':>8}  Status")
+    for row in rows:
+        if 'baseline_p95' in row:
+            print(f"{row['route']:<{width}} {row['baseline_p95']:>9.1f} {row['current_p95']:>9.1f} "
+                  f"{row['change'] * 100:>+7.1f}% {row['p_value']:>8.3f}  {row['status']}")
+        else:
+            print(f"{row['route']:<{width}} {'-':>9} {row['current_p95']:>9.1f} {'-':>8} {'-':>8}  {row['status']}")
+
+    regressed = [row['route'] for row in rows if row['regressed']]
+    if regressed:
+        print(f"\n⚠️  {len(regressed)} routes regressed: {', '.join(regressed)}")
+    else:
+        print("\n🎉 No latency regressions against the baseline.")
+    return not regressed
+
+
+def add_baseline_arguments(parser):
+    group = parser.add_argument_group('latency baselines')
+    group.add_argument('--baseline-db', default=DEFAULT_DB, help=f"SQLite baseline store (default: {DEFAULT_DB})")
+    group.add_argument('--save-baseline', action='store_true', help="Store this run's latencies under the current git SHA")
+    group.add_argument('--compare-baseline', nargs='?', const='', default=None, metavar='SHA',
+                       help="Compare this run against a stored SHA (default: latest other SHA) and fail on regressions")
+    group.add_argument('--regression-threshold', type=float, default=DEFAULT_THRESHOLD,
+                       help="Relative p95 increase that counts as a regression (default: 0.10)")
+    group.add_argument('--regression-alpha', type=float, default=DEFAULT_ALPHA,
+                       help="Significance level for the Mann-Whitney test (default: 0.05)")
+
+
+def handle_baseline_options(args, recorder, suite):
+    """Save and/or compare the run as requested on the command line; False when a regression was found"""
+    if not args.save_baseline and args.compare_baseline is None:
+        return True
+
+    store = BaselineStore(args.baseline_db)
+    try:
+        git_sha = current_git_sha()
+        passed = True
+        if args.compare_baseline is not None:
+            baseline_sha = args.compare_baseline or store.latest_sha(suite, exclude_sha=git_sha)
+            baseline = store.load_routes(suite, baseline_sha) if baseline_sha else {}
+            if not baseline:
+                print(f"⚠️  No stored baseline for suite '{suite}'{f' at {baseline_sha}' if baseline_sha else ''}")
+            else:
+                histograms, errors = recorder.snapshot()
+                duration = recorder.elapsed()
+                current = {
+                    route: {'histogram': histogram, 'errors': errors.get(route, 0),
+                            'rps': histogram.total / duration if duration else 0.0}
+                    for route, histogram in histograms.items()
+                }
+                rows = compare_routes(baseline, current, args.regression_threshold, args.regression_alpha)
+                passed = print_comparison(rows, baseline_sha, args.regression_threshold)
+
+        if args.save_baseline:
+            run_id = store.save_run(suite, recorder, git_sha)
+            print(f"💾 Saved latency baseline run #{run_id} for {suite} @ {git_sha}")
+        return passed
+    finally:
+        store.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect and compare stored latency baselines")
+    parser.add_argument('--db', default=DEFAULT_DB)
+    subcommands = parser.add_subparsers(dest='command', required=True)
+
+    list_parser = subcommands.add_parser('list', help="List recorded runs")
+    list_parser.add_argument('--suite')
+
+    compare_parser = subcommands.add_parser('compare', help="Compare two recorded SHAs")
+    compare_parser.add_argument('--suite', required=True)
+    compare_parser.add_argument('--baseline', required=True, help="Baseline git SHA")
+    compare_parser.add_argument('--current', default=None, help="Candidate git SHA (default: checked-out commit)")
+    compare_parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+    compare_parser.add_argument('--alpha', type=float, default=DEFAULT_ALPHA)
+    args = parser.parse_args(argv)
+
+    store = BaselineStore(args.db)
+    try:
+        if args.command == 'list':
+            for run in store.list_runs(args.suite):
+                print(f"#{run['id']:<5} {run['suite']:<10} {run['git_sha']:<14} {run['created_at']}  {run['duration']:.1f}s")
+            return 0
+
+        current_sha = args.current or current_git_sha()
+        rows = compare_routes(store.load_routes(args.suite, args.baseline), store.load_routes(args.suite, current_sha),
+                              args.threshold, args.alpha)
+        return 0 if print_comparison(rows, args.baseline, args.threshold) else 1
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,215 @@
+"""
+Record/replay cassettes for the shared request path
+Recording captures every request/response pair sent through HarnessSession into one indexed file; replay
+serves them from a memory-mapped copy of that file with no network access at all
+
+Values the harness generates itself (int(time.time()) emails and names, epoch milliseconds, uuids) are
+templated out of the match keys and substituted back into the replayed bodies. Tokens only travel in
+headers, which are never part of a key. Requests are matched on method, templated URL and body in
+recorded order, falling back to the route template when a body differs.
+
+Usage:
+    python backend_test.py --record .harness/backend.cassette
+    python backend_test.py --replay .harness/backend.cassette
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import re
+import struct
+import threading
+import zlib
+from collections import deque
+from urllib.parse import urlsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from harness.latency import normalize_route
+
+MAGIC = b'BCRMCAS1'
+FOOTER = struct.Struct('<Q')
+# Bodies smaller than this are stored as-is; compressing them costs more than it saves
+COMPRESS_MIN = 256
+KEPT_HEADERS = ('Content-Type',)
+
+# Epoch seconds or milliseconds from the last few years, and uuids
+_VOLATILE = re.compile(r'(?<!\d)1[6-9]\d{8}(?:\d{3})?(?!\d)'
+                       r'|[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}', re.IGNORECASE)
+
+
+class CassetteMiss(requests.exceptions.ConnectionError):
+    """A replayed request has no recorded response left"""
+
+
+def _template(text, values):
+    """Replace volatile values in text with numbered placeholders, appending new ones to values"""
+    def placeholder(match):
+        value = match.group(0)
+        if value not in values:
+            values.append(value)
+        return f"{{{{{values.index(value)}}}}}"
+    return _VOLATILE.sub(placeholder, text)
+
+
+def request_key(method, url, params=None, body=None):
+    """(match key, route fallback key, volatile values in order) for one request"""
+    values = []
+    # Only the path is matched, so a cassette replays against any base URL
+    target = urlsplit(url).path
+    if params:
+        target += '?' + '&'.join(f"{name}={params[name]}" for name in sorted(params))
+    target = _template(target, values)
+    digest = ''
+    if body is not None:
+        canonical = _template(json.dumps(body, sort_keys=True, separators=(',', ':')), values)
+        digest = hashlib.sha1(canonical.encode()).hexdigest()[:16]
+    return f"{method.upper()} {target} {digest}", f"{method.upper()} {normalize_route(url)}", values
+
+
+class Cassette:
+    """One cassette file opened for recording ('record') or replay ('replay')"""
+
+    def __init__(self, path, mode):
+        if mode not in ('record', 'replay'):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.path = path
+        self.mode = mode
+        self.replaying = mode == 'replay'
+        self.entries = []
+        self.misses = 0
+        self._lock = threading.Lock()
+        if self.replaying:
+            self._open_replay()
+        else:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            self._file = open(path + '.tmp', 'wb')
+            self._file.write(MAGIC)
+
+    # ---------- recording ----------
+
+    def record(self, method, url, params, body, response):
+        key, route, values = request_key(method, url, params, body)
+        content = response.content
+        compressed = len(content) >= COMPRESS_MIN
+        blob = zlib.compress(content) if compressed else content
+        with self._lock:
+            offset = self._file.tell()
+            self._file.write(blob)
+            self.entries.append({
+                'key': key,
+                'route': route,
+                'values': values,
+                'status': response.status_code,
+                'headers': {name: response.headers[name] for name in KEPT_HEADERS if name in response.headers},
+                'offset': offset,
+                'length': len(blob),
+                'compressed': compressed
+            })
+
+    def close(self):
+        """Finish a recording by writing the index; replay cassettes just release the mapping"""
+        if self.replaying:
+            self._map.close()
+            self._handle.close()
+            return
+        with self._lock:
+            index_offset = self._file.tell()
+            self._file.write(json.dumps(self.entries, separators=(',', ':')).encode())
+            self._file.write(FOOTER.pack(index_offset))
+            self._file.close()
+        os.replace(self.path + '.tmp', self.path)
+
+    # ---------- replay ----------
+
+    def _open_replay(self):
+        self._handle = open(self.path, 'rb')
+        self._map = mmap.mmap(self._handle.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{self.path} is not a harness cassette")
+        (index_offset,) = FOOTER.unpack(self._map[-FOOTER.size:])
+        self.entries = json.loads(self._map[index_offset:-FOOTER.size])
+        self._by_key = {}
+        self._by_route = {}
+        for position, entry in enumerate(self.entries):
+            self._by_key.setdefault(entry['key'], deque()).append(position)
+            self._by_route.setdefault(entry['route'], deque()).append(position)
+        self._used = set()
+
+    def _take(self, queue):
+        while queue:
+            position = queue.popleft()
+            if position not in self._used:
+                self._used.add(position)
+                return position
+        return None
+
+    def play(self, method, url, params=None, body=None):
+        """The next recorded response for this request, as a requests.Response"""
+        key, route, values = request_key(method, url, params, body)
+        with self._lock:
+            position = self._take(self._by_key.get(key, deque()))
+            if position is None:
+                position = self._take(self._by_route.get(route, deque()))
+            if position is None:
+                self.misses += 1
+                raise CassetteMiss(f"No recorded response left for {route}")
+        entry = self.entries[position]
+
+        content = self._map[entry['offset']:entry['offset'] + entry['length']]
+        if entry['compressed']:
+            content = zlib.decompress(content)
+        # Put this run's timestamps and uuids where the recording had its own
+        for recorded, current in zip(entry['values'], values):
+            if recorded != current:
+                content = content.replace(recorded.encode(), current.encode())
+
+        response = requests.Response()
+        response.status_code = entry['status']
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        response._content = content
+        response._content_consumed = True
+        response.encoding = 'utf-8'
+        response.url = url
+        response.reason = 'Replayed'
+        return response
+
+    def summary(self):
+        if self.replaying:
+            return {'mode': self.mode, 'recorded': len(self.entries), 'served': len(self._used), 'misses': self.misses}
+        return {'mode': self.mode, 'recorded': len(self.entries)}
+
+
+def add_cassette_arguments(parser):
+    group = parser.add_argument_group('record/replay')
+    modes = group.add_mutually_exclusive_group()
+    modes.add_argument('--record', metavar='PATH', help="Record every request/response of this run to a cassette")
+    modes.add_argument('--replay', metavar='PATH', help="Serve responses from a recorded cassette, offline")
+
+
+def install_cassette(args, session):
+    """Attach the cassette requested on the command line (or HARNESS_CASSETTE) to session, returning it"""
+    path = args.record or args.replay or os.environ.get('HARNESS_CASSETTE')
+    if not path:
+        return None
+    mode = 'record' if args.record else 'replay' if args.replay else os.environ.get('HARNESS_CASSETTE_MODE', 'replay')
+    session.cassette = Cassette(path, mode)
+    print(f"📼 {'Recording to' if mode == 'record' else 'Replaying from'} {path}")
+    return session.cassette
+
+
+def close_cassette(session):
+    """Finish the session's cassette, if any, and report what it held"""
+    cassette = getattr(session, 'cassette', None)
+    if cassette is None:
+        return None
+    session.cassette = None
+    cassette.close()
+    summary = cassette.summary()
+    if cassette.replaying:
+        print(f"📼 Replayed {summary['served']}/{summary['recorded']} recorded responses, {summary['misses']} misses")
+    else:
+        print(f"📼 Recorded {summary['recorded']} responses to {cassette.path}")
+    return summary
@@ -0,0 +1,139 @@
+"""
+Single entry point for the BuildCRM API harness
+Each subcommand names the module that implements it; the module (and whatever HTTP or stats stack it
+needs) is imported only when that subcommand runs, so `smoke` starts about as fast as the interpreter.
+Arguments after the subcommand go to that module's own parser.
+
+`startup` checks the CLI's own start-up time against HARNESS_STARTUP_BUDGET_MS and fails when a light
+subcommand pulls in a heavy library; run it in CI so a stray top-level import cannot creep back in.
+
+Usage:
+    python -m harness smoke --login
+    python -m harness full --workers 8
+    python -m harness load --users 200 --duration 60 --adaptive
+    python -m harness bench webhooks --leads 50000
+    python -m harness diff --base-a URL --base-b URL
+    python -m harness startup
+"""
+
+import argparse
+import importlib
+import os
+import sys
+import time
+
+COMMANDS = {
+    'smoke': ('harness.smoke', "Health, plans and modules check for deploy hooks"),
+    'full': ('backend_test', "Full backend API suite"),
+    'modular': ('test_modular_api', "Modular API suite"),
+    'load': ('harness.load', "Async load generator"),
+    'seed': ('harness.seeder', "Bulk tenant data seeder"),
+    'diff': ('harness.differential', "Run one suite against two deployments and compare them"),
+}
+BENCHES = {
+    'complexity': 'harness.complexity',
+    'webhooks': 'harness.webhook_burst',
+    'isolation': 'harness.isolation',
+    'approvals': 'harness.approval_race',
+    'soak': 'harness.soak',
+    'sharded': 'harness.sharded',
+    'payloads': 'harness.payloads',
+}
+
+STARTUP_BUDGET_MS = float(os.environ.get('HARNESS_STARTUP_BUDGET_MS', '150'))
+# Command lines that must start within the budget, and libraries they must never import
+STARTUP_PROBES = (('--help',), ('smoke', '--help'))
+HEAVY_MODULES = ('requests', 'urllib3', 'aiohttp', 'backend_test', 'test_modular_api', 'harness.session')
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_module(module, argv, prog):
+    """Import module and run its main(argv), returning its exit code"""
+    # The module's parser names itself after argv[0] in usage and error messages
+    sys.argv[0] = prog
+    return importlib.import_module(module).main(argv)
+
+
+def _wall_ms(command):
+    import subprocess
+
+    started = time.perf_counter()
+    subprocess.run(command, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return (time.perf_counter() - started) * 1000
+
+
+def _probe(argv, runs):
+    """(median wall ms, {module: cumulative import us}) for `python -m harness argv`"""
+    import statistics
+    import subprocess
+
+    command = [sys.executable, '-m', 'harness', *argv]
+    timings = [_wall_ms(command) for _ in range(runs)]
+    profile = subprocess.run([sys.executable, '-X', 'importtime', *command[1:]], cwd=ROOT,
+                             stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True).stderr
+    imports = {}
+    for line in profile.splitlines():
+        parts = line.split('|')
+        if len(parts) == 3 and parts[1].strip().isdigit():
+            imports[parts[2].strip()] = int(parts[1])
+    return statistics.median(timings), imports
+
+
+def check_startup(budget_ms=STARTUP_BUDGET_MS, runs=5):
+    """Time the start-up probes against the budget, returning the report"""
+    import statistics
+
+    baseline = statistics.median(_wall_ms([sys.executable, '-c', 'pass']) for _ in range(runs))
+    report = {'budget_ms': budget_ms, 'interpreter_ms': baseline, 'probes': []}
+    for argv in STARTUP_PROBES:
+        wall_ms, imports = _probe(argv, runs)
+        heavy = sorted(name for name in imports
+                       if any(name == module or name.startswith(module + '.') for module in HEAVY_MODULES))
+        slowest = sorted(imports.items(), key=lambda item: item[1], reverse=True)[:5]
+        report['probes'].append({'argv': ' '.join(argv), 'wall_ms': wall_ms, 'heavy': heavy,
+                                 'slowest_imports': slowest, 'passed': wall_ms <= budget_ms and not heavy})
+    return report
+
+
+def print_startup_report(report):
+    print(f"⏱️  Start-up budget {report['budget_ms']:.0f}ms (bare interpreter {report['interpreter_ms']:.0f}ms)")
+    for probe in report['probes']:
+        print(f"{'✅ PASS' if probe['passed'] else '❌ FAIL'} python -m harness {probe['argv']}: "
+              f"{probe['wall_ms']:.0f}ms")
+        if probe['heavy']:
+            print(f"   Imports heavy modules: {', '.join(probe['heavy'])}")
+        if not probe['passed']:
+            for name, micros in probe['slowest_imports']:
+                print(f"   {micros / 1000:>7.1f}ms {name}")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m harness', description="BuildCRM API test harness")
+    commands = parser.add_subparsers(dest='command', metavar='command', required=True)
+    # Only for help and errors: main() hands module commands their arguments before parsing
+    for name, (_, description) in COMMANDS.items():
+        commands.add_parser(name, help=description)
+    bench = commands.add_parser('bench', help=f"Benchmarks: {', '.join(BENCHES)}")
+    bench.add_argument('bench', choices=BENCHES)
+    startup = commands.add_parser('startup', help="Check start-up time against the budget")
+    startup.add_argument('--budget-ms', type=float, default=STARTUP_BUDGET_MS)
+    startup.add_argument('--runs', type=int, default=5, help="Timed runs per probe (the median counts)")
+    return parser
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    # Everything after the command belongs to the module, options included
+    if argv and argv[0] in COMMANDS:
+        return run_module(COMMANDS[argv[0]][0], argv[1:], f"python -m harness {argv[0]}")
+    if len(argv) > 1 and argv[0] == 'bench' and argv[1] in BENCHES:
+        return run_module(BENCHES[argv[1]], argv[2:], f"python -m harness bench {argv[1]}")
+
+    args = build_parser().parse_args(argv)
+    report = check_startup(args.budget_ms, args.runs)
+    print_startup_report(report)
+    return 0 if all(probe['passed'] for probe in report['probes']) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,212 @@
+"""
+Endpoint complexity profiler: latency against tenant data size
+Grows one tenant through stepped record counts, times the BuildCRMTester read paths at every step and fits
+a scaling curve per route (constant, log, linear, n log n, quadratic)
+
+Routes that scale worse than expected are flagged: a paged list growing linearly points at an unbounded
+response or a missing index.
+
+Usage:
+    python -m harness.complexity --sizes 100,1000,10000,100000 --samples 5
+"""
+
+import argparse
+import json
+import math
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from harness.config import BASE_URL
+from harness.ledger import ResourceLedger, print_teardown_summary, teardown
+from harness.payloads import PayloadFactory
+from harness.seeder import register_tenant
+from harness.session import HarnessSession, bind_requests
+
+DEFAULT_SIZES = (100, 1000, 10000, 100000)
+DEFAULT_KINDS = ('leads', 'tasks', 'expenses')
+
+# Scaling classes from best to worst, with the size transform each one is fitted on
+MODELS = [
+    ('constant', lambda n: 0.0),
+    ('log', lambda n: math.log(n)),
+    ('linear', lambda n: float(n)),
+    ('n log n', lambda n: n * math.log(n)),
+    ('quadratic', lambda n: float(n) * n),
+]
+# A more complex model must cut the residual error by this factor to be preferred over a simpler one
+MODEL_GAIN = 0.5
+
+# Expected worst acceptable class per route: paged lists should not grow with the tenant, aggregates may
+ROUTES = {
+    'GET /leads': 'log',
+    'GET /projects': 'log',
+    'GET /tasks': 'log',
+    'GET /client/stats': 'linear',
+    'GET /reports/sales': 'linear',
+    'GET /reports/expenses': 'linear',
+}
+
+
+def fit_curve(sizes, latencies):
+    """Pick the simplest scaling model that explains the medians, returning (name, intercept, slope, rss)"""
+    fits = []
+    mean_t = statistics.fmean(latencies)
+    for name, transform in MODELS:
+        xs = [transform(size) for size in sizes]
+        mean_x = statistics.fmean(xs)
+        variance = sum((x - mean_x) ** 2 for x in xs)
+        slope = sum((x - mean_x) * (t - mean_t) for x, t in zip(xs, latencies)) / variance if variance else 0.0
+        # A negative slope just means noise around a flat line
+        slope = max(slope, 0.0)
+        intercept = mean_t - slope * mean_x
+        rss = sum((intercept + slope * x - t) ** 2 for x, t in zip(xs, latencies))
+        fits.append((name, intercept, slope, rss))
+
+    best = fits[0]
+    for fit in fits[1:]:
+        if fit[2] > 0 and fit[3] < best[3] * MODEL_GAIN:
+            best = fit
+    return best
+
+
+def loglog_slope(sizes, latencies):
+    """Exponent k in latency ~ size^k, for a quick read of the growth rate"""
+    xs = [math.log(size) for size in sizes]
+    ys = [math.log(max(latency, 1e-6)) for latency in latencies]
+    mean_x, mean_y = statistics.fmean(xs), statistics.fmean(ys)
+    variance = sum((x - mean_x) ** 2 for x in xs)
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / variance if variance else 0.0
+
+
+class ComplexityProfiler:
+    def __init__(self, base_url=BASE_URL, workers=32, samples=5, ledger=None):
+        self.base_url = base_url
+        self.workers = workers
+        self.samples = samples
+        self.ledger = ledger or ResourceLedger()
+        self.make_request = bind_requests(base_url, HarnessSession(pool_size=workers))
+        self.payloads = PayloadFactory()
+        self.tenant = None
+
+    def register(self):
+        self.tenant = register_tenant(self.make_request, int(time.time()), 0, prefix='profile')
+        if not self.tenant:
+            raise SystemExit("Could not register the profiling tenant")
+        self.ledger.record(self.base_url, 'clients', self.tenant['client_id'], token=self.tenant['token'],
+                           email=self.tenant['email'], password=self.tenant['password'])
+
+    def grow(self, kind, start, stop):
+        """Post records start..stop-1 of one kind, returning how many were created"""
+        token = self.tenant['token']
+
+        def create(index):
+            payload = self.payloads.payload(kind, index)
+            response = self.make_request('POST', f'/{kind}', payload, token=token)
+            if response is None or response.status_code not in (200, 201):
+                return None
+            try:
+                body = response.json()
+            except ValueError:
+                return None
+            # POST /leads wraps the record as {lead, contactCreated}; the other kinds return it bare
+            record = body.get('lead', body) if isinstance(body, dict) else None
+            return record.get('id') if isinstance(record, dict) else None
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            created = [resource_id for resource_id in executor.map(create, range(start, stop)) if resource_id]
+        self.ledger.record_many(self.base_url, kind, created, token=token, owner=self.tenant['client_id'])
+        return len(created)
+
+    def measure(self, route):
+        """Median latency in ms over the configured samples, after one warm-up request"""
+        method, endpoint = route.split(' ', 1)
+        self.make_request(method, endpoint, token=self.tenant['token'])
+        timings = []
+        for _ in range(self.samples):
+            started = time.perf_counter()
+            response = self.make_request(method, endpoint, token=self.tenant['token'])
+            elapsed = (time.perf_counter() - started) * 1000
+            if response is not None and response.status_code == 200:
+                timings.append(elapsed)
+        return statistics.median(timings) if timings else None
+
+    def run(self, sizes=DEFAULT_SIZES, kinds=DEFAULT_KINDS, routes=ROUTES, cleanup=True):
+        self.register()
+        counts = dict.fromkeys(kinds, 0)
+        steps = []
+        for size in sorted(sizes):
+            started = time.perf_counter()
+            for kind in kinds:
+                counts[kind] += self.grow(kind, counts[kind], size)
+            grow_seconds = time.perf_counter() - started
+            latencies = {route: self.measure(route) for route in routes}
+            steps.append({'size': size, 'records': dict(counts), 'grow_seconds': grow_seconds, 'latency_ms': latencies})
+            print(f"📈 {size:>7} records/kind  " + "  ".join(
+                f"{route.split(' ', 1)[1]} {latency:.1f}ms" if latency is not None else f"{route.split(' ', 1)[1]} -"
+                for route, latency in latencies.items()))
+
+        report = {'sizes': [step['size'] for step in steps], 'steps': steps, 'routes': {}}
+        for route, expected in routes.items():
+            points = [(step['size'], step['latency_ms'][route]) for step in steps
+                      if step['latency_ms'][route] is not None]
+            if len(points) < 3:
+                report['routes'][route] = {'model': None, 'expected': expected, 'flagged': False}
+                continue
+            sizes_seen, latencies = zip(*points)
+            name, intercept, slope, _ = fit_curve(sizes_seen, latencies)
+            ranks = [model for model, _ in MODELS]
+            report['routes'][route] = {
+                'model': name,
+                'expected': expected,
+                'intercept_ms': intercept,
+                'slope': slope,
+                'loglog_exponent': loglog_slope(sizes_seen, latencies),
+                'flagged': ranks.index(name) > ranks.index(expected)
+            }
+        if cleanup:
+            report['teardown'] = teardown(self.make_request, self.base_url, self.ledger, self.workers)
+        return report
+
+
+def print_complexity_report(report):
+    print("=" * 60)
+    print("📐 ENDPOINT SCALING")
+    print("=" * 60)
+    print(f"{'Route':<24} {'Fitted':>10} {'Expected':>10} {'k':>6}")
+    for route, fit in report['routes'].items():
+        if fit['model'] is None:
+            print(f"{route:<24} {'-':>10} {fit['expected']:>10} {'-':>6}  (too few successful steps)")
+            continue
+        flag = "  ⚠️  scales worse than expected" if fit['flagged'] else ""
+        print(f"{route:<24} {fit['model']:>10} {fit['expected']:>10} {fit['loglog_exponent']:>6.2f}{flag}")
+    if 'teardown' in report:
+        print_teardown_summary(report['teardown'])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fit latency-vs-size curves for the tenant read routes")
+    parser.add_argument('--base-url', default=BASE_URL)
+    parser.add_argument('--sizes', default=','.join(str(size) for size in DEFAULT_SIZES),
+                        help="Comma-separated records per kind at each step")
+    parser.add_argument('--kinds', default=','.join(DEFAULT_KINDS), help="Record kinds grown at each step")
+    parser.add_argument('--samples', type=int, default=5, help="Timed requests per route per step")
+    parser.add_argument('--workers', type=int, default=32, help="Concurrent posts while growing the tenant")
+    parser.add_argument('--no-teardown', action='store_true', help="Leave the profiling tenant and records in place")
+    parser.add_argument('--json', metavar='PATH', help="Also write the report to PATH as JSON")
+    args = parser.parse_args(argv)
+
+    profiler = ComplexityProfiler(base_url=args.base_url, workers=args.workers, samples=args.samples)
+    report = profiler.run(sizes=[int(size) for size in args.sizes.split(',') if size.strip()],
+                          kinds=[kind.strip() for kind in args.kinds.split(',') if kind.strip()],
+                          cleanup=not args.no_teardown)
+    print_complexity_report(report)
+    if args.json:
+        with open(args.json, 'w') as handle:
+            json.dump(report, handle, indent=2)
+    return 1 if any(fit['flagged'] for fit in report['routes'].values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,13 @@
+"""
+Shared configuration for the BuildCRM API test harness
+Point every script at another deployment (e.g. the local stand-in server) with HARNESS_BASE_URL
+"""
+
+import os
+
+DEFAULT_BASE_URL = "https://expense-fix.preview.emergentagent.com/api"
+BASE_URL = os.environ.get('HARNESS_BASE_URL', DEFAULT_BASE_URL).rstrip('/')
+SUPER_ADMIN_EMAIL = "admin@buildcrm.com"
+SUPER_ADMIN_PASSWORD = "admin123"
+DEMO_CLIENT_EMAIL = "demo@example.com"
+DEMO_CLIENT_PASSWORD = "demo123"
@@ -0,0 +1,269 @@
+"""
+Differential runner: one scenario plan against two deployments side by side
+Each step of the backend or modular suite runs on two testers at once, one per base URL, each with its
+own tenant, tokens and connection pool. Every request a step makes is paired with its counterpart on
+the other deployment (the n-th call of each route) and compared on status code and normalized body;
+the per-route latency distributions are compared at the end with the baseline p95 test.
+
+Bodies are normalized before comparing: ids, tokens, timestamps and anything else a deployment
+generates itself are masked, and lists are compared on the shape of their items only, since two
+deployments rarely hold the same data. Status and shape differences are regressions; differing
+scalar values are reported but only fail the run with --strict.
+
+Usage:
+    python -m harness.differential --base-a https://staging.example.com/api --base-b http://127.0.0.1:8000/api
+    python -m harness diff --suite modular --base-a URL --base-b URL --repeat 5 --json diff.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from harness.baseline import DEFAULT_ALPHA, DEFAULT_THRESHOLD, compare_routes, print_comparison
+from harness.config import BASE_URL
+from harness.ledger import ResourceLedger, print_teardown_summary, teardown
+from harness.results import configure_result_sink
+from harness.session import HarnessSession
+
+SUITES = ('backend', 'modular')
+# Items of a list compared for shape; the rest are assumed alike
+LIST_ITEMS = 5
+# Diffs kept per run; counts stay exact beyond it
+DIFF_LIMIT = 500
+
+_VOLATILE = re.compile(r'[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}'
+                       r'|\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(?:\.\d+)?(?:Z|[+-]\d{2}:?\d{2})?'
+                       r'|(?<!\d)1[6-9]\d{8}(?:\d{3})?(?!\d)'
+                       r'|eyJ[\w-]+\.[\w-]+\.[\w-]+', re.IGNORECASE)
+_VOLATILE_KEYS = frozenset(['id', 'token', 'createdBy', 'requestedBy', 'processedBy'])
+
+
+def _volatile_key(key):
+    return key in _VOLATILE_KEYS or key.endswith('Id') or key.endswith('At')
+
+
+def normalize(value, key=''):
+    """The body with deployment-generated values replaced by placeholders"""
+    if isinstance(value, dict):
+        return {name: normalize(item, name) for name, item in value.items()}
+    if isinstance(value, list):
+        return [normalize(item, key) for item in value]
+    if value is not None and _volatile_key(key):
+        return f"<{key}>"
+    if isinstance(value, str):
+        return _VOLATILE.sub('<volatile>', value)
+    return value
+
+
+def _kind(value):
+    if isinstance(value, bool) or value is None:
+        return type(value).__name__
+    if isinstance(value, (int, float)):
+        return 'number'
+    return type(value).__name__
+
+
+def diff_bodies(a, b, path='body', values=True):
+    """(kind, path, a, b) for each difference between two normalized bodies; kind is 'shape' or 'value'"""
+    if _kind(a) != _kind(b):
+        # A null where a value was expected is a data difference, not a schema one
+        kind = 'value' if a is None or b is None else 'shape'
+        return [(kind, path, _kind(a), _kind(b))]
+    if isinstance(a, dict):
+        diffs = [('shape', f"{path}.{key}", 'present', 'missing') for key in a if key not in b]
+        diffs += [('shape', f"{path}.{key}", 'missing', 'present') for key in b if key not in a]
+        for key in a:
+            if key in b:
+                diffs += diff_bodies(a[key], b[key], f"{path}.{key}", values)
+        return diffs
+    if isinstance(a, list):
+        diffs = [('value', f"{path}.length", len(a), len(b))] if values and len(a) != len(b) else []
+        for index, (item_a, item_b) in enumerate(zip(a[:LIST_ITEMS], b[:LIST_ITEMS])):
+            diffs += diff_bodies(item_a, item_b, f"{path}[{index}]", values=False)
+        return diffs
+    if values and a != b:
+        return [('value', path, a, b)]
+    return []
+
+
+def _parse(content):
+    if not content:
+        return None
+    try:
+        return json.loads(content)
+    except ValueError:
+        return content.decode('utf-8', 'replace')[:200]
+
+
+def compare_exchanges(step, exchanges_a, exchanges_b):
+    """Pair the n-th call of each route on both sides and list their differences"""
+    by_route_a, by_route_b = {}, {}
+    for exchange in exchanges_a:
+        by_route_a.setdefault(exchange['route'], []).append(exchange)
+    for exchange in exchanges_b:
+        by_route_b.setdefault(exchange['route'], []).append(exchange)
+
+    diffs = []
+    for route in sorted(set(by_route_a) | set(by_route_b)):
+        calls_a, calls_b = by_route_a.get(route, []), by_route_b.get(route, [])
+        if len(calls_a) != len(calls_b):
+            diffs.append({'step': step, 'route': route, 'kind': 'unpaired', 'path': 'calls',
+                          'a': len(calls_a), 'b': len(calls_b)})
+        for occurrence, (call_a, call_b) in enumerate(zip(calls_a, calls_b)):
+            base = {'step': step, 'route': route, 'occurrence': occurrence}
+            if call_a['status'] != call_b['status']:
+                diffs.append({**base, 'kind': 'status', 'path': 'status', 'a': call_a['status'], 'b': call_b['status']})
+                continue
+            body_a = normalize(_parse(call_a['content']))
+            body_b = normalize(_parse(call_b['content']))
+            for kind, path, value_a, value_b in diff_bodies(body_a, body_b):
+                diffs.append({**base, 'kind': kind, 'path': path, 'a': value_a, 'b': value_b})
+    return diffs
+
+
+def _suite(name):
+    if name == 'backend':
+        from backend_test import BuildCRMTester
+        return BuildCRMTester
+    if name == 'modular':
+        from test_modular_api import ModularAPITester
+        return ModularAPITester
+    raise ValueError(f"Unknown suite: {name}")
+
+
+def _run_step(tester, step):
+    tester.session.capture = []
+    try:
+        passed = tester.run_test(step)
+    except Exception as e:
+        tester.session.capture.append({'route': 'exception', 'status': None, 'content': repr(e).encode()})
+        passed = False
+    return passed, tester.session.capture
+
+
+def run_differential(base_a, base_b, suite='backend', repeat=1, fresh_tenant=None, cleanup=True,
+                     threshold=DEFAULT_THRESHOLD, alpha=DEFAULT_ALPHA):
+    tester_class = _suite(suite)
+    # The testers pick up the shared sink when built; the step lines below replace its console output
+    configure_result_sink(console=False, suite='differential')
+    testers = []
+    for side, base_url in (('a', base_a), ('b', base_b)):
+        # A tenant per side, so comparing a deployment with itself does not race on one cached tenant
+        tester = tester_class(base_url=base_url, fresh_tenant=fresh_tenant, tenant_name=f"{suite}-diff-{side}")
+        # Separate pools and latency recorders, so each side's histograms hold only its own requests
+        tester.session = HarnessSession()
+        testers.append(tester)
+
+    steps = []
+    counts = {'status': 0, 'shape': 0, 'value': 0, 'unpaired': 0}
+    diffs = []
+    started = time.perf_counter()
+    plans = [tester.test_plan() for tester in testers]
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        for iteration in range(repeat):
+            for (name, step_a), (_, step_b) in zip(*plans):
+                output = io.StringIO()
+                with contextlib.redirect_stdout(output):
+                    future_b = executor.submit(_run_step, testers[1], step_b)
+                    passed_a, exchanges_a = _run_step(testers[0], step_a)
+                    passed_b, exchanges_b = future_b.result()
+                step_diffs = compare_exchanges(name, exchanges_a, exchanges_b)
+                for diff in step_diffs:
+                    counts[diff['kind']] += 1
+                diffs.extend(step_diffs[:max(DIFF_LIMIT - len(diffs), 0)])
+                step = {'name': name, 'iteration': iteration, 'passed_a': passed_a, 'passed_b': passed_b,
+                        'requests_a': len(exchanges_a), 'requests_b': len(exchanges_b),
+                        'diffs': {kind: sum(1 for diff in step_diffs if diff['kind'] == kind) for kind in counts}}
+                steps.append(step)
+                print_step(step)
+
+    routes = []
+    for tester in testers:
+        histograms, _ = tester.session.latency.snapshot()
+        routes.append({route: {'histogram': histogram} for route, histogram in histograms.items()})
+    report = {
+        'suite': suite, 'base_a': base_a, 'base_b': base_b, 'repeat': repeat,
+        'seconds': time.perf_counter() - started,
+        'steps': steps, 'counts': counts, 'diffs': diffs,
+        'latency': compare_routes(routes[0], routes[1], threshold, alpha),
+        'threshold': threshold
+    }
+    if cleanup:
+        ledger = ResourceLedger()
+        report['teardown'] = [teardown(tester.make_request, tester.base_url, ledger) for tester in testers]
+    return report
+
+
+def print_step(step):
+    same = step['passed_a'] == step['passed_b']
+    icon = '✅' if same and not (step['diffs']['status'] or step['diffs']['shape'] or step['diffs']['unpaired']) else '❌'
+    outcome = 'pass' if step['passed_a'] else 'fail'
+    if not same:
+        outcome = f"A {'pass' if step['passed_a'] else 'fail'} / B {'pass' if step['passed_b'] else 'fail'}"
+    detail = ', '.join(f"{count} {kind}" for kind, count in step['diffs'].items() if count) or 'identical'
+    print(f"{icon} {step['name'].replace('_', ' ').title()} ({outcome}; "
+          f"{step['requests_a']}/{step['requests_b']} requests; {detail})")
+
+
+def _regressed_steps(report):
+    return [step['name'] for step in report['steps'] if step['passed_a'] and not step['passed_b']]
+
+
+def print_differential_report(report, show=20):
+    print("=" * 60)
+    print(f"🔀 DIFFERENTIAL SUMMARY ({report['suite']}, {report['repeat']}x in {report['seconds']:.1f}s)")
+    print("=" * 60)
+    print(f"A: {report['base_a']}")
+    print(f"B: {report['base_b']}")
+    counts = report['counts']
+    print(f"Differences: {counts['status']} status, {counts['shape']} shape, {counts['value']} value, "
+          f"{counts['unpaired']} unpaired routes")
+    for diff in [diff for diff in report['diffs'] if diff['kind'] != 'value'][:show]:
+        print(f"   {diff['kind'].upper():<8} {diff['step']} {diff['route']} {diff['path']}: "
+              f"A {diff['a']!r} → B {diff['b']!r}")
+    regressed = _regressed_steps(report)
+    if regressed:
+        print(f"⚠️  Steps passing on A but failing on B: {', '.join(sorted(set(regressed)))}")
+    print()
+    print_comparison(report['latency'], 'A', report['threshold'])
+    for summary in report.get('teardown', []):
+        print_teardown_summary(summary)
+
+
+def differential_failed(report, strict=False):
+    counts = report['counts']
+    return bool(_regressed_steps(report) or counts['status'] or counts['shape'] or counts['unpaired']
+                or (strict and counts['value']) or any(row['regressed'] for row in report['latency']))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run one suite against two deployments and diff the answers")
+    parser.add_argument('--base-a', default=BASE_URL, help="Reference deployment (default: HARNESS_BASE_URL)")
+    parser.add_argument('--base-b', required=True, help="Candidate deployment")
+    parser.add_argument('--suite', choices=SUITES, default='backend')
+    parser.add_argument('--repeat', type=int, default=1, help="Run the plan N times for more latency samples")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="Flag routes whose p95 on B is this much slower than on A")
+    parser.add_argument('--strict', action='store_true', help="Also fail on differing scalar values")
+    parser.add_argument('--fresh-tenant', action='store_true', default=None,
+                        help="Register new tenants on both deployments instead of reusing the cached ones")
+    parser.add_argument('--no-teardown', action='store_true', help="Leave created resources in place")
+    parser.add_argument('--json', metavar='PATH', help="Also write the report to PATH as JSON")
+    args = parser.parse_args(argv)
+
+    report = run_differential(args.base_a.rstrip('/'), args.base_b.rstrip('/'), args.suite, args.repeat,
+                              args.fresh_tenant, cleanup=not args.no_teardown, threshold=args.threshold)
+    print_differential_report(report)
+    if args.json:
+        with open(args.json, 'w') as handle:
+            json.dump(report, handle, indent=2, default=str)
+    return 1 if differential_failed(report, args.strict) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+"""
+Cross-tenant isolation probe matrix
+Registers K tenants, seeds each one, then fires every tenant's token at every other tenant's record ids concurrently
+
+Any 2xx answer to a foreign token is a leak. Each record is also read with its owner's token as a control,
+so a broken GET route cannot pass as isolation.
+
+Usage:
+    python -m harness.isolation --tenants 10 --records 3 --workers 32
+"""
+
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from harness.config import BASE_URL
+from harness.ledger import ResourceLedger, print_teardown_summary, teardown
+from harness.payloads import PayloadFactory
+from harness.seeder import register_tenant
+from harness.session import HarnessSession, bind_requests
+
+DEFAULT_KINDS = ('leads', 'projects', 'tasks', 'expenses')
+DENIED_STATUSES = (401, 403, 404)
+
+
+class IsolationProbe:
+    def __init__(self, base_url=BASE_URL, workers=32, ledger=None):
+        self.base_url = base_url
+        self.workers = workers
+        self.ledger = ledger or ResourceLedger()
+        # A dedicated pool sized to the probe concurrency so every worker keeps its connection alive
+        self.make_request = bind_requests(base_url, HarnessSession(pool_size=workers))
+
+    def _map(self, function, items):
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            return list(executor.map(function, items))
+
+    def setup(self, tenants, records, kinds, seed=0):
+        """Register the tenants and seed records of each kind
+
+        Returns the tenants, the (owner, kind, id) targets and the creates that gave no id.
+        """
+        run_id = int(time.time())
+        registered = [tenant for tenant in self._map(
+            lambda index: register_tenant(self.make_request, run_id, index, prefix='isolation'), range(tenants))
+            if tenant]
+        for tenant in registered:
+            self.ledger.record(self.base_url, 'clients', tenant['client_id'], token=tenant['token'],
+                               email=tenant['email'], password=tenant['password'])
+        payloads = PayloadFactory(seed)
+
+        def create(work):
+            tenant, kind, index = work
+            response = self.make_request('POST', f'/{kind}', payloads.payload(kind, index, tenant['index']),
+                                         token=tenant['token'])
+            status = response.status_code if response is not None else None
+            resource_id = None
+            if status in (200, 201):
+                try:
+                    body = response.json()
+                except ValueError:
+                    body = None
+                # POST /leads wraps the record as {lead, contactCreated}; the other kinds return it bare
+                record = body.get('lead', body) if isinstance(body, dict) else None
+                resource_id = record.get('id') if isinstance(record, dict) else None
+            if not resource_id:
+                return {'owner': tenant['index'], 'kind': kind, 'status': status}
+            self.ledger.record(self.base_url, kind, resource_id, token=tenant['token'], owner=tenant['client_id'])
+            return (tenant['index'], kind, resource_id)
+
+        work = [(tenant, kind, index) for tenant in registered for kind in kinds for index in range(records)]
+        created = self._map(create, work)
+        targets = [result for result in created if isinstance(result, tuple)]
+        failures = [result for result in created if isinstance(result, dict)]
+        return registered, targets, failures
+
+    def probe(self, tenants, targets):
+        """Read every target with every tenant's token and classify the answers"""
+        tokens = {tenant['index']: tenant['token'] for tenant in tenants}
+        probes = [(attacker, owner, kind, resource_id)
+                  for owner, kind, resource_id in targets
+                  for attacker in tokens]
+
+        def fire(work):
+            attacker, owner, kind, resource_id = work
+            response = self.make_request('GET', f'/{kind}/{resource_id}', token=tokens[attacker])
+            return response.status_code if response is not None else None
+
+        started = time.perf_counter()
+        statuses = self._map(fire, probes)
+        elapsed = time.perf_counter() - started
+
+        report = {'tenants': len(tenants), 'targets': len(targets), 'probes': len(probes),
+                  'seconds': elapsed, 'probes_per_second': len(probes) / elapsed if elapsed else 0.0,
+                  'denied': 0, 'leaks': [], 'control_failures': [], 'errors': []}
+        for (attacker, owner, kind, resource_id), status in zip(probes, statuses):
+            probe = {'attacker': attacker, 'owner': owner, 'kind': kind, 'id': resource_id, 'status': status}
+            if attacker == owner:
+                if status != 200:
+                    report['control_failures'].append(probe)
+            elif status is not None and 200 <= status < 300:
+                report['leaks'].append(probe)
+            elif status in DENIED_STATUSES:
+                report['denied'] += 1
+            else:
+                report['errors'].append(probe)
+        return report
+
+    def run(self, tenants=5, records=2, kinds=DEFAULT_KINDS, seed=0, cleanup=True):
+        registered, targets, failures = self.setup(tenants, records, kinds, seed)
+        if len(registered) < 2:
+            raise SystemExit(f"Only {len(registered)} tenants registered; need at least 2 to probe isolation")
+        report = self.probe(registered, targets)
+        report['setup_failures'] = failures
+        if cleanup:
+            report['teardown'] = teardown(self.make_request, self.base_url, self.ledger, self.workers)
+        return report
+
+
+def print_isolation_report(report):
+    print("=" * 60)
+    print("🔐 CROSS-TENANT ISOLATION")
+    print("=" * 60)
+    print(f"Tenants: {report['tenants']}, targets: {report['targets']}, probes: {report['probes']}")
+    print(f"Probes: {report['probes_per_second']:.1f}/s over {report['seconds']:.2f}s, {report['denied']} denied")
+    for leak in report['leaks'][:20]:
+        print(f"🚨 LEAK tenant {leak['attacker']} read {leak['kind']}/{leak['id']} of tenant {leak['owner']} "
+              f"(HTTP {leak['status']})")
+    if report['setup_failures']:
+        statuses = sorted({str(failure['status']) for failure in report['setup_failures']})
+        print(f"⚠️  {len(report['setup_failures'])} seed records were not created or gave no id "
+              f"({', '.join(statuses)}); they were not probed")
+    if report['control_failures']:
+        print(f"⚠️  {len(report['control_failures'])} owner reads failed; those routes prove nothing about isolation")
+    if report['errors']:
+        statuses = sorted({str(probe['status']) for probe in report['errors']})
+        print(f"⚠️  {len(report['errors'])} probes got unexpected answers ({', '.join(statuses)})")
+    if 'teardown' in report:
+        print_teardown_summary(report['teardown'])
+    if report['leaks']:
+        print(f"❌ {len(report['leaks'])} cross-tenant reads succeeded")
+    else:
+        print("🎉 No cross-tenant leakage found.")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Probe every tenant's records with every other tenant's token")
+    parser.add_argument('--base-url', default=BASE_URL)
+    parser.add_argument('--tenants', type=int, default=5, help="Tenants to register (K)")
+    parser.add_argument('--records', type=int, default=2, help="Records of each kind seeded per tenant")
+    parser.add_argument('--kinds', default=','.join(DEFAULT_KINDS), help="Comma-separated record kinds")
+    parser.add_argument('--workers', type=int, default=32, help="Concurrent probes")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-teardown', action='store_true', help="Leave the probe tenants and records in place")
+    parser.add_argument('--json', metavar='PATH', help="Also write the report to PATH as JSON")
+    args = parser.parse_args(argv)
+
+    probe = IsolationProbe(base_url=args.base_url, workers=args.workers)
+    report = probe.run(tenants=args.tenants, records=args.records,
+                       kinds=[kind.strip() for kind in args.kinds.split(',') if kind.strip()],
+                       seed=args.seed, cleanup=not args.no_teardown)
+    print_isolation_report(report)
+    if args.json:
+        with open(args.json, 'w') as handle:
+            json.dump(report, handle, indent=2)
+    return 1 if report['leaks'] or report['control_failures'] or report['setup_failures'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
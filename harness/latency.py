@@ -0,0 +1,223 @@
+"""
+Per-route latency histograms for harness runs
+HDR-style log-linear buckets keep percentiles within 1% while recording in constant memory
+"""
+
+import json
+import math
+import re
+import threading
+import time
+from urllib.parse import urlsplit
+
+# 2^SUB_BUCKET_BITS linear buckets per power of two (upper half used above the first range)
+SUB_BUCKET_BITS = 8
+PERCENTILES = (50, 90, 95, 99)
+# Where a request's time goes, in order; dns/connect/tls are zero on a reused connection
+PHASES = ('dns', 'connect', 'tls', 'ttfb', 'body')
+
+_ID_SEGMENT = re.compile(
+    r'^([0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}'  # uuid
+    r'|[0-9a-f]{24}'                                                    # ObjectId
+    r'|\d+'                                                             # numeric
+    r'|(?=[A-Z-]*\d)[A-Z]{2,5}-[A-Z0-9]{4,}'                             # prefixed ids (CL-100001)
+    r'|(?=[A-Za-z0-9_-]*\d)[A-Za-z0-9_-]{20,})$',                       # long opaque ids
+    re.IGNORECASE
+)
+
+
+def normalize_route(url):
+    """Reduce a URL or endpoint to its route template, e.g. /api/leads/<uuid>?x=1 -> /leads/{id}"""
+    path = urlsplit(url).path or '/'
+    if path == '/api' or path.startswith('/api/'):
+        path = path[4:] or '/'
+    segments = ['{id}' if _ID_SEGMENT.match(segment) else segment for segment in path.split('/')]
+    return '/'.join(segments) or '/'
+
+
+class LatencyHistogram:
+    """Log-linear histogram of latencies recorded in microseconds"""
+
+    def __init__(self):
+        self.counts = {}
+        self.total = 0
+        self.sum = 0
+        self.min = None
+        self.max = 0
+
+    @staticmethod
+    def _bucket(value):
+        shift = max(value.bit_length() - SUB_BUCKET_BITS, 0)
+        return (shift << SUB_BUCKET_BITS) | (value >> shift)
+
+    @staticmethod
+    def _highest_equivalent(bucket):
+        shift = bucket >> SUB_BUCKET_BITS
+        base = (bucket & ((1 << SUB_BUCKET_BITS) - 1)) << shift
+        return base + (1 << shift) - 1
+
+    def record(self, seconds):
+        value = max(int(seconds * 1_000_000), 0)
+        bucket = self._bucket(value)
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+        self.total += 1
+        self.sum += value
+        self.max = max(self.max, value)
+        self.min = value if self.min is None else min(self.min, value)
+
+    def to_dict(self):
+        return {
+            'counts': {str(bucket): count for bucket, count in self.counts.items()},
+            'sum': self.sum,
+            'min': self.min,
+            'max': self.max
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        histogram = cls()
+        histogram.counts = {int(bucket): count for bucket, count in data['counts'].items()}
+        histogram.total = sum(histogram.counts.values())
+        histogram.sum = data.get('sum', 0)
+        histogram.min = data.get('min')
+        histogram.max = data.get('max', 0)
+        return histogram
+
+    def values(self):
+        """(representative latency in ms, count) pairs in ascending order"""
+        return [(min(self._highest_equivalent(bucket), self.max) / 1000, self.counts[bucket])
+                for bucket in sorted(self.counts)]
+
+    def merge(self, other):
+        for bucket, count in other.counts.items():
+            self.counts[bucket] = self.counts.get(bucket, 0) + count
+        self.total += other.total
+        self.sum += other.sum
+        self.max = max(self.max, other.max)
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+
+    def percentile(self, percent):
+        """Latency in milliseconds at or below which percent of samples fall"""
+        if not self.total:
+            return 0.0
+        target = max(math.ceil(self.total * percent / 100), 1)
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= target:
+                return min(self._highest_equivalent(bucket), self.max) / 1000
+        return self.max / 1000
+
+    def summary(self):
+        result = {'count': self.total}
+        for percent in PERCENTILES:
+            result[f'p{percent}'] = round(self.percentile(percent), 3)
+        result['max'] = round(self.max / 1000, 3)
+        result['mean'] = round(self.sum / self.total / 1000, 3) if self.total else 0.0
+        return result
+
+
+class PhaseRecorder:
+    """Thread-safe per-route histograms of each connection phase (DNS, connect, TLS, TTFB, body)"""
+
+    def __init__(self):
+        self.routes = {}
+        self._lock = threading.Lock()
+
+    def record(self, method, url, phases):
+        key = f"{method.upper()} {normalize_route(url)}"
+        with self._lock:
+            entry = self.routes.get(key)
+            if entry is None:
+                entry = self.routes[key] = {'histograms': {phase: LatencyHistogram() for phase in PHASES},
+                                            'requests': 0, 'new_connections': 0}
+            entry['requests'] += 1
+            if 'connect' in phases:
+                entry['new_connections'] += 1
+            # Reused connections skip DNS, connect and TLS; recording zeros keeps every phase's count equal
+            for phase in PHASES:
+                entry['histograms'][phase].record(phases.get(phase, 0.0))
+
+    def summary(self):
+        """Per-route p50/p99/mean milliseconds for every phase"""
+        with self._lock:
+            result = {}
+            for key in sorted(self.routes):
+                entry = self.routes[key]
+                result[key] = {'requests': entry['requests'], 'new_connections': entry['new_connections']}
+                for phase, histogram in entry['histograms'].items():
+                    stats = histogram.summary()
+                    result[key][phase] = {'p50': stats['p50'], 'p99': stats['p99'], 'mean': stats['mean']}
+            return result
+
+    def print_table(self):
+        summary = self.summary()
+        if not summary:
+            return summary
+        width = max(len(key) for key in summary) + 2
+        print(f"🔬 {'Route':<{width - 3}} {'New':>5} " + " ".join(f"{phase + ' ms':>10}" for phase in PHASES) + "  (means)")
+        for key, stats in summary.items():
+            print(f"{key:<{width}} {stats['new_connections']:>5} "
+                  + " ".join(f"{stats[phase]['mean']:>10.1f}" for phase in PHASES))
+        return summary
+
+
+class LatencyRecorder:
+    """Thread-safe histograms keyed by 'METHOD /route', plus error counts"""
+
+    def __init__(self):
+        self.histograms = {}
+        self.errors = {}
+        self.started = time.monotonic()
+        self._lock = threading.Lock()
+
+    def elapsed(self):
+        """Seconds since the recorder was created, used for per-route throughput"""
+        return time.monotonic() - self.started
+
+    def record(self, method, url, seconds, status=None):
+        key = f"{method.upper()} {normalize_route(url)}"
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = LatencyHistogram()
+            histogram.record(seconds)
+            if status is None or status >= 500:
+                self.errors[key] = self.errors.get(key, 0) + 1
+
+    def summary(self):
+        """Per-route percentiles in milliseconds"""
+        with self._lock:
+            result = {}
+            for key in sorted(self.histograms):
+                result[key] = self.histograms[key].summary()
+                result[key]['errors'] = self.errors.get(key, 0)
+            return result
+
+    def snapshot(self):
+        """Copies of the per-route histograms and error counts"""
+        with self._lock:
+            histograms = {}
+            for key, histogram in self.histograms.items():
+                histograms[key] = LatencyHistogram()
+                histograms[key].merge(histogram)
+            return histograms, dict(self.errors)
+
+    def to_json(self):
+        return json.dumps(self.summary(), indent=2)
+
+    def write_json(self, path):
+        with open(path, 'w') as handle:
+            handle.write(self.to_json())
+
+    def print_table(self):
+        summary = self.summary()
+        if not summary:
+            return summary
+        width = max(len(key) for key in summary) + 2
+        print(f"⏱️  {'Route':<{width - 3}} {'Count':>6} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'Max ms':>9}")
+        for key, stats in summary.items():
+            print(f"{key:<{width}} {stats['count']:>6} {stats['p50']:>9.1f} {stats['p90']:>9.1f} "
+                  f"{stats['p99']:>9.1f} {stats['max']:>9.1f}")
+        return summary
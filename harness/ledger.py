@@ -0,0 +1,256 @@
+"""
+Persistent ledger of resources created by harness runs, with batched parallel teardown
+Each create is appended to the ledger before the test moves on, so the next teardown also replays a crashed run
+
+The API has no DELETE for clients or module requests: teardown pauses leftover test clients (except the
+cached tenants the suites reuse), rejects module requests that are still pending and removes modules that
+approved requests granted, so a reused tenant can request them again.
+
+Usage:
+    python -m harness.ledger list
+    python -m harness.ledger teardown --base-url http://127.0.0.1:8000/api
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import fcntl
+except ImportError:  # Windows: the in-process lock still serialises threads
+    fcntl = None
+
+from harness.config import BASE_URL, SUPER_ADMIN_EMAIL, SUPER_ADMIN_PASSWORD
+from harness.tokens import TokenCache, cached_login, private_opener, token_valid
+
+LEDGER_PATH = os.environ.get('HARNESS_LEDGER', '.harness/ledger.jsonl')
+TEARDOWN_WORKERS = int(os.environ.get('HARNESS_TEARDOWN_WORKERS', '8'))
+TENANT_KINDS = ('leads', 'projects', 'tasks', 'expenses', 'users')
+# Teardown phases run in order; every resource inside a phase is removed in parallel
+PHASES = (TENANT_KINDS, ('module_requests', 'client_modules'), ('clients',))
+
+
+def _key(base_url, kind, resource_id):
+    return f"{base_url.rstrip('/')} {kind} {resource_id}"
+
+
+class ResourceLedger:
+    """Append-only JSONL log of created and released resources"""
+
+    def __init__(self, path=LEDGER_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def _locked(self):
+        """Exclusive across threads and processes, so compaction never drops a concurrent append"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._lock, open(f"{self.path}.lock", 'w') as lock_file:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            yield
+
+    def _append(self, entry):
+        line = json.dumps(entry) + '\n'
+        with self._locked(), open(self.path, 'a', opener=private_opener) as handle:
+            handle.write(line)
+
+    def record(self, base_url, kind, resource_id, token=None, owner=None, **extra):
+        """Log a created resource; owner is the client id whose token can delete it"""
+        self._append(dict(extra, op='create', base_url=base_url.rstrip('/'), kind=kind, id=resource_id,
+                          token=token, owner=owner, at=datetime.now().isoformat()))
+
+    def record_many(self, base_url, kind, resource_ids, token=None, owner=None):
+        """Log a batch of created resources of one kind with a single locked write"""
+        at = datetime.now().isoformat()
+        lines = ''.join(json.dumps({'op': 'create', 'base_url': base_url.rstrip('/'), 'kind': kind, 'id': resource_id,
+                                    'token': token, 'owner': owner, 'at': at}) + '\n'
+                        for resource_id in resource_ids)
+        with self._locked(), open(self.path, 'a', opener=private_opener) as handle:
+            handle.write(lines)
+
+    def release(self, base_url, kind, resource_id):
+        """Log that a resource was removed (or handed back) and needs no teardown"""
+        self._append({'op': 'release', 'base_url': base_url.rstrip('/'), 'kind': kind, 'id': resource_id})
+
+    def pending(self, base_url=None):
+        """Replay the ledger into the resources that still need teardown, oldest first"""
+        entries = {}
+        try:
+            with open(self.path) as handle:
+                for line in handle:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # a line torn by a crash mid-write
+                    key = _key(entry['base_url'], entry['kind'], entry['id'])
+                    if entry['op'] == 'create':
+                        entries[key] = entry
+                    else:
+                        entries.pop(key, None)
+        except FileNotFoundError:
+            return []
+        return [entry for entry in entries.values()
+                if base_url is None or entry['base_url'] == base_url.rstrip('/')]
+
+    def compact(self):
+        """Rewrite the ledger with only its pending entries"""
+        with self._locked():
+            entries = self.pending()
+            temporary = f"{self.path}.tmp"
+            with open(temporary, 'w', opener=private_opener) as handle:
+                for entry in entries:
+                    handle.write(json.dumps(entry) + '\n')
+            os.replace(temporary, self.path)
+
+
+class Teardown:
+    """Removes a base URL's pending ledger entries with bounded concurrency"""
+
+    def __init__(self, make_request, base_url, ledger=None, workers=TEARDOWN_WORKERS, token_cache=None):
+        self.make_request = make_request
+        self.base_url = base_url.rstrip('/')
+        self.ledger = ledger or ResourceLedger()
+        self.workers = workers
+        self.token_cache = token_cache or TokenCache()
+        self.tokens = {}
+        self._lock = threading.Lock()
+
+    def _admin_token(self):
+        data, _ = cached_login(self.make_request, self.base_url, SUPER_ADMIN_EMAIL, SUPER_ADMIN_PASSWORD,
+                               self.token_cache)
+        return data['token'] if data else None
+
+    def _owner_token(self, entry, credentials):
+        """A valid token for the entry's owner, logging in again from the ledgered credentials if needed"""
+        if token_valid(entry.get('token')):
+            return entry['token']
+        owner = entry.get('owner')
+        with self._lock:
+            if owner not in self.tokens:
+                client = credentials.get(owner)
+                token = None
+                if client:
+                    response = self.make_request('POST', '/auth/login',
+                                                 {"email": client['email'], "password": client['password']})
+                    if response and response.status_code == 200:
+                        token = response.json()['token']
+                self.tokens[owner] = token
+            return self.tokens[owner]
+
+    def _remove(self, entry, credentials, admin_token):
+        kind, resource_id = entry['kind'], entry['id']
+        if kind in TENANT_KINDS:
+            token = self._owner_token(entry, credentials)
+            if not token:
+                return False
+            response = self.make_request('DELETE', f'/{kind}/{resource_id}', token=token)
+        elif kind == 'module_requests':
+            response = self.make_request('PUT', '/module-requests', {
+                "requestId": resource_id,
+                "action": "reject",
+                "adminMessage": "Removed by harness teardown"
+            }, token=admin_token)
+        elif kind == 'client_modules':
+            client_id, module_id = resource_id.split('/', 1)
+            response = self.make_request('POST', f'/admin/clients/{client_id}',
+                                         {"action": "remove-module", "moduleId": module_id}, token=admin_token)
+        elif kind == 'clients':
+            response = self.make_request('GET', f'/admin/clients/{resource_id}', token=admin_token)
+            if response is not None and response.status_code == 200:
+                client = response.json()
+                if client.get('subscriptionStatus') == 'active':
+                    response = self.make_request('POST', f'/admin/clients/{resource_id}',
+                                                 {"action": "toggle-status"}, token=admin_token)
+        else:
+            return False
+
+        # Anything already gone counts as removed
+        if response is None or response.status_code not in (200, 204, 404):
+            return False
+        self.ledger.release(self.base_url, kind, resource_id)
+        return True
+
+    def run(self):
+        """Tear down every pending resource, returning removed/failed counts per kind"""
+        pending = self.ledger.pending(self.base_url)
+        credentials = {entry['id']: entry for entry in pending if entry['kind'] == 'clients'}
+        kept = self._cached_tenant_ids()
+        admin_token = None
+        summary = {'removed': {}, 'failed': {}, 'kept': 0}
+
+        for kinds in PHASES:
+            batch = [entry for entry in pending if entry['kind'] in kinds]
+            if 'clients' in kinds:
+                summary['kept'] = sum(1 for entry in batch if entry['id'] in kept)
+                batch = [entry for entry in batch if entry['id'] not in kept]
+            if not batch:
+                continue
+            if admin_token is None and kinds != TENANT_KINDS:
+                admin_token = self._admin_token()
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                outcomes = list(executor.map(lambda entry: self._remove(entry, credentials, admin_token), batch))
+            for entry, removed in zip(batch, outcomes):
+                bucket = summary['removed'] if removed else summary['failed']
+                bucket[entry['kind']] = bucket.get(entry['kind'], 0) + 1
+
+        if not summary['failed']:
+            self.ledger.compact()
+        return summary
+
+    def _cached_tenant_ids(self):
+        with self.token_cache.locked() as entries:
+            return {entry['client']['id'] for key, entry in entries.items()
+                    if key.startswith(f"{self.base_url} tenant:") and entry.get('client')}
+
+
+def teardown(make_request, base_url, ledger=None, workers=TEARDOWN_WORKERS):
+    return Teardown(make_request, base_url, ledger, workers).run()
+
+
+def print_teardown_summary(summary):
+    removed = sum(summary['removed'].values())
+    failed = sum(summary['failed'].values())
+    details = ', '.join(f"{count} {kind}" for kind, count in sorted(summary['removed'].items()))
+    print(f"🧹 Teardown: {removed} removed{f' ({details})' if details else ''}, "
+          f"{summary['kept']} cached tenants kept")
+    if failed:
+        leftovers = ', '.join(f"{count} {kind}" for kind, count in sorted(summary['failed'].items()))
+        print(f"⚠️  {failed} left in the ledger ({leftovers}); they are retried on the next teardown")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect the resource ledger and tear down leftovers")
+    parser.add_argument('--ledger', default=LEDGER_PATH)
+    subcommands = parser.add_subparsers(dest='command', required=True)
+
+    list_parser = subcommands.add_parser('list', help="List resources still awaiting teardown")
+    list_parser.add_argument('--base-url')
+
+    teardown_parser = subcommands.add_parser('teardown', help="Remove every pending resource for a base URL")
+    teardown_parser.add_argument('--base-url', default=BASE_URL)
+    teardown_parser.add_argument('--workers', type=int, default=TEARDOWN_WORKERS)
+    args = parser.parse_args(argv)
+
+    ledger = ResourceLedger(args.ledger)
+    if args.command == 'list':
+        for entry in ledger.pending(args.base_url):
+            print(f"{entry['at'][:19]}  {entry['kind']:<16} {entry['id']:<38} {entry['base_url']}")
+        return 0
+
+    from harness.session import bind_requests
+
+    summary = teardown(bind_requests(args.base_url), args.base_url, ledger, args.workers)
+    print_teardown_summary(summary)
+    return 1 if summary['failed'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,165 @@
+"""
+Pagination-aware streaming reader for the tenant list endpoints (/leads, /projects, /tasks)
+Records are decoded one at a time from the response stream, so memory stays flat however large the tenant is
+
+Pages are requested with limit/offset (plus page for /tasks). Records repeated from the previous page
+(inserts during the read shift every page) are skipped, and a page made up mostly of repeats means the
+deployment ignores offset, so the read stops there instead of paging through the same records again.
+"""
+
+import codecs
+import json
+import os
+
+import requests
+
+from harness.session import get_session
+
+PAGE_SIZE = int(os.environ.get('HARNESS_PAGE_SIZE', '500'))
+CHUNK_SIZE = 64 * 1024
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = ' \t\n\r'
+
+
+class ListReadError(Exception):
+    """A list page could not be fetched or was not a JSON list"""
+
+    def __init__(self, message, status=None):
+        super().__init__(message)
+        self.status = status
+
+
+class _Buffer:
+    """Decoded text pulled from a chunk iterator on demand"""
+
+    def __init__(self, chunks):
+        self.chunks = iter(chunks)
+        self.decoder = codecs.getincrementaldecoder('utf-8')()
+        self.text = ''
+        self.pos = 0
+
+    def fill(self):
+        """Read one more chunk, returning False at end of stream"""
+        for chunk in self.chunks:
+            text = self.decoder.decode(chunk)
+            if text:
+                # Drop what has already been consumed so the buffer only holds the current record
+                self.text = self.text[self.pos:] + text
+                self.pos = 0
+                return True
+        return False
+
+    def peek(self):
+        """Next non-whitespace character, or '' at end of stream"""
+        while True:
+            while self.pos < len(self.text) and self.text[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self.fill():
+                return ''
+
+    def expect(self, character):
+        if self.peek() != character:
+            raise ListReadError(f"Expected '{character}' in list response")
+        self.pos += 1
+
+    def value(self):
+        """Decode the next complete JSON value"""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.text, self.pos)
+            except json.JSONDecodeError:
+                value, end = None, None
+            # A value ending exactly at the buffer edge may be a truncated number, so wait for the delimiter
+            if end is not None and end < len(self.text):
+                self.pos = end
+                return value
+            if not self.fill():
+                if end is not None:
+                    self.pos = end
+                    return value
+                raise ListReadError("Truncated list response")
+
+
+def iter_json_array(chunks):
+    """Yield the elements of a streamed JSON list one by one
+
+    Accepts a bare list or an envelope object such as {"projects": [...], "stats": {...}},
+    in which case the first list-valued member is streamed.
+    """
+    buffer = _Buffer(chunks)
+    if buffer.peek() == '{':
+        buffer.expect('{')
+        while True:
+            if buffer.peek() == '}':
+                raise ListReadError("Response object contains no list")
+            buffer.value()
+            buffer.expect(':')
+            if buffer.peek() == '[':
+                break
+            buffer.value()
+            if buffer.peek() == ',':
+                buffer.expect(',')
+
+    buffer.expect('[')
+    if buffer.peek() == ']':
+        return
+    while True:
+        yield buffer.value()
+        if buffer.peek() == ']':
+            return
+        buffer.expect(',')
+
+
+def iter_records(base_url, endpoint, token=None, page_size=PAGE_SIZE, params=None, session=None):
+    """Yield every record of a list endpoint, one page at a time"""
+    session = session or get_session()
+    headers = {'Authorization': f'Bearer {token}'} if token else {}
+    offset = 0
+    previous_ids = set()
+
+    while True:
+        query = dict(params or {}, limit=page_size, offset=offset, page=offset // page_size + 1)
+        try:
+            response = session.request('GET', f"{base_url}{endpoint}", headers=headers, params=query, stream=True)
+        except requests.exceptions.RequestException as e:
+            raise ListReadError(f"Request failed: {e}") from e
+
+        with response:
+            if response.status_code != 200:
+                raise ListReadError(f"GET {endpoint} returned {response.status_code}", response.status_code)
+            count = repeated = 0
+            page_ids = set()
+            for record in iter_json_array(response.iter_content(CHUNK_SIZE)):
+                count += 1
+                record_id = record.get('id') if isinstance(record, dict) else None
+                if record_id is not None:
+                    if record_id in previous_ids:
+                        repeated += 1
+                        continue
+                    page_ids.add(record_id)
+                yield record
+
+        # A short page is the last one; an oversized page means the server ignored limit
+        if count != page_size:
+            return
+        # Inserts shift a paged read by a few records; a mostly repeated page means offset was ignored
+        if repeated * 2 > count:
+            return
+        previous_ids = page_ids
+        offset += page_size
+
+
+def count_records(base_url, endpoint, token=None, page_size=PAGE_SIZE, params=None, session=None):
+    return sum(1 for _ in iter_records(base_url, endpoint, token, page_size, params, session))
+
+
+def find_record(base_url, endpoint, record_id, token=None, page_size=PAGE_SIZE, params=None, session=None):
+    """First record with the given id, stopping the read as soon as it is seen"""
+    for record in iter_records(base_url, endpoint, token, page_size, params, session):
+        if isinstance(record, dict) and record.get('id') == record_id:
+            return record
+    return None
@@ -0,0 +1,422 @@
+"""
+Async load generator for the BuildCRM API
+Replays the BuildCRMTester scenarios as virtual users, each registered as its own tenant. The tenants
+and any leads the scenarios leave behind go into the resource ledger and are torn down after the run.
+
+Requires aiohttp (pip install aiohttp).
+
+Usage:
+    python -m harness.load --users 200 --rps 150 --duration 60 --ramp-up 15 --concurrency 100
+    python -m harness.load --users 200 --duration 120 --concurrency 400 --adaptive
+    python -m harness.load --users 20 --duration 30 --no-teardown
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import sys
+import time
+
+from harness.adaptive import AsyncAdaptiveLimiter, add_adaptive_arguments, adaptive_settings, print_concurrency_table
+from harness.config import BASE_URL
+from harness.latency import LatencyHistogram
+from harness.ledger import ResourceLedger, print_teardown_summary, teardown
+from harness.payloads import PayloadFactory
+from harness.results import ResultSink
+from harness.schemas import VALIDATE_RATE, ResponseValidator
+
+REQUEST_TIMEOUT = 30
+REGISTER_PASSWORD = "loadpass123"
+
+
+class RateLimiter:
+    """Paces requests to a target rate that ramps up linearly from the start of the run"""
+
+    def __init__(self, rate, ramp_up=0):
+        self.rate = rate
+        self.ramp_up = ramp_up
+        self.started = None
+        self.next_slot = 0.0
+
+    async def acquire(self):
+        if not self.rate:
+            return
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        if self.started is None:
+            self.started = now
+            self.next_slot = now
+
+        rate = self.rate
+        if self.ramp_up:
+            # Never drop below 5% of the target so the first slots aren't seconds apart
+            rate = self.rate * min(max((now - self.started) / self.ramp_up, 0.05), 1.0)
+
+        slot = max(self.next_slot, now)
+        self.next_slot = slot + 1.0 / rate
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+class LoadStats:
+    """Per-route request counts, error and schema-violation counts and latency histograms"""
+
+    def __init__(self):
+        self.routes = {}
+        self.started = time.monotonic()
+        self.finished = None
+
+    def record(self, route, status, elapsed, invalid=False):
+        entry = self.routes.get(route)
+        if entry is None:
+            entry = self.routes[route] = {'histogram': LatencyHistogram(), 'errors': 0, 'invalid': 0, 'statuses': {}}
+        entry['histogram'].record(elapsed)
+        key = str(status) if status else 'error'
+        entry['statuses'][key] = entry['statuses'].get(key, 0) + 1
+        if status is None or status >= 400:
+            entry['errors'] += 1
+        if invalid:
+            entry['invalid'] += 1
+
+    def summary(self):
+        duration = (self.finished or time.monotonic()) - self.started
+        total = sum(entry['histogram'].total for entry in self.routes.values())
+        errors = sum(entry['errors'] for entry in self.routes.values())
+        routes = {}
+        for route, entry in sorted(self.routes.items()):
+            routes[route] = entry['histogram'].summary()
+            routes[route]['errors'] = entry['errors']
+            routes[route]['invalid'] = entry['invalid']
+            routes[route]['statuses'] = entry['statuses']
+        return {
+            'duration': duration,
+            'requests': total,
+            'errors': errors,
+            'rps': total / duration if duration else 0.0,
+            'error_rate': errors / total if total else 0.0,
+            'routes': routes
+        }
+
+
+class LoadContext:
+    """State shared by every virtual user in a run"""
+
+    def __init__(self, http, base_url, limiter, concurrency, deadline, client_errors, validator=None, sink=None,
+                 adaptive=None, ledger=None, persist=True):
+        self.http = http
+        self.client_errors = client_errors
+        self.base_url = base_url
+        self.limiter = limiter
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.deadline = deadline
+        self.stats = LoadStats()
+        self.validator = validator or ResponseValidator()
+        # Optional harness.results.ResultSink that receives one record per request
+        self.sink = sink
+        # Optional harness.adaptive.AsyncAdaptiveLimiter gating each route below the global cap
+        self.adaptive = adaptive
+        # Optional harness.ledger.ResourceLedger for the tenants and the leads left behind
+        self.ledger = ledger
+        # False deletes webhook leads as they arrive, so the tenants' collections stay the same size
+        self.persist = persist
+        self.payloads = PayloadFactory()
+        self.sequence = itertools.count()
+
+    def stopped(self):
+        return time.monotonic() >= self.deadline
+
+    def keep(self, tenant, lead_id):
+        """Note a lead that outlives its scenario, for the next flush to ledger"""
+        tenant['leads'].append(lead_id)
+
+    def flush(self, tenant):
+        """Ledger the tenant's kept leads with one write; per-lead appends would stall the event loop"""
+        if self.ledger and tenant['leads']:
+            self.ledger.record_many(self.base_url, 'leads', tenant['leads'], token=tenant['token'],
+                                    owner=tenant['client_id'])
+        tenant['leads'] = []
+
+    async def request(self, method, endpoint, data=None, token=None, route=None, limited=True):
+        """Send one request and record it, returning (status, parsed body)"""
+        if limited:
+            await self.limiter.acquire()
+
+        headers = {'Content-Type': 'application/json'}
+        if token:
+            headers['Authorization'] = f'Bearer {token}'
+
+        route = f"{method} {route or endpoint}"
+        status = None
+        body = None
+        elapsed = None
+        if self.adaptive:
+            await self.adaptive.acquire(route)
+        try:
+            async with self.semaphore:
+                start = time.monotonic()
+                try:
+                    async with self.http.request(method, f"{self.base_url}{endpoint}", json=data,
+                                                 headers=headers) as response:
+                        status = response.status
+                        raw = await response.read()
+                except self.client_errors:
+                    raw = None
+                elapsed = time.monotonic() - start
+        finally:
+            if self.adaptive:
+                self.adaptive.release(route, status, elapsed)
+
+        if raw:
+            try:
+                body = json.loads(raw)
+            except ValueError:
+                body = None
+        invalid = False
+        if status is not None and 200 <= status < 300 and body is not None:
+            invalid = self.validator.check(route, body) is not None
+        self.stats.record(route, status, elapsed, invalid)
+        if self.sink:
+            self.sink.record(route, status is not None and status < 400 and not invalid, route=route, status=status,
+                             duration=elapsed, size=len(raw) if raw else 0)
+        return status, body
+
+
+# ================== SCENARIOS ==================
+# Async replays of BuildCRMTester.test_leads_crud, test_multi_tenant_isolation and test_webhook_endpoint
+
+def created_lead_id(status, body):
+    """Id of the lead a POST /leads created, or None; the live route answers 201 with {lead, contactCreated}"""
+    if status not in (200, 201) or not isinstance(body, dict):
+        return None
+    lead = body.get('lead', body)
+    return lead.get('id') if isinstance(lead, dict) else None
+
+
+async def scenario_leads_crud(ctx, tenant):
+    token = tenant['token']
+    await ctx.request('GET', '/leads', token=token)
+
+    new_lead = ctx.payloads.payload('leads', next(ctx.sequence))
+    status, created = await ctx.request('POST', '/leads', new_lead, token=token)
+    lead_id = created_lead_id(status, created)
+    if not lead_id:
+        return False
+
+    update_data = {"status": "contacted", "notes": "Called and scheduled meeting"}
+    await ctx.request('PUT', f'/leads/{lead_id}', update_data, token=token, route='/leads/{id}')
+    status, _ = await ctx.request('DELETE', f'/leads/{lead_id}', token=token, route='/leads/{id}')
+    if status != 200:
+        ctx.keep(tenant, lead_id)
+    return status == 200
+
+
+async def scenario_multi_tenant_isolation(ctx, tenant):
+    token = tenant['token']
+    test_lead = ctx.payloads.payload('leads', next(ctx.sequence))
+    status, created = await ctx.request('POST', '/leads', test_lead, token=token)
+    lead_id = created_lead_id(status, created)
+    if not lead_id:
+        return False
+
+    status, leads = await ctx.request('GET', '/leads', token=token)
+    lead_found = status == 200 and isinstance(leads, list) and any(lead.get('id') == lead_id for lead in leads)
+    status, _ = await ctx.request('DELETE', f'/leads/{lead_id}', token=token, route='/leads/{id}')
+    if status != 200:
+        ctx.keep(tenant, lead_id)
+    return lead_found
+
+
+async def scenario_webhook(ctx, tenant):
+    webhook_data = {
+        "clientId": tenant['client_id'],
+        "source": "External Website",
+        "leadData": {
+            "name": "Webhook Load Lead",
+            "email": f"webhook{next(ctx.sequence)}@test.com",
+            "phone": "+91 9999999999",
+            "message": "Interested in flooring services"
+        }
+    }
+    status, result = await ctx.request('POST', '/webhook/leads', webhook_data)
+    # The live route answers 201 Created
+    if status not in (200, 201) or not result or 'leadId' not in result:
+        return False
+    if ctx.persist:
+        ctx.keep(tenant, result['leadId'])
+        return True
+    status, _ = await ctx.request('DELETE', f"/leads/{result['leadId']}", token=tenant['token'], route='/leads/{id}')
+    if status != 200:
+        ctx.keep(tenant, result['leadId'])
+    return True
+
+
+SCENARIOS = {
+    'leads_crud': scenario_leads_crud,
+    'multi_tenant': scenario_multi_tenant_isolation,
+    'webhook': scenario_webhook,
+}
+
+
+async def register_tenant(ctx, run_id, index):
+    """Register a throwaway tenant for one virtual user"""
+    register_data = {
+        "businessName": f"Load Test Co {run_id}-{index}",
+        "email": f"load{run_id}-{index}@buildcrm.com",
+        "password": REGISTER_PASSWORD,
+        "phone": "+91 9876543210",
+        "planId": "basic"
+    }
+    status, data = await ctx.request('POST', '/auth/register', register_data, limited=False)
+    if status == 200 and data and 'token' in data and 'client' in data:
+        if ctx.ledger:
+            ctx.ledger.record(ctx.base_url, 'clients', data['client']['id'], token=data['token'],
+                              email=register_data['email'], password=REGISTER_PASSWORD)
+        return {'token': data['token'], 'client_id': data['client']['id'], 'leads': []}
+    return None
+
+
+async def virtual_user(ctx, run_id, index, scenarios, start_delay):
+    if start_delay:
+        await asyncio.sleep(start_delay)
+    if ctx.stopped():
+        return 0
+
+    tenant = await register_tenant(ctx, run_id, index)
+    if not tenant:
+        return 0
+
+    iterations = 0
+    while not ctx.stopped():
+        for name in scenarios:
+            if ctx.stopped():
+                break
+            await SCENARIOS[name](ctx, tenant)
+        iterations += 1
+        ctx.flush(tenant)
+    return iterations
+
+
+async def teardown_run(base_url, ledger):
+    """Remove what the virtual users left behind, on a thread since teardown is synchronous"""
+    from harness.session import bind_requests
+
+    return await asyncio.to_thread(teardown, bind_requests(base_url), base_url, ledger)
+
+
+async def run_load(base_url=BASE_URL, users=50, rps=None, duration=60, ramp_up=0, concurrency=100, scenarios=None,
+                   validate_rate=VALIDATE_RATE, sink=None, adaptive=None, cleanup=True):
+    """Drive the scenarios with virtual users and return the run summary
+
+    adaptive is a dict of AdaptiveLimiter settings; each route's in-flight limit then adapts up to concurrency.
+    Without cleanup the tenants and leads stay in the ledger for a later `python -m harness.ledger teardown`.
+    """
+    try:
+        import aiohttp
+    except ImportError:
+        raise SystemExit("Load mode needs aiohttp: pip install aiohttp")
+
+    scenarios = scenarios or list(SCENARIOS)
+    unknown = [name for name in scenarios if name not in SCENARIOS]
+    if unknown:
+        raise ValueError(f"Unknown scenarios: {', '.join(unknown)}")
+
+    run_id = int(time.time())
+    ledger = ResourceLedger()
+    limiter = RateLimiter(rps, ramp_up)
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as http:
+        deadline = time.monotonic() + ramp_up + duration
+        ctx = LoadContext(http, base_url, limiter, concurrency, deadline, (aiohttp.ClientError, asyncio.TimeoutError),
+                          ResponseValidator(validate_rate), sink,
+                          AsyncAdaptiveLimiter(**adaptive) if adaptive else None, ledger)
+        # Virtual users join evenly across the ramp-up window
+        tasks = [
+            virtual_user(ctx, run_id, index, scenarios, ramp_up * index / users if users else 0)
+            for index in range(users)
+        ]
+        iterations = await asyncio.gather(*tasks)
+        ctx.stats.finished = time.monotonic()
+
+    summary = ctx.stats.summary()
+    summary['users'] = users
+    summary['active_users'] = sum(1 for count in iterations if count)
+    summary['iterations'] = sum(iterations)
+    summary['validation'] = ctx.validator.summary()
+    if ctx.adaptive:
+        summary['concurrency'] = ctx.adaptive.summary()
+    if cleanup:
+        summary['teardown'] = await teardown_run(base_url, ledger)
+    return summary
+
+
+def print_load_summary(summary):
+    print("=" * 60)
+    print("🏁 LOAD TEST SUMMARY")
+    print("=" * 60)
+    print(f"Virtual users: {summary['active_users']}/{summary['users']} active, {summary['iterations']} scenario loops")
+    print(f"Requests: {summary['requests']} in {summary['duration']:.1f}s ({summary['rps']:.1f} req/s)")
+    print(f"Errors: {summary['errors']} ({summary['error_rate'] * 100:.2f}%)")
+    validation = summary.get('validation')
+    if validation:
+        print(f"Schema: {validation['checked']} bodies checked at {validation['rate'] * 100:.0f}% sampling, "
+              f"{validation['invalid']} invalid")
+        for route, failure in validation['failures'].items():
+            print(f"   ⚠️  {route}: {failure['count']}x {failure['example']}")
+    print()
+    print(f"{'Route':<32} {'Count':>8} {'Errors':>7} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'Max ms':>9}")
+    for route, entry in summary['routes'].items():
+        print(f"{route:<32} {entry['count']:>8} {entry['errors']:>7} {entry['p50']:>9.1f} {entry['p90']:>9.1f} "
+              f"{entry['p99']:>9.1f} {entry['max']:>9.1f}")
+    if summary.get('concurrency'):
+        print_concurrency_table(summary['concurrency'])
+    if 'teardown' in summary:
+        print_teardown_summary(summary['teardown'])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="BuildCRM async load generator")
+    parser.add_argument('--base-url', default=BASE_URL)
+    parser.add_argument('--users', type=int, default=50, help="Virtual users, one tenant each")
+    parser.add_argument('--rps', type=float, default=None, help="Target requests/second across all users")
+    parser.add_argument('--duration', type=float, default=60, help="Seconds of steady load after ramp-up")
+    parser.add_argument('--ramp-up', type=float, default=0, help="Seconds over which users join and the rate climbs")
+    parser.add_argument('--concurrency', type=int, default=100, help="Cap on requests in flight")
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS),
+                        help=f"Comma-separated subset of: {', '.join(SCENARIOS)}")
+    parser.add_argument('--validate-rate', type=float, default=VALIDATE_RATE,
+                        help="Fraction of 2xx bodies checked against the route schemas (0 disables)")
+    parser.add_argument('--results-jsonl', metavar='PATH', help="Write one JSON line per request to PATH")
+    parser.add_argument('--no-teardown', action='store_true', help="Leave the tenants and leads in place")
+    parser.add_argument('--json', action='store_true', help="Print the summary as JSON")
+    add_adaptive_arguments(parser, '--concurrency')
+    args = parser.parse_args(argv)
+
+    sink = ResultSink(jsonl_path=args.results_jsonl, console=False, suite='load') if args.results_jsonl else None
+    summary = asyncio.run(run_load(
+        base_url=args.base_url,
+        users=args.users,
+        rps=args.rps,
+        duration=args.duration,
+        ramp_up=args.ramp_up,
+        concurrency=args.concurrency,
+        scenarios=[name.strip() for name in args.scenarios.split(',') if name.strip()],
+        validate_rate=args.validate_rate,
+        sink=sink,
+        adaptive=adaptive_settings(args, args.concurrency),
+        cleanup=not args.no_teardown
+    ))
+    if sink:
+        sink.close()
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print_load_summary(summary)
+    failed = summary['errors'] or summary['validation']['invalid'] or not summary['active_users']
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,215 @@
+"""
+Deterministic payload factory for leads, projects, tasks, expenses and contacts
+Every field is a lookup into a pre-built pool of 4096 draws from its distribution: numbers in typed
+arrays, strings as tuples of shared references. A record is one 64-bit hash of (seed, tenant, kind,
+index) sliced into 12-bit pool indices, so any record can be regenerated on its own (a resumed seed
+rebuilds exactly the missing ones) and generate() streams millions in constant memory.
+
+Usage:
+    python -m harness.payloads --kind leads --count 10000000
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+import zlib
+from array import array
+from datetime import datetime, timedelta
+
+try:
+    import resource
+except ImportError:  # Windows: no peak-memory line in the benchmark
+    resource = None
+
+KINDS = ('leads', 'projects', 'tasks', 'expenses', 'contacts')
+POOL_BITS = 12
+POOL_SIZE = 1 << POOL_BITS
+MASK = POOL_SIZE - 1
+# Day offsets from the factory's start date that any generated date can fall on
+FIRST_DAY, LAST_DAY = -365, 180
+
+# Weighted distributions over the sources in SEED_REPORT.md and the values used by /api/admin/seed
+LEAD_SOURCES = [('Website', 30), ('IndiaMART', 20), ('JustDial', 15), ('Meta Ads', 15), ('Google Ads', 10), ('Referral', 10)]
+LEAD_STATUSES = [('new', 35), ('contacted', 25), ('qualified', 15), ('proposal', 10), ('negotiation', 5), ('won', 6), ('lost', 4)]
+PROJECT_STATUSES = [('planning', 30), ('in_progress', 45), ('on_hold', 10), ('completed', 15)]
+TASK_STATUSES = [('backlog', 10), ('todo', 35), ('in_progress', 25), ('review', 10), ('completed', 18), ('cancelled', 2)]
+TASK_PRIORITIES = [('low', 20), ('medium', 45), ('high', 25), ('urgent', 10)]
+EXPENSE_CATEGORIES = [('Materials', 35), ('Equipment', 15), ('Transportation', 15), ('Professional Services', 10),
+                      ('Travel', 10), ('Office Supplies', 6), ('Utilities', 5), ('Marketing', 4)]
+CONTACT_TYPES = [('customer', 60), ('supplier', 15), ('contractor', 15), ('partner', 10)]
+FIRST_NAMES = ['Aarav', 'Vivaan', 'Aditya', 'Ananya', 'Diya', 'Ishaan', 'Kavya', 'Rohan', 'Saanvi', 'Vikram']
+LAST_NAMES = ['Sharma', 'Verma', 'Patel', 'Iyer', 'Reddy', 'Gupta', 'Nair', 'Singh', 'Mehta', 'Kapoor']
+PROJECT_TYPES = ['Kitchen Renovation', 'Villa Flooring', 'Office Fit-out', 'Bathroom Remodel', 'Facade Upgrade']
+COMPANY_SUFFIXES = ['Builders', 'Interiors', 'Constructions', 'Infra', 'Developers', 'Timber Works']
+
+_M64 = (1 << 64) - 1
+_GOLDEN = 0x9E3779B97F4A7C15
+
+
+def mix64(value):
+    """Fibonacci hash with an xor-shift fold: one multiply, and every 12-bit slice varies with the input
+
+    Weaker than splitmix64 but three times cheaper, and plenty to pick pool entries for test data.
+    """
+    value = (value * _GOLDEN) & _M64
+    return value ^ (value >> 29)
+
+
+def midnight(moment=None):
+    """moment (default now) truncated to midnight, the date anchor of a factory"""
+    return (moment or datetime.now()).replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _pool(rng, values, weights=None):
+    """POOL_SIZE draws from values"""
+    return tuple(rng.choices(values, weights=weights, k=POOL_SIZE))
+
+
+def _weighted(rng, weighted):
+    """POOL_SIZE draws from (value, weight) pairs"""
+    values, weights = zip(*weighted)
+    return _pool(rng, values, weights)
+
+
+class PayloadFactory:
+    """Builds the pools for one seed; payload() and generate() then only index into them"""
+
+    def __init__(self, seed=0, now=None):
+        self.seed = seed
+        rng = random.Random(f"payloads:{seed}")
+        # Midnight, so every factory built today with this seed produces identical records; pass the
+        # same now on another day (a resumed seed keeps its plan's) to get them again
+        self.now = midnight(now)
+        self.days = tuple((self.now + timedelta(days=offset)).isoformat()
+                          for offset in range(FIRST_DAY, LAST_DAY + 1))
+
+        # (name, email slug) pairs, so a name and its email always agree
+        self.names = _pool(rng, [(f"{first} {last}", f"{first.lower()}.{last.lower()}")
+                                 for first in FIRST_NAMES for last in LAST_NAMES])
+        self.phones = tuple(f"+91 {rng.randint(7000000000, 9999999999)}" for _ in range(POOL_SIZE))
+        self.lead_values = array('q', (int(rng.lognormvariate(12, 0.8)) for _ in range(POOL_SIZE)))
+        self.budgets = array('q', (int(rng.lognormvariate(13, 0.7)) for _ in range(POOL_SIZE)))
+        self.amounts = array('q', (int(rng.lognormvariate(9.5, 1.0)) for _ in range(POOL_SIZE)))
+        self.past = array('h', (rng.randint(0, 365) for _ in range(POOL_SIZE)))
+        self.durations = array('h', (rng.randint(14, 180) for _ in range(POOL_SIZE)))
+        self.due = array('h', (rng.randint(-60, 90) for _ in range(POOL_SIZE)))
+        self.approved = _weighted(rng, [(True, 70), (False, 30)])
+        self.lead_sources = _weighted(rng, LEAD_SOURCES)
+        self.lead_statuses = _weighted(rng, LEAD_STATUSES)
+        self.project_types = _pool(rng, PROJECT_TYPES)
+        self.project_statuses = _weighted(rng, PROJECT_STATUSES)
+        self.task_statuses = _weighted(rng, TASK_STATUSES)
+        self.task_priorities = _weighted(rng, TASK_PRIORITIES)
+        self.expense_categories = _weighted(rng, EXPENSE_CATEGORIES)
+        self.contact_types = _weighted(rng, CONTACT_TYPES)
+        self.companies = _pool(rng, [f"{last} {suffix}" for last in LAST_NAMES for suffix in COMPANY_SUFFIXES])
+        self._builders = {kind: getattr(self, f"_{kind}") for kind in KINDS}
+
+    def stream(self, kind, tenant=0):
+        """64-bit key of one (tenant, kind) stream; records are hashed from it and their index"""
+        return mix64(zlib.crc32(f"{self.seed}:{tenant}:{kind}".encode()) << 32 | 0x5EED)
+
+    def _day(self, offset):
+        return self.days[offset - FIRST_DAY]
+
+    def _leads(self, bits, index):
+        name, slug = self.names[bits & MASK]
+        return {
+            "name": name,
+            "email": f"{slug}.{index}@example.com",
+            "phone": self.phones[(bits >> 12) & MASK],
+            "source": self.lead_sources[(bits >> 24) & MASK],
+            "status": self.lead_statuses[(bits >> 36) & MASK],
+            "value": self.lead_values[(bits >> 48) & MASK],
+            "notes": f"Seeded lead #{index}"
+        }
+
+    def _projects(self, bits, index):
+        start = -self.past[(bits >> 24) & MASK]
+        return {
+            "name": f"{self.project_types[bits & MASK]} #{index}",
+            "description": "Seeded project",
+            "budget": self.budgets[(bits >> 12) & MASK],
+            "status": self.project_statuses[(bits >> 36) & MASK],
+            "startDate": self._day(start),
+            "endDate": self._day(start + self.durations[(bits >> 48) & MASK])
+        }
+
+    def _tasks(self, bits, index):
+        return {
+            "title": f"Seeded task #{index}",
+            "description": "Seeded task",
+            "priority": self.task_priorities[bits & MASK],
+            "status": self.task_statuses[(bits >> 12) & MASK],
+            "dueDate": self._day(self.due[(bits >> 24) & MASK])
+        }
+
+    def _expenses(self, bits, index):
+        return {
+            "description": f"Seeded expense #{index}",
+            "amount": self.amounts[bits & MASK],
+            "category": self.expense_categories[(bits >> 12) & MASK],
+            "approved": self.approved[(bits >> 24) & MASK],
+            "date": self._day(-self.past[(bits >> 36) & MASK])
+        }
+
+    def _contacts(self, bits, index):
+        name, slug = self.names[bits & MASK]
+        return {
+            "name": name,
+            # /contacts rejects a duplicate email within a tenant; the index keeps them unique
+            "email": f"{slug}.{index}@contacts.example.com",
+            "phone": self.phones[(bits >> 12) & MASK],
+            "company": self.companies[(bits >> 24) & MASK],
+            "type": self.contact_types[(bits >> 36) & MASK],
+            "source": self.lead_sources[(bits >> 48) & MASK],
+            "notes": f"Seeded contact #{index}"
+        }
+
+    def payload(self, kind, index, tenant=0):
+        """Record index of the (tenant, kind) stream"""
+        try:
+            build = self._builders[kind]
+        except KeyError:
+            raise ValueError(f"Unknown record kind: {kind}")
+        return build(mix64(self.stream(kind, tenant) + index), index)
+
+    def generate(self, kind, count, start=0, tenant=0):
+        """Lazily yield records start..start+count-1 of the (tenant, kind) stream"""
+        try:
+            build = self._builders[kind]
+        except KeyError:
+            raise ValueError(f"Unknown record kind: {kind}")
+        key = self.stream(kind, tenant)
+        for index in range(start, start + count):
+            yield build(mix64(key + index), index)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure payload generation throughput")
+    parser.add_argument('--kind', choices=KINDS + ('all',), default='all')
+    parser.add_argument('--count', type=int, default=1000000, help="Records per kind")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--sample', action='store_true', help="Print the first record of each kind")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    factory = PayloadFactory(args.seed)
+    print(f"🧱 Pools built in {(time.perf_counter() - started) * 1000:.1f}ms")
+    for kind in KINDS if args.kind == 'all' else (args.kind,):
+        if args.sample:
+            print(json.dumps(factory.payload(kind, 0), indent=2))
+        started = time.perf_counter()
+        generated = sum(1 for _ in factory.generate(kind, args.count))
+        elapsed = time.perf_counter() - started
+        print(f"{kind:<10} {generated} records in {elapsed:.2f}s ({generated / elapsed / 1e6:.2f}M/s)")
+    if resource:
+        # ru_maxrss is in kilobytes on Linux
+        print(f"Peak memory: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.1f}MB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,351 @@
+"""
+Independent recomputation of /reports/sales and /reports/expenses
+Streams a tenant's raw leads and expenses into columns, recomputes the report aggregates with array group-bys
+and diffs them against the server's answer, timing both sides
+
+Uses numpy for the group-bys when it is installed and falls back to plain Python otherwise.
+
+Usage:
+    python -m harness.reports --email demo@example.com --password demo123
+"""
+
+import argparse
+import json
+import sys
+import time
+from array import array
+from datetime import datetime
+
+from harness.config import BASE_URL, DEMO_CLIENT_EMAIL, DEMO_CLIENT_PASSWORD
+from harness.listing import ListReadError, iter_records
+from harness.session import get_session
+from harness.tokens import cached_login
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Page size for the raw pull when the server report gives no row total to size it by
+PULL_PAGE_SIZE = 10000
+REPORT_MONTHS = 6
+FUNNEL_STAGES = {
+    'contacted': ('contacted', 'qualified', 'proposal', 'negotiation', 'won'),
+    'qualified': ('qualified', 'proposal', 'negotiation', 'won'),
+    'proposal': ('proposal', 'negotiation', 'won'),
+    'won': ('won',),
+}
+TOLERANCE = 1e-6
+
+
+class Codes:
+    """Dictionary encoding of a categorical column"""
+
+    def __init__(self):
+        self.index = {}
+        self.labels = []
+
+    def code(self, label):
+        code = self.index.get(label)
+        if code is None:
+            code = self.index[label] = len(self.labels)
+            self.labels.append(label)
+        return code
+
+
+def _number(value):
+    try:
+        return float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _epoch(value):
+    """Milliseconds since the epoch for an ISO timestamp, or -1 when missing"""
+    if not value:
+        return -1
+    try:
+        moment = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    except ValueError:
+        return -1
+    if moment.tzinfo is None:
+        moment = moment.astimezone()
+    return int(moment.timestamp() * 1000)
+
+
+def _month_code(value):
+    """YYYY-MM of an ISO timestamp as year * 12 + month - 1"""
+    text = str(value or '')
+    try:
+        return int(text[:4]) * 12 + int(text[5:7]) - 1
+    except ValueError:
+        return -1
+
+
+def _months_ago(moment, months):
+    month_index = moment.year * 12 + moment.month - 1 - months
+    year, month = divmod(month_index, 12)
+    day = moment.day
+    while True:
+        try:
+            return moment.replace(year=year, month=month + 1, day=day)
+        except ValueError:
+            day -= 1
+
+
+def group_sums(codes, weights, size):
+    """(count, sum of weights) per code 0..size-1; negative codes are skipped"""
+    if numpy is not None:
+        codes = numpy.frombuffer(codes, dtype=numpy.int64)
+        weights = numpy.frombuffer(weights, dtype=numpy.float64)
+        keep = codes >= 0
+        counts = numpy.bincount(codes[keep], minlength=size)
+        sums = numpy.bincount(codes[keep], weights=weights[keep], minlength=size)
+        return counts.tolist(), sums.tolist()
+    counts = [0] * size
+    sums = [0.0] * size
+    for code, weight in zip(codes, weights):
+        if code >= 0:
+            counts[code] += 1
+            sums[code] += weight
+    return counts, sums
+
+
+class LeadColumns:
+    def __init__(self):
+        self.statuses = Codes()
+        self.sources = Codes()
+        self.status = array('q')
+        self.source = array('q')
+        self.value = array('d')
+        self.created = array('q')
+        self.month = array('q')
+
+    def append(self, lead):
+        self.status.append(self.statuses.code(lead.get('status') or 'unknown'))
+        self.source.append(self.sources.code(lead.get('source') or 'Unknown'))
+        self.value.append(_number(lead.get('value')))
+        self.created.append(_epoch(lead.get('createdAt')))
+        self.month.append(_month_code(lead.get('createdAt')))
+
+    def __len__(self):
+        return len(self.status)
+
+
+class ExpenseColumns:
+    def __init__(self):
+        self.categories = Codes()
+        self.category = array('q')
+        self.amount = array('d')
+        self.approved = array('q')
+        self.spent = array('q')
+        self.month = array('q')
+
+    def append(self, expense):
+        self.category.append(self.categories.code(expense.get('category') or 'Other'))
+        self.amount.append(_number(expense.get('amount')))
+        approved = expense.get('approved')
+        self.approved.append(1 if approved is True else 0 if approved is False else -1)
+        self.spent.append(_epoch(expense.get('date')))
+        self.month.append(_month_code(expense.get('date')))
+
+    def __len__(self):
+        return len(self.category)
+
+
+def _monthly_codes(months, stamps, since):
+    """Month codes rebased to 0, with rows outside the report window set to -1"""
+    in_window = [month for month, stamp in zip(months, stamps) if stamp >= since and month >= 0]
+    base = min(in_window) if in_window else 0
+    return base, array('q', (month - base if stamp >= since and month >= 0 else -1
+                             for month, stamp in zip(months, stamps)))
+
+
+def _month_label(code):
+    year, month = divmod(code, 12)
+    return f"{year:04d}-{month + 1:02d}"
+
+
+def compute_sales(columns, now=None):
+    now = now or datetime.now()
+    since = int(_months_ago(now.astimezone(), REPORT_MONTHS).timestamp() * 1000)
+
+    counts, values = group_sums(columns.status, columns.value, len(columns.statuses.labels))
+    by_status = [{'status': label, 'count': counts[code], 'value': values[code]}
+                 for code, label in enumerate(columns.statuses.labels)]
+    counts, values = group_sums(columns.source, columns.value, len(columns.sources.labels))
+    by_source = [{'source': label, 'count': counts[code], 'value': values[code]}
+                 for code, label in enumerate(columns.sources.labels)]
+
+    base, months = _monthly_codes(columns.month, columns.created, since)
+    size = max(months, default=-1) + 1
+    month_counts, month_values = group_sums(months, columns.value, size)
+    won_code = columns.statuses.index.get('won')
+    won_weights = array('d', (1.0 if status == won_code else 0.0 for status in columns.status))
+    _, month_won = group_sums(months, won_weights, size)
+    monthly = [{'month': _month_label(base + code), 'leads': month_counts[code], 'value': month_values[code],
+                'won': month_won[code]} for code in range(size) if month_counts[code]]
+
+    status_counts = {row['status']: row['count'] for row in by_status}
+    funnel = {'total': len(columns)}
+    for stage, statuses in FUNNEL_STAGES.items():
+        funnel[stage] = sum(status_counts.get(status, 0) for status in statuses)
+    return {'byStatus': by_status, 'bySource': by_source, 'monthlyData': monthly, 'funnel': funnel}
+
+
+def compute_expenses(columns, now=None):
+    now = now or datetime.now()
+    since = int(_months_ago(now.astimezone(), REPORT_MONTHS).timestamp() * 1000)
+
+    counts, totals = group_sums(columns.category, columns.amount, len(columns.categories.labels))
+    by_category = sorted(({'category': label, 'total': totals[code], 'count': counts[code]}
+                          for code, label in enumerate(columns.categories.labels)), key=lambda row: -row['total'])
+
+    base, months = _monthly_codes(columns.month, columns.spent, since)
+    size = max(months, default=-1) + 1
+    month_counts, month_totals = group_sums(months, columns.amount, size)
+    monthly = [{'month': _month_label(base + code), 'total': month_totals[code], 'count': month_counts[code]}
+               for code in range(size) if month_counts[code]]
+
+    approval_counts, approval_totals = group_sums(columns.approved, columns.amount, 2)
+    approval = {'approved': {'total': approval_totals[1], 'count': approval_counts[1]},
+                'pending': {'total': approval_totals[0], 'count': approval_counts[0]}}
+    return {
+        'summary': {
+            'totalExpenses': sum(row['total'] for row in by_category),
+            'approvedExpenses': approval['approved']['total'],
+            'pendingExpenses': approval['pending']['total'],
+            'totalTransactions': sum(row['count'] for row in by_category)
+        },
+        'byCategory': by_category,
+        'monthlyData': monthly,
+        'approvalStats': approval
+    }
+
+
+def _close(expected, actual):
+    if isinstance(expected, (int, float)) and isinstance(actual, (int, float)):
+        return abs(expected - actual) <= TOLERANCE * max(1.0, abs(expected))
+    return expected == actual
+
+
+def diff_reports(local, server, keys):
+    """Differences between the recomputed and server aggregates, as readable strings"""
+    differences = []
+    for section, group_key in keys.items():
+        mine, theirs = local.get(section), server.get(section)
+        if theirs is None:
+            differences.append(f"{section}: missing from the server report")
+            continue
+        if group_key is None:
+            rows_mine, rows_theirs = {'': mine}, {'': theirs}
+        else:
+            rows_mine = {row[group_key]: row for row in mine}
+            rows_theirs = {row.get(group_key): row for row in theirs}
+        for group in sorted(set(rows_mine) | set(rows_theirs), key=str):
+            expected, actual = rows_mine.get(group), rows_theirs.get(group)
+            label = f"{section}[{group}]" if group_key else section
+            if expected is None or actual is None:
+                differences.append(f"{label}: only in the {'server' if expected is None else 'recomputed'} report")
+                continue
+            for field, value in expected.items():
+                if field == group_key:
+                    continue
+                if isinstance(value, dict):
+                    for inner, inner_value in value.items():
+                        if not _close(inner_value, (actual.get(field) or {}).get(inner)):
+                            differences.append(f"{label}.{field}.{inner}: recomputed {inner_value}, "
+                                               f"server {(actual.get(field) or {}).get(inner)}")
+                elif not _close(value, actual.get(field)):
+                    differences.append(f"{label}.{field}: recomputed {value}, server {actual.get(field)}")
+    return differences
+
+
+SALES_KEYS = {'byStatus': 'status', 'bySource': 'source', 'monthlyData': 'month', 'funnel': None}
+EXPENSE_KEYS = {'byCategory': 'category', 'monthlyData': 'month', 'summary': None, 'approvalStats': None}
+
+
+def verify_report(base_url, token, endpoint, collection, columns, compute, keys, total_of):
+    """Fetch the server report, pull the raw rows, recompute and diff, timing each step"""
+    session = get_session()
+    started = time.perf_counter()
+    response = session.request('GET', f"{base_url}{endpoint}", headers={'Authorization': f'Bearer {token}'})
+    server_seconds = time.perf_counter() - started
+    if response.status_code != 200:
+        raise ListReadError(f"GET {endpoint} returned {response.status_code}", response.status_code)
+    server = response.json()
+    server_total = total_of(server)
+    # GET /leads honours only limit, so pull every row the report covers as one page; the spare row makes a
+    # complete pull a short page, which ends the read
+    page_size = server_total + 1 if isinstance(server_total, int) and server_total > 0 else PULL_PAGE_SIZE
+
+    started = time.perf_counter()
+    for record in iter_records(base_url, f'/{collection}', token, page_size=page_size):
+        columns.append(record)
+    pull_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    local = compute(columns)
+    compute_seconds = time.perf_counter() - started
+
+    differences = diff_reports(local, server, keys)
+    if server_total is not None and server_total != len(columns):
+        differences.insert(0, f"pulled {len(columns)} {collection} but the server report covers {server_total}; "
+                              f"the list endpoint did not return every row")
+    return {
+        'endpoint': endpoint,
+        'rows': len(columns),
+        'server_ms': server_seconds * 1000,
+        'pull_ms': pull_seconds * 1000,
+        'compute_ms': compute_seconds * 1000,
+        'differences': differences
+    }
+
+
+def verify_reports(base_url, token):
+    return [
+        verify_report(base_url, token, '/reports/sales', 'leads', LeadColumns(), compute_sales, SALES_KEYS,
+                      lambda report: (report.get('funnel') or {}).get('total')),
+        verify_report(base_url, token, '/reports/expenses', 'expenses', ExpenseColumns(), compute_expenses,
+                      EXPENSE_KEYS, lambda report: (report.get('summary') or {}).get('totalTransactions')),
+    ]
+
+
+def print_verification(results):
+    engine = 'numpy' if numpy is not None else 'pure Python'
+    print(f"📊 Report recomputation ({engine} group-bys)")
+    for result in results:
+        per_thousand = result['server_ms'] / result['rows'] * 1000 if result['rows'] else 0.0
+        print(f"   {result['endpoint']:<18} {result['rows']:>9} rows  server {result['server_ms']:>8.1f} ms "
+              f"({per_thousand:.2f} ms/1k rows)  pull {result['pull_ms']:>8.1f} ms  "
+              f"recompute {result['compute_ms']:>7.1f} ms")
+        for difference in result['differences'][:20]:
+            print(f"   ❌ {difference}")
+        if not result['differences']:
+            print("   ✅ matches the recomputed aggregates")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Recompute the sales and expense reports locally and diff them")
+    parser.add_argument('--base-url', default=BASE_URL)
+    parser.add_argument('--email', default=DEMO_CLIENT_EMAIL, help="Tenant user whose reports are verified")
+    parser.add_argument('--password', default=DEMO_CLIENT_PASSWORD)
+    parser.add_argument('--json', metavar='PATH', help="Also write the results to PATH as JSON")
+    args = parser.parse_args(argv)
+
+    def make_request(method, endpoint, data=None, token=None):
+        return get_session().request(method, f"{args.base_url}{endpoint}", json=data)
+
+    data, response = cached_login(make_request, args.base_url, args.email, args.password)
+    if not data:
+        raise SystemExit(f"Login failed for {args.email}")
+    results = verify_reports(args.base_url, data['token'])
+    print_verification(results)
+    if args.json:
+        with open(args.json, 'w') as handle:
+            json.dump(results, handle, indent=2)
+    return 1 if any(result['differences'] for result in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
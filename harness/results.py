@@ -0,0 +1,187 @@
+"""
+Structured result sink for harness runs: buffered JSONL and JUnit XML
+Results are queued and written in batches by a background thread, so thousands of results per second
+in load mode never wait on disk or stdout; the emoji console renderer is optional
+
+Configure with --results-jsonl/--results-junit/--quiet on the suites, or HARNESS_RESULTS_JSONL,
+HARNESS_RESULTS_JUNIT and HARNESS_QUIET=1.
+"""
+
+import atexit
+import json
+import os
+import queue
+import threading
+import time
+import xml.etree.ElementTree as ET
+
+BATCH_SIZE = 512
+FLUSH_INTERVAL = 0.5
+
+_shared_sink = None
+_shared_lock = threading.Lock()
+_STOP = object()
+
+
+def render_result(result):
+    """The console form of a result, as log_test has always printed it"""
+    lines = [f"{'✅ PASS' if result['success'] else '❌ FAIL'} {result['name']}"]
+    if result.get('message'):
+        lines.append(f"   {result['message']}")
+    if not result['success'] and result.get('response') is not None:
+        lines.append(f"   Response: {result['response']}")
+    return "\n".join(lines) + "\n"
+
+
+class ResultSink:
+    """Collects test outcomes and streams them to JSONL (batched, off-thread) and JUnit XML (on close)"""
+
+    def __init__(self, jsonl_path=None, junit_path=None, console=True, suite='harness',
+                 batch_size=BATCH_SIZE, flush_interval=FLUSH_INTERVAL, collect=False):
+        self.jsonl_path = jsonl_path
+        self.junit_path = junit_path
+        self.console = console
+        self.suite = suite
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.started = time.time()
+        # JUnit needs every case at the end; keep only what the XML uses
+        self.cases = []
+        # With collect, results are also kept in memory for the caller to take (sharded workers do)
+        self.collected = [] if collect else None
+        self.closed = False
+        self._queue = queue.SimpleQueue()
+        self._writer = None
+        if jsonl_path:
+            os.makedirs(os.path.dirname(jsonl_path) or '.', exist_ok=True)
+            self._writer = threading.Thread(target=self._drain, name='result-sink', daemon=True)
+            self._writer.start()
+
+    def record(self, name, success, message="", route=None, status=None, duration=None, size=None,
+               response=None, suite=None):
+        result = {
+            'ts': time.time(),
+            'suite': suite or self.suite,
+            'name': name,
+            'success': bool(success),
+            'message': message,
+            'route': route,
+            'status': status,
+            'duration_ms': round(duration * 1000, 3) if duration is not None else None,
+            'size': size
+        }
+        if response and not success:
+            result['response'] = response if isinstance(response, (dict, list, str, int, float)) else repr(response)
+        if self.console:
+            # One write per result so parallel tests don't interleave their lines
+            print(render_result(result))
+        self.add(result)
+        return result
+
+    def add(self, result):
+        """Store a result recorded elsewhere, such as in a sharded worker, without rendering it"""
+        if self.collected is not None:
+            self.collected.append(result)
+        if self.junit_path:
+            self.cases.append((result['suite'], result['name'], result['success'], result['message'],
+                               result['duration_ms']))
+        if self._writer:
+            self._queue.put(result)
+
+    def take(self):
+        """The collected results, emptying the collection"""
+        collected, self.collected = self.collected, []
+        return collected
+
+    def _drain(self):
+        with open(self.jsonl_path, 'a', buffering=1 << 16) as handle:
+            stopping = False
+            while not stopping:
+                batch = []
+                deadline = time.monotonic() + self.flush_interval
+                while len(batch) < self.batch_size:
+                    try:
+                        item = self._queue.get(timeout=max(deadline - time.monotonic(), 0.001))
+                    except queue.Empty:
+                        break
+                    if item is _STOP:
+                        stopping = True
+                        break
+                    batch.append(item)
+                if batch:
+                    handle.write(''.join(json.dumps(item, default=str) + '\n' for item in batch))
+                    handle.flush()
+
+    def write_junit(self, path):
+        suites = {}
+        for suite, name, success, message, duration in self.cases:
+            suites.setdefault(suite, []).append((name, success, message, duration))
+        root = ET.Element('testsuites')
+        for suite, cases in suites.items():
+            failures = sum(1 for _, success, _, _ in cases if not success)
+            element = ET.SubElement(root, 'testsuite', name=suite, tests=str(len(cases)), failures=str(failures),
+                                    errors='0', time=f"{time.time() - self.started:.3f}")
+            for name, success, message, duration in cases:
+                case = ET.SubElement(element, 'testcase', classname=suite, name=name,
+                                     time=f"{(duration or 0) / 1000:.3f}")
+                if not success:
+                    ET.SubElement(case, 'failure', message=message or 'failed')
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        ET.ElementTree(root).write(path, encoding='utf-8', xml_declaration=True)
+
+    def close(self):
+        """Flush the JSONL writer and write the JUnit report; safe to call more than once"""
+        if self.closed:
+            return
+        self.closed = True
+        if self._writer:
+            self._queue.put(_STOP)
+            self._writer.join()
+        if self.junit_path:
+            self.write_junit(self.junit_path)
+
+
+def configure_result_sink(jsonl_path=None, junit_path=None, console=None, suite='harness'):
+    """Replace the process-wide sink; unset arguments fall back to the HARNESS_RESULTS_* environment"""
+    global _shared_sink
+    if console is None:
+        console = os.environ.get('HARNESS_QUIET', '').lower() not in ('1', 'true', 'yes')
+    sink = ResultSink(jsonl_path or os.environ.get('HARNESS_RESULTS_JSONL'),
+                      junit_path or os.environ.get('HARNESS_RESULTS_JUNIT'), console, suite)
+    with _shared_lock:
+        previous, _shared_sink = _shared_sink, sink
+    if previous:
+        previous.close()
+    atexit.register(sink.close)
+    return sink
+
+
+def use_result_sink(sink):
+    """Install sink as the process-wide sink without closing the current one
+
+    A forked worker inherits its parent's sink but not the writer thread behind it; closing that copy
+    would rewrite the parent's JUnit file, so the worker only replaces it.
+    """
+    global _shared_sink
+    with _shared_lock:
+        _shared_sink = sink
+    return sink
+
+
+def get_result_sink(suite='harness'):
+    """Return the process-wide sink, configuring it from the environment on first use"""
+    with _shared_lock:
+        sink = _shared_sink
+    return sink or configure_result_sink(suite=suite)
+
+
+def add_result_arguments(parser):
+    group = parser.add_argument_group('structured results')
+    group.add_argument('--results-jsonl', metavar='PATH', help="Append every test result to PATH as JSON lines")
+    group.add_argument('--results-junit', metavar='PATH', help="Write a JUnit XML report to PATH at the end")
+    group.add_argument('--quiet', action='store_true', default=None, help="Skip the per-result console output")
+
+
+def handle_result_options(args, suite):
+    return configure_result_sink(args.results_jsonl, args.results_junit,
+                                 False if args.quiet else None, suite)
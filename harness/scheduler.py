@@ -0,0 +1,49 @@
+"""
+Dependency-aware test scheduler
+Runs independent tests in parallel on a thread pool while honouring declared dependencies
+"""
+
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+
+def run_scheduled(tests, dependencies=None, workers=1):
+    """
+    Run named tests and return their results in declaration order
+
+    tests is an ordered list of (name, callable) pairs and dependencies maps a
+    test name to the names that must finish before it starts. A test still runs
+    when a dependency failed; each test checks the state it needs itself.
+    """
+    dependencies = dependencies or {}
+    names = [name for name, _ in tests]
+    callables = dict(tests)
+
+    for name, required in dependencies.items():
+        unknown = [dep for dep in required if dep not in callables]
+        if name not in callables or unknown:
+            raise ValueError(f"Unknown test in dependencies for {name}: {unknown or name}")
+
+    results = {}
+    if workers <= 1:
+        # Declaration order must already satisfy the dependencies
+        for name in names:
+            results[name] = callables[name]()
+        return {name: results[name] for name in names}
+
+    pending = list(names)
+    running = {}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        while pending or running:
+            for name in list(pending):
+                if all(dep in results for dep in dependencies.get(name, ())):
+                    pending.remove(name)
+                    running[executor.submit(callables[name])] = name
+
+            if not running:
+                raise ValueError(f"Dependency cycle between: {', '.join(pending)}")
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                results[running.pop(future)] = future.result()
+
+    return {name: results[name] for name in names}
@@ -0,0 +1,174 @@
+"""
+Declarative response schemas for the BuildCRM API, keyed by route
+Each schema is compiled once into a nested validator function and cached. ResponseValidator validates
+only a sampled fraction of bodies so load runs are not bottlenecked on checking responses
+
+Schema shorthand: a type means isinstance, a dict lists required keys with their schemas, [schema]
+is a list whose items match it, ANY accepts anything and NonEmpty(schema) also rejects empty values.
+"""
+
+import os
+
+NUMBER = (int, float)
+ANY = object
+# Lists are checked on their first items only; a 500-lead page does not need 500 identical checks
+ITEM_LIMIT = int(os.environ.get('HARNESS_SCHEMA_ITEMS', '20'))
+VALIDATE_RATE = float(os.environ.get('HARNESS_VALIDATE_RATE', '0.1'))
+
+
+class NonEmpty:
+    def __init__(self, schema):
+        self.schema = schema
+
+
+def _type_name(expected):
+    if isinstance(expected, tuple):
+        return ' or '.join(kind.__name__ for kind in expected)
+    return expected.__name__
+
+
+def compile_schema(schema):
+    """Turn a schema into check(value, path) returning the first error message or None"""
+    if schema is ANY:
+        return None
+
+    if isinstance(schema, NonEmpty):
+        inner = compile_schema(schema.schema)
+
+        def check_non_empty(value, path):
+            if not value:
+                return f"{path}: expected a non-empty value"
+            return inner(value, path) if inner else None
+        return check_non_empty
+
+    if isinstance(schema, dict):
+        fields = [(key, compile_schema(sub)) for key, sub in schema.items()]
+
+        def check_object(value, path):
+            if not isinstance(value, dict):
+                return f"{path}: expected an object, got {type(value).__name__}"
+            for key, check in fields:
+                if key not in value:
+                    return f"{path}.{key}: missing"
+                if check:
+                    error = check(value[key], f"{path}.{key}")
+                    if error:
+                        return error
+            return None
+        return check_object
+
+    if isinstance(schema, list):
+        item = compile_schema(schema[0]) if schema else None
+
+        def check_array(value, path):
+            if not isinstance(value, list):
+                return f"{path}: expected a list, got {type(value).__name__}"
+            if item:
+                for index, entry in enumerate(value[:ITEM_LIMIT]):
+                    error = item(entry, f"{path}[{index}]")
+                    if error:
+                        return error
+            return None
+        return check_array
+
+    expected = schema
+
+    def check_type(value, path):
+        # bool is an int subclass, but a flag where a count belongs is a bug
+        if isinstance(value, expected) and not (isinstance(value, bool) and expected is NUMBER):
+            return None
+        return f"{path}: expected {_type_name(expected)}, got {type(value).__name__}"
+    return check_type
+
+
+COUNTS = {field: NUMBER for field in ('totalLeads', 'totalProjects', 'totalTasks', 'totalExpenses')}
+ADMIN_OVERVIEW = {field: NUMBER for field in ('totalClients', 'activeClients', 'totalUsers', 'monthlyRevenue')}
+AUTH = {'token': str, 'user': {'id': ANY, 'email': str, 'role': str}}
+RECORD = {'id': ANY}
+
+# Route keys match the "METHOD /path" labels used by the load stats; a '#variant' suffix marks an older
+# response shape some deployments still serve
+ROUTE_SCHEMAS = {
+    'GET /health': {'status': str, 'features': list},
+    'GET /plans': NonEmpty([dict]),
+    'GET /modules/public': [dict],
+    'GET /modules-public': [dict],
+    'POST /auth/login': AUTH,
+    'POST /auth/register': {**AUTH, 'client': RECORD},
+    'GET /auth/me': {'user': {'email': str}, 'client': ANY},
+    'GET /admin/stats': {'overview': ADMIN_OVERVIEW,
+                         'charts': {'monthlyGrowth': list, 'planDistribution': list}},
+    'GET /admin/stats#flat': ADMIN_OVERVIEW,
+    'GET /admin/clients': [dict],
+    'GET /admin/clients/{id}': {'businessName': ANY},
+    'GET /admin/modules': [dict],
+    'GET /client/stats': COUNTS,
+    'GET /client/modules': [dict],
+    'GET /module-requests': [dict],
+    'POST /module-requests': {'request': RECORD},
+    'GET /reports/sales': {'byStatus': ANY, 'bySource': ANY, 'monthlyData': list},
+    'GET /reports/expenses': {'byCategory': ANY, 'monthlyData': list},
+    'GET /leads': [RECORD],
+    'POST /leads': {'lead': RECORD, 'contactCreated': ANY},
+    'POST /projects': RECORD,
+    'POST /tasks': RECORD,
+    'POST /expenses': RECORD,
+    'POST /users': RECORD,
+    'POST /webhook/leads': {'leadId': ANY},
+}
+
+_compiled = {}
+
+
+def validator(route):
+    """Compiled check for a route, or None when the route has no schema"""
+    try:
+        return _compiled[route]
+    except KeyError:
+        schema = ROUTE_SCHEMAS.get(route)
+        check = _compiled[route] = compile_schema(schema) if schema is not None else None
+        return check
+
+
+def validate(route, body):
+    """First schema violation in body as a message, or None when it conforms (or the route has no schema)"""
+    check = validator(route)
+    return check(body, 'body') if check else None
+
+
+class ResponseValidator:
+    """Validates a deterministic fraction of response bodies and counts violations per route"""
+
+    def __init__(self, rate=VALIDATE_RATE):
+        self.rate = min(max(rate, 0.0), 1.0)
+        self.credit = 0.0
+        self.checked = 0
+        self.skipped = 0
+        self.failures = {}
+
+    def check(self, route, body):
+        """Error message for a sampled, non-conforming body; None when it conforms or was not sampled"""
+        check = validator(route)
+        if check is None:
+            return None
+        # Spread the sampled bodies evenly instead of drawing random numbers per response
+        self.credit += self.rate
+        if self.credit < 1.0:
+            self.skipped += 1
+            return None
+        self.credit -= 1.0
+        self.checked += 1
+        error = check(body, 'body')
+        if error:
+            entry = self.failures.setdefault(route, {'count': 0, 'example': error})
+            entry['count'] += 1
+        return error
+
+    def summary(self):
+        return {
+            'rate': self.rate,
+            'checked': self.checked,
+            'skipped': self.skipped,
+            'invalid': sum(entry['count'] for entry in self.failures.values()),
+            'failures': self.failures
+        }
@@ -0,0 +1,316 @@
+"""
+Bulk tenant data seeder for scale testing the leads/projects/tasks/expenses routes
+Registers N tenants through the BuildCRMTester auth flow and posts M records of each kind per tenant
+
+Payloads come from harness.payloads, derived from (seed, tenant, kind, index), so a resumed seed
+regenerates exactly the records that are still missing. Every accepted record appends a line to a
+progress journal next to the JSON state file, which is folded back into the state at the start and end
+of a run; a crash can only re-post the records that were in flight when it happened.
+
+Usage:
+    python -m harness.seeder --tenants 5 --records 100000 --workers 32
+    python -m harness.seeder --resume --state .harness/seed-state.json
+    python -m harness.seeder --tenants 5 --records 100000 --workers 128 --adaptive
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+
+from harness.adaptive import ThreadAdaptiveLimiter, add_adaptive_arguments, adaptive_settings, print_concurrency_table
+from harness.config import BASE_URL
+from harness.payloads import KINDS, PayloadFactory, midnight
+from harness.tokens import private_opener
+
+DEFAULT_STATE = '.harness/seed-state.json'
+DEFAULT_KINDS = ('leads', 'projects', 'tasks', 'expenses')
+SEED_PASSWORD = "seedpass123"
+
+def register_tenant(make_request, run_id, index, prefix='seed'):
+    """Register one tenant, mirroring BuildCRMTester.test_client_registration"""
+    email = f"{prefix}{run_id}-{index}@buildcrm.com"
+    register_data = {
+        "businessName": f"{prefix.title()} Construction Co {run_id}-{index}",
+        "email": email,
+        "password": SEED_PASSWORD,
+        "phone": "+91 9876543210",
+        "planId": "basic"
+    }
+    response = make_request('POST', '/auth/register', register_data)
+    if not response or response.status_code != 200:
+        # Registered before an interrupted run could checkpoint it
+        response = make_request('POST', '/auth/login', {"email": email, "password": SEED_PASSWORD})
+        if not response or response.status_code != 200:
+            return None
+    data = response.json()
+    client_id = (data.get('client') or {}).get('id') or data['user'].get('clientId')
+    return {'index': index, 'email': email, 'password': SEED_PASSWORD,
+            'client_id': client_id, 'token': data['token']}
+
+
+class SeedState:
+    """Checkpointed seed progress: tenants plus completed records per (tenant, kind, batch)
+
+    The plan and tenants live in the JSON file; per-record progress is appended to <path>.progress, so a
+    checkpoint costs one short write however large the seed grows.
+    """
+
+    def __init__(self, path, data):
+        self.path = path
+        self.journal_path = f"{path}.progress"
+        self.data = data
+        self._lock = threading.Lock()
+        self._journal = None
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as handle:
+            state = cls(path, json.load(handle))
+        state._replay()
+        return state
+
+    def _replay(self):
+        """Fold the journal of an interrupted run into the progress"""
+        progress = self.data['progress']
+        try:
+            with open(self.journal_path) as handle:
+                for line in handle:
+                    try:
+                        key, count = json.loads(line)
+                    except ValueError:
+                        continue  # a line torn by a crash mid-write
+                    progress[key] = max(progress.get(key, 0), count)
+        except FileNotFoundError:
+            pass
+
+    @classmethod
+    def create(cls, path, plan):
+        return cls(path, {'plan': plan, 'tenants': [], 'progress': {}})
+
+    def save(self):
+        """Write the whole state and empty the journal it now contains"""
+        with self._lock:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            temporary = f"{self.path}.tmp"
+            # Tenant passwords and tokens, so owner-only like the token cache
+            with open(temporary, 'w', opener=private_opener) as handle:
+                json.dump(self.data, handle)
+            os.replace(temporary, self.path)
+            if self._journal:
+                self._journal.close()
+                self._journal = None
+            # A crash before this truncate only replays entries the state already holds
+            open(self.journal_path, 'w').close()
+
+    def completed(self, tenant_index, kind, batch):
+        return self.data['progress'].get(f"{tenant_index}:{kind}:{batch}", 0)
+
+    def mark(self, tenant_index, kind, batch, count):
+        key = f"{tenant_index}:{kind}:{batch}"
+        with self._lock:
+            self.data['progress'][key] = count
+            if self._journal is None:
+                self._journal = open(self.journal_path, 'a')
+            self._journal.write(json.dumps([key, count]) + '\n')
+            self._journal.flush()
+
+    def add_tenant(self, tenant):
+        with self._lock:
+            self.data['tenants'].append(tenant)
+
+
+class TenantSeeder:
+    def __init__(self, make_request, state, workers=16, adaptive=None):
+        self.make_request = make_request
+        self.state = state
+        self.workers = workers
+        # Optional ThreadAdaptiveLimiter; workers then only cap how far each route's limit can grow
+        self.adaptive = adaptive
+        anchor = state.data['plan'].get('anchor')
+        # The plan's date anchor, so a resume on a later day regenerates the same dates
+        self.payloads = PayloadFactory(state.data['plan']['seed'], datetime.fromisoformat(anchor) if anchor else None)
+        self.created = {}
+        self.failed = 0
+        self._lock = threading.Lock()
+
+    def register_tenant(self, run_id, index):
+        return register_tenant(self.make_request, run_id, index)
+
+    def login(self, tenant):
+        response = self.make_request('POST', '/auth/login', {"email": tenant['email'], "password": tenant['password']})
+        if response and response.status_code == 200:
+            tenant['token'] = response.json()['token']
+        return tenant
+
+    def ensure_tenants(self):
+        plan = self.state.data['plan']
+        existing = {tenant['index'] for tenant in self.state.data['tenants']}
+        missing = [index for index in range(plan['tenants']) if index not in existing]
+        with ThreadPoolExecutor(max_workers=min(self.workers, max(len(missing), 1))) as executor:
+            futures = [executor.submit(self.register_tenant, plan['run_id'], index) for index in missing]
+            for future in as_completed(futures):
+                tenant = future.result()
+                if tenant:
+                    self.state.add_tenant(tenant)
+        self.state.save()
+        return sorted(self.state.data['tenants'], key=lambda tenant: tenant['index'])
+
+    def post(self, kind, payload, token):
+        if not self.adaptive:
+            return self.make_request('POST', f'/{kind}', payload, token=token)
+        route = f"POST /{kind}"
+        self.adaptive.acquire(route)
+        started = time.perf_counter()
+        response = None
+        try:
+            response = self.make_request('POST', f'/{kind}', payload, token=token)
+        finally:
+            self.adaptive.release(route, response.status_code if response is not None else None,
+                                  time.perf_counter() - started)
+        return response
+
+    def seed_batch(self, tenant, kind, batch):
+        """Post the remaining records of one batch in order, checkpointing each, and stop at the first failure"""
+        plan = self.state.data['plan']
+        start = batch * plan['batch_size']
+        size = min(plan['batch_size'], plan['records'] - start)
+        done = self.state.completed(tenant['index'], kind, batch)
+
+        for offset in range(done, size):
+            index = start + offset
+            response = self.post(kind, self.payloads.payload(kind, index, tenant['index']), tenant['token'])
+            if not response or response.status_code not in (200, 201):
+                with self._lock:
+                    self.failed += 1
+                break
+            done = offset + 1
+            self.state.mark(tenant['index'], kind, batch, done)
+            with self._lock:
+                self.created[kind] = self.created.get(kind, 0) + 1
+        return done == size
+
+    def run(self, tenants):
+        plan = self.state.data['plan']
+        batches = -(-plan['records'] // plan['batch_size'])
+        pending = [
+            (tenant, kind, batch)
+            for batch in range(batches)
+            for tenant in tenants
+            for kind in plan['kinds']
+            if self.state.completed(tenant['index'], kind, batch) < min(plan['batch_size'], plan['records'] - batch * plan['batch_size'])
+        ]
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = [executor.submit(self.seed_batch, *work) for work in pending]
+            incomplete = sum(1 for future in as_completed(futures) if not future.result())
+        return incomplete
+
+
+def run_seed(base_url=BASE_URL, tenants=1, records=1000, kinds=DEFAULT_KINDS, workers=16, batch_size=100,
+             state_path=DEFAULT_STATE, resume=False, seed=0, adaptive=None):
+    """Seed (or resume seeding) and return a summary with records/second
+
+    adaptive is a dict of AdaptiveLimiter settings; each kind's concurrent posts then adapt up to workers.
+    """
+    from harness.session import bind_requests
+
+    if resume:
+        state = SeedState.load(state_path)
+    else:
+        state = SeedState.create(state_path, {
+            'run_id': int(time.time()), 'tenants': tenants, 'records': records, 'kinds': list(kinds),
+            'batch_size': batch_size, 'seed': seed, 'anchor': midnight().isoformat(), 'base_url': base_url
+        })
+    plan = state.data['plan']
+
+    seeder = TenantSeeder(bind_requests(plan['base_url']), state, workers,
+                          ThreadAdaptiveLimiter(**adaptive) if adaptive else None)
+    started = time.perf_counter()
+
+    tenant_list = seeder.ensure_tenants()
+    if resume:
+        # Stored tokens may have expired since the interrupted run
+        for tenant in tenant_list:
+            seeder.login(tenant)
+        state.save()
+
+    incomplete = seeder.run(tenant_list)
+    state.save()
+    elapsed = time.perf_counter() - started
+    created = sum(seeder.created.values())
+    summary = {
+        'tenants': len(tenant_list),
+        'planned_tenants': plan['tenants'],
+        'created': dict(seeder.created),
+        'records': created,
+        'failed': seeder.failed,
+        'incomplete_batches': incomplete,
+        'seconds': elapsed,
+        'records_per_second': created / elapsed if elapsed else 0.0,
+        'state': state_path
+    }
+    if seeder.adaptive:
+        summary['concurrency'] = seeder.adaptive.summary()
+    return summary
+
+
+def print_seed_summary(summary):
+    print("=" * 60)
+    print("🌱 SEED SUMMARY")
+    print("=" * 60)
+    print(f"Tenants: {summary['tenants']}/{summary['planned_tenants']}")
+    for kind, count in sorted(summary['created'].items()):
+        print(f"   {kind}: {count} created")
+    print(f"Records: {summary['records']} in {summary['seconds']:.1f}s ({summary['records_per_second']:.1f} records/s)")
+    if summary['failed'] or summary['incomplete_batches']:
+        print(f"⚠️  {summary['failed']} failed posts, {summary['incomplete_batches']} incomplete batches. "
+              f"Re-run with --resume --state {summary['state']}")
+    else:
+        print("🎉 Seed complete.")
+    if summary.get('concurrency'):
+        print_concurrency_table(summary['concurrency'])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Seed BuildCRM tenants with production-sized data")
+    parser.add_argument('--base-url', default=BASE_URL)
+    parser.add_argument('--tenants', type=int, default=1, help="Tenants to register")
+    parser.add_argument('--records', type=int, default=1000, help="Records of each kind per tenant")
+    parser.add_argument('--kinds', default=','.join(DEFAULT_KINDS),
+                        help=f"Comma-separated record kinds out of: {', '.join(KINDS)}")
+    parser.add_argument('--workers', type=int, default=16, help="Batches posted concurrently")
+    parser.add_argument('--batch-size', type=int, default=100, help="Records per batch; one worker posts a batch in order")
+    parser.add_argument('--seed', type=int, default=0, help="Random seed for payload generation")
+    parser.add_argument('--state', default=DEFAULT_STATE, help=f"Checkpoint file (default: {DEFAULT_STATE})")
+    parser.add_argument('--resume', action='store_true', help="Continue the seed recorded in --state")
+    parser.add_argument('--json', action='store_true', help="Print the summary as JSON")
+    add_adaptive_arguments(parser, '--workers')
+    args = parser.parse_args(argv)
+
+    summary = run_seed(
+        base_url=args.base_url,
+        tenants=args.tenants,
+        records=args.records,
+        kinds=[kind.strip() for kind in args.kinds.split(',') if kind.strip()],
+        workers=args.workers,
+        batch_size=args.batch_size,
+        state_path=args.state,
+        resume=args.resume,
+        seed=args.seed,
+        adaptive=adaptive_settings(args, args.workers)
+    )
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print_seed_summary(summary)
+    return 1 if summary['failed'] or summary['incomplete_batches'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
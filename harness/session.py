@@ -0,0 +1,296 @@
+"""
+Pooled keep-alive HTTP session shared by every tester in a run
+Reuses TCP/TLS connections to the API host, retries transient failures with backoff and times every
+request's DNS, connect, TLS, time-to-first-byte and body phases
+"""
+
+import json
+import os
+import socket
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import NewConnectionError
+from urllib3.util.retry import Retry
+
+from harness.latency import LatencyRecorder, PhaseRecorder, normalize_route
+
+# Configuration (override through the environment)
+POOL_SIZE = int(os.environ.get('HARNESS_POOL_SIZE', '10'))
+MAX_RETRIES = int(os.environ.get('HARNESS_RETRIES', '3'))
+BACKOFF_FACTOR = float(os.environ.get('HARNESS_BACKOFF', '0.3'))
+REQUEST_TIMEOUT = 30
+
+# Only idempotent methods are retried after the request reached the server
+RETRY_METHODS = frozenset(['GET', 'PUT', 'DELETE', 'HEAD', 'OPTIONS'])
+RETRY_STATUSES = (502, 503, 504)
+
+_shared_session = None
+_shared_lock = threading.Lock()
+# Phase timings of the request in flight on each thread; the urllib3 hooks below add to it
+_phase_timing = threading.local()
+# Route, status, duration and size of each thread's latest request, for the result sink
+_last_request = threading.local()
+
+
+def _current_phases():
+    return getattr(_phase_timing, 'phases', None)
+
+
+def _add_phase(phases, name, seconds):
+    phases[name] = phases.get(name, 0.0) + seconds
+
+
+class ConnectionCounter:
+    """Thread-safe tally of requests sent and sockets opened"""
+
+    def __init__(self):
+        self.requests = 0
+        self.connects = 0
+        self._lock = threading.Lock()
+
+    def add_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def add_connect(self):
+        with self._lock:
+            self.connects += 1
+
+
+class PhaseTimingMixin:
+    """urllib3 connection hooks that split socket setup into DNS, TCP connect and TLS handshake"""
+
+    def _new_conn(self):
+        phases = _current_phases()
+        if phases is None:
+            return super()._new_conn()
+        host = self._dns_host
+        start = time.perf_counter()
+        try:
+            addresses = socket.getaddrinfo(host, self.port, 0, socket.SOCK_STREAM)
+        except OSError:
+            # Let urllib3 resolve again and raise its usual NameResolutionError
+            return super()._new_conn()
+        resolved = time.perf_counter()
+        _add_phase(phases, 'dns', resolved - start)
+
+        # Connect to the address resolved above so the connect phase carries no second lookup
+        self._dns_host = addresses[0][4][0]
+        try:
+            sock = super()._new_conn()
+        except NewConnectionError:
+            if len(addresses) == 1:
+                raise
+            self._dns_host = host
+            sock = super()._new_conn()
+        finally:
+            self._dns_host = host
+        _add_phase(phases, 'connect', time.perf_counter() - resolved)
+        return sock
+
+    def connect(self):
+        phases = _current_phases()
+        if phases is None:
+            return super().connect()
+        socket_setup = phases.get('dns', 0.0) + phases.get('connect', 0.0)
+        start = time.perf_counter()
+        super().connect()
+        elapsed = time.perf_counter() - start
+        _add_phase(phases, 'setup', elapsed)
+        if isinstance(self, HTTPSConnection):
+            _add_phase(phases, 'tls', elapsed - (phases.get('dns', 0.0) + phases.get('connect', 0.0) - socket_setup))
+
+
+def _make_request_timed(make_request, *args, **kwargs):
+    """Run a pool's _make_request, recording time to first byte without the connection setup inside it"""
+    phases = _current_phases()
+    if phases is None:
+        return make_request(*args, **kwargs)
+    setup = phases.get('setup', 0.0)
+    start = time.perf_counter()
+    response = make_request(*args, **kwargs)
+    phases['headers_at'] = time.perf_counter()
+    # A retried request keeps the last attempt's wait
+    phases['ttfb'] = phases['headers_at'] - start - (phases.get('setup', 0.0) - setup)
+    return response
+
+
+def _counting_pool_classes(counter):
+    """Build urllib3 pool classes that report every request and socket connect to counter and time each phase"""
+
+    class CountingHTTPConnection(PhaseTimingMixin, HTTPConnection):
+        def connect(self):
+            counter.add_connect()
+            super().connect()
+
+    class CountingHTTPSConnection(PhaseTimingMixin, HTTPSConnection):
+        def connect(self):
+            counter.add_connect()
+            super().connect()
+
+    class CountingHTTPConnectionPool(HTTPConnectionPool):
+        ConnectionCls = CountingHTTPConnection
+
+        def _make_request(self, *args, **kwargs):
+            counter.add_request()
+            return _make_request_timed(super()._make_request, *args, **kwargs)
+
+    class CountingHTTPSConnectionPool(HTTPSConnectionPool):
+        ConnectionCls = CountingHTTPSConnection
+
+        def _make_request(self, *args, **kwargs):
+            counter.add_request()
+            return _make_request_timed(super()._make_request, *args, **kwargs)
+
+    return {'http': CountingHTTPConnectionPool, 'https': CountingHTTPSConnectionPool}
+
+
+class HarnessSession:
+    def __init__(self, pool_size=POOL_SIZE, retries=MAX_RETRIES, backoff=BACKOFF_FACTOR, timeout=REQUEST_TIMEOUT):
+        self.timeout = timeout
+        self.counter = ConnectionCounter()
+        self.latency = LatencyRecorder()
+        self.phases = PhaseRecorder()
+        # A harness.cassette.Cassette when the run records or replays its traffic
+        self.cassette = None
+        # A list that collects every exchange while harness.differential compares two deployments
+        self.capture = None
+        self.session = requests.Session()
+        self.session.headers['Connection'] = 'keep-alive'
+
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            read=retries,
+            status=retries,
+            backoff_factor=backoff,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=RETRY_METHODS,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        adapter.poolmanager.pool_classes_by_scheme = _counting_pool_classes(self.counter)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def request(self, method, url, headers=None, json=None, timeout=None, params=None, stream=False):
+        """Send a request over the pooled connections, recording its latency and phase breakdown per route"""
+        _last_request.info = None
+        if self.cassette is not None and self.cassette.replaying:
+            start = time.perf_counter()
+            try:
+                response = self.cassette.play(method, url, params, json)
+            except requests.exceptions.RequestException:
+                self._finish(method, url, time.perf_counter() - start)
+                raise
+            self._finish(method, url, time.perf_counter() - start, response, stream)
+            return response
+
+        phases = _phase_timing.phases = {}
+        start = time.perf_counter()
+        try:
+            response = self.session.request(method, url, headers=headers, json=json, params=params,
+                                            timeout=timeout or self.timeout, stream=stream)
+        except requests.exceptions.RequestException:
+            self._finish(method, url, time.perf_counter() - start)
+            raise
+        finally:
+            _phase_timing.phases = None
+        end = time.perf_counter()
+        self._finish(method, url, end - start, response, stream)
+        if 'headers_at' in phases:
+            # A streamed body is read by the caller later, so only eager reads have a body phase
+            if not stream:
+                phases['body'] = end - phases['headers_at']
+            self.phases.record(method, url, phases)
+        if self.cassette is not None:
+            self.cassette.record(method, url, params, json, response)
+        return response
+
+    def _finish(self, method, url, seconds, response=None, stream=False):
+        status = response.status_code if response is not None else None
+        self.latency.record(method, url, seconds, status)
+        size = None
+        if response is not None:
+            length = response.headers.get('Content-Length')
+            size = int(length) if stream and length and length.isdigit() else None if stream else len(response.content)
+        _last_request.info = {'route': f"{method.upper()} {normalize_route(url)}", 'status': status,
+                              'duration': seconds, 'size': size}
+        if self.capture is not None:
+            self.capture.append({'route': _last_request.info['route'], 'status': status,
+                                 'content': response.content if response is not None and not stream else None})
+
+    def take_last_request(self):
+        """Route, status, duration and size of this thread's latest request, once; None if already taken"""
+        info = getattr(_last_request, 'info', None)
+        _last_request.info = None
+        return info
+
+    def connection_stats(self):
+        """Count requests sent and how many of them had to open a new connection"""
+        return {
+            'requests': self.counter.requests,
+            'new_connections': self.counter.connects,
+            'reused_connections': max(self.counter.requests - self.counter.connects, 0)
+        }
+
+    def close(self):
+        self.session.close()
+
+
+def get_session():
+    """Return the process-wide shared session, creating it on first use"""
+    global _shared_session
+    with _shared_lock:
+        if _shared_session is None:
+            _shared_session = HarnessSession()
+        return _shared_session
+
+
+def bind_requests(base_url, session=None):
+    """make_request(method, endpoint, data=None, token=None) against base_url, as the suites' testers have
+
+    Transport errors print and return None, so callers check `response is not None` like the suites do.
+    """
+    session = session or get_session()
+
+    def make_request(method, endpoint, data=None, token=None):
+        headers = {'Content-Type': 'application/json'}
+        if token:
+            headers['Authorization'] = f'Bearer {token}'
+        try:
+            return session.request(method, f"{base_url}{endpoint}", headers=headers, json=data)
+        except requests.exceptions.RequestException as e:
+            print(f"Request failed: {e}")
+            return None
+
+    return make_request
+
+
+def print_connection_summary(session=None):
+    """Print how many connections were reused against new ones this run"""
+    stats = (session or get_session()).connection_stats()
+    print(f"🔌 Connections: {stats['reused_connections']} reused, {stats['new_connections']} new "
+          f"({stats['requests']} requests)")
+    return stats
+
+
+def print_latency_report(session=None, json_path=None):
+    """Print p50/p90/p99/max and the phase breakdown per route, optionally writing both as JSON"""
+    session = session or get_session()
+    json_path = json_path or os.environ.get('HARNESS_LATENCY_JSON')
+    summary = session.latency.print_table()
+    phases = session.phases.print_table()
+    if json_path:
+        report = {route: dict(stats) for route, stats in summary.items()}
+        for route, breakdown in phases.items():
+            report.setdefault(route, {})['phases'] = breakdown
+        with open(json_path, 'w') as handle:
+            json.dump(report, handle, indent=2)
+        print(f"📄 Latency report written to {json_path}")
+    return summary
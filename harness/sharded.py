@@ -0,0 +1,187 @@
+"""
+Process-sharded runner for the backend and modular suites
+Every scenario becomes a task on a process pool. Each worker process logs in once and keeps its own
+client tenant (cached across runs as '<suite>-w<N>'), so no two scenarios share tester state. Shard
+output, results and latency histograms are merged into one summary and one exit code; workers hand
+their test results back to the parent, which alone writes --results-jsonl and --results-junit.
+
+Usage:
+    python -m harness.sharded --suite all --workers 8
+    python -m harness.sharded --suite modular --results-junit reports/modular.xml
+"""
+
+import argparse
+import contextlib
+import io
+import multiprocessing
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from harness.config import BASE_URL
+from harness.latency import LatencyHistogram, LatencyRecorder
+from harness.ledger import ResourceLedger, print_teardown_summary, teardown
+from harness.results import ResultSink, add_result_arguments, get_result_sink, handle_result_options, use_result_sink
+
+SUITES = ('backend', 'modular')
+
+# Per-process state, set up by _init_worker
+_worker = {}
+
+
+def _suite(name):
+    """(tester class, dependencies) for a suite, imported lazily inside each worker"""
+    if name == 'backend':
+        from backend_test import TEST_DEPENDENCIES, BuildCRMTester
+        return BuildCRMTester, TEST_DEPENDENCIES
+    if name == 'modular':
+        from test_modular_api import TEST_DEPENDENCIES, ModularAPITester
+        return ModularAPITester, TEST_DEPENDENCIES
+    raise ValueError(f"Unknown suite: {name}")
+
+
+def scenario_names(suite):
+    tester_class, _ = _suite(suite)
+    # test_plan only looks up bound methods; a real tester would set up a session and result sink
+    # in the parent before the workers fork
+    return [name for name, _ in tester_class.__new__(tester_class).test_plan()]
+
+
+def _prerequisites(name, dependencies):
+    """name and everything it depends on, transitively"""
+    needed = [name]
+    for required in dependencies.get(name, ()):
+        needed.extend(dep for dep in _prerequisites(required, dependencies) if dep not in needed)
+    return needed
+
+
+def _init_worker(counter, base_url, fresh_tenant, console):
+    with counter.get_lock():
+        counter.value += 1
+        index = counter.value
+    # Results go back to the parent with each shard; the inherited sink's writer thread is not running here
+    sink = use_result_sink(ResultSink(console=console, suite='sharded', collect=True))
+    _worker.update(index=index, base_url=base_url, fresh_tenant=fresh_tenant, testers={}, results={}, sink=sink)
+
+
+def run_scenario(suite, name):
+    """Run one scenario (and any prerequisites this worker has not run yet) in the current worker process"""
+    tester_class, dependencies = _suite(suite)
+    testers = _worker['testers']
+    if suite not in testers:
+        testers[suite] = tester_class(base_url=_worker['base_url'], fresh_tenant=_worker['fresh_tenant'],
+                                      tenant_name=f"{suite}-w{_worker['index']}")
+    tester = testers[suite]
+    done = _worker['results'].setdefault(suite, {})
+    plan = dict(tester.test_plan())
+    needed = set(_prerequisites(name, dependencies))
+
+    output = io.StringIO()
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(output):
+        for step in plan:
+            if step in needed and step not in done:
+                done[step] = tester.run_test(plan[step])
+    histograms, errors = tester.session.latency.snapshot()
+    return {
+        'suite': suite,
+        'name': name,
+        'worker': _worker['index'],
+        'passed': done[name],
+        'seconds': time.perf_counter() - started,
+        'output': output.getvalue(),
+        'test_results': _worker['sink'].take(),
+        # Cumulative for the worker; the parent keeps the latest snapshot per worker
+        'latency': {route: histogram.to_dict() for route, histogram in histograms.items()},
+        'errors': errors
+    }
+
+
+def run_sharded(suites=SUITES, workers=None, base_url=BASE_URL, fresh_tenant=None, cleanup=True):
+    tasks = [(suite, name) for suite in suites for name in scenario_names(suite)]
+    workers = workers or len(tasks)
+    counter = multiprocessing.Value('i', 0)
+    sink = get_result_sink('sharded')
+    results = {}
+    snapshots = {}
+    started = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(counter, base_url, fresh_tenant, sink.console)) as executor:
+        futures = {executor.submit(run_scenario, suite, name): (suite, name) for suite, name in tasks}
+        for future in as_completed(futures):
+            suite, name = futures[future]
+            try:
+                shard = future.result()
+            except Exception as e:
+                shard = {'suite': suite, 'name': name, 'worker': None, 'passed': False, 'seconds': 0.0,
+                         'output': f"Shard crashed: {e!r}\n", 'test_results': [], 'latency': {}, 'errors': {}}
+            print(f"──── {suite}/{name} (worker {shard['worker']}, {shard['seconds']:.1f}s) ────")
+            print(shard['output'], end='')
+            for result in shard['test_results']:
+                sink.add(result)
+            results[(suite, name)] = shard
+            if shard['worker'] is not None:
+                snapshots[shard['worker']] = shard
+
+    recorder = LatencyRecorder()
+    for shard in snapshots.values():
+        for route, data in shard['latency'].items():
+            recorder.histograms.setdefault(route, LatencyHistogram()).merge(LatencyHistogram.from_dict(data))
+        for route, count in shard['errors'].items():
+            recorder.errors[route] = recorder.errors.get(route, 0) + count
+
+    report = {
+        'seconds': time.perf_counter() - started,
+        'workers': workers,
+        'results': [results[task] for task in tasks],
+        'recorder': recorder
+    }
+    if cleanup:
+        # Workers share the on-disk ledger, so one teardown in the parent covers every shard
+        from harness.session import bind_requests
+
+        report['teardown'] = teardown(bind_requests(base_url), base_url, ResourceLedger())
+    return report
+
+
+def print_sharded_summary(report):
+    print("=" * 60)
+    print("🏁 SHARDED TEST SUMMARY")
+    print("=" * 60)
+    if 'teardown' in report:
+        print_teardown_summary(report['teardown'])
+    for shard in report['results']:
+        status = "✅ PASS" if shard['passed'] else "❌ FAIL"
+        print(f"{status} {shard['suite']}/{shard['name'].replace('_', ' ').title()} ({shard['seconds']:.1f}s)")
+    passed = sum(1 for shard in report['results'] if shard['passed'])
+    slowest = max((shard['seconds'] for shard in report['results']), default=0.0)
+    print(f"\nOverall Result: {passed}/{len(report['results'])} scenarios passed in {report['seconds']:.1f}s "
+          f"on {report['workers']} workers (slowest scenario {slowest:.1f}s)")
+    report['recorder'].print_table()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the Python API suites sharded across processes")
+    parser.add_argument('--base-url', default=BASE_URL)
+    parser.add_argument('--suite', choices=SUITES + ('all',), default='all')
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: one per scenario)")
+    parser.add_argument('--fresh-tenant', action='store_true', default=None,
+                        help="Register new worker tenants instead of reusing the cached ones")
+    parser.add_argument('--no-teardown', action='store_true', help="Leave created resources in place")
+    parser.add_argument('--latency-json', metavar='PATH', help="Also write merged per-route latency to PATH as JSON")
+    add_result_arguments(parser)
+    args = parser.parse_args(argv)
+    results_sink = handle_result_options(args, 'sharded')
+
+    suites = SUITES if args.suite == 'all' else (args.suite,)
+    report = run_sharded(suites, args.workers, args.base_url, args.fresh_tenant, cleanup=not args.no_teardown)
+    print_sharded_summary(report)
+    results_sink.close()
+    if args.latency_json:
+        report['recorder'].write_json(args.latency_json)
+    return 0 if all(shard['passed'] for shard in report['results']) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+"""
+Deploy-hook smoke check: health, public plans and modules, and optionally a super admin login
+Runs many times a day from deploy hooks, so it sticks to the standard library and the schema table;
+the requests-based harness stack is never imported
+
+Usage:
+    python -m harness smoke
+    python -m harness smoke --login --base-url http://127.0.0.1:8811/api
+"""
+
+import argparse
+import json
+import sys
+import time
+import urllib.error
+import urllib.request
+
+from harness.config import BASE_URL, SUPER_ADMIN_EMAIL, SUPER_ADMIN_PASSWORD
+from harness.schemas import validate
+
+SMOKE_TIMEOUT = 10
+
+
+def fetch(base_url, method, endpoint, data=None, timeout=SMOKE_TIMEOUT):
+    """(status, parsed body, seconds) for one request; status is None when the server could not be reached"""
+    body = json.dumps(data).encode() if data is not None else None
+    request = urllib.request.Request(f"{base_url}{endpoint}", data=body, method=method,
+                                     headers={'Content-Type': 'application/json'})
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            status, raw = response.status, response.read()
+    except urllib.error.HTTPError as e:
+        status, raw = e.code, e.read()
+    except (urllib.error.URLError, OSError):
+        return None, None, time.perf_counter() - started
+    try:
+        parsed = json.loads(raw) if raw else None
+    except ValueError:
+        parsed = None
+    return status, parsed, time.perf_counter() - started
+
+
+def smoke_checks(login=False):
+    checks = [('Health', 'GET', '/health', None), ('Plans', 'GET', '/plans', None),
+              ('Public Modules', 'GET', '/modules/public', None)]
+    if login:
+        checks.append(('Super Admin Login', 'POST', '/auth/login',
+                       {"email": SUPER_ADMIN_EMAIL, "password": SUPER_ADMIN_PASSWORD}))
+    return checks
+
+
+def run_smoke(base_url=BASE_URL, login=False, timeout=SMOKE_TIMEOUT):
+    """Run the checks in order, returning (name, passed, message) per check"""
+    results = []
+    for name, method, endpoint, data in smoke_checks(login):
+        status, body, seconds = fetch(base_url, method, endpoint, data, timeout)
+        if status != 200:
+            results.append((name, False, f"HTTP {status}" if status else "unreachable"))
+            continue
+        error = validate(f"{method} {endpoint}", body)
+        results.append((name, not error, error or f"{seconds * 1000:.0f}ms"))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fast deploy smoke check of the BuildCRM API")
+    parser.add_argument('--base-url', default=BASE_URL)
+    parser.add_argument('--login', action='store_true', help="Also log in as the super admin")
+    parser.add_argument('--timeout', type=float, default=SMOKE_TIMEOUT, help="Seconds per request")
+    args = parser.parse_args(argv)
+
+    results = run_smoke(args.base_url, args.login, args.timeout)
+    for name, passed, message in results:
+        print(f"{'✅ PASS' if passed else '❌ FAIL'} {name}: {message}")
+    passed = sum(1 for _, ok, _ in results if ok)
+    print(f"Smoke: {passed}/{len(results)} checks passed against {args.base_url}")
+    return 0 if passed == len(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
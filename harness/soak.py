@@ -0,0 +1,271 @@
+"""
+Soak mode: hours of mixed CRUD traffic with latency and health drift detection
+Runs the load scenarios at a steady rate, polls /health on an interval and closes a rolling window of
+per-route stats every --window seconds
+
+The first windows after warm-up form the baseline; a route whose p99 stays above it, or whose error rate
+creeps past it, for several windows in a row raises an alert. Both are the usual signs of a leak or an
+ever-growing collection.
+
+The soak itself must not grow the collections it measures: webhook leads are deleted as they arrive, and
+the per-user tenants (plus any lead a failed DELETE left) are ledgered and torn down at the end.
+
+Requires aiohttp (pip install aiohttp).
+
+Usage:
+    python -m harness.soak --hours 4 --users 20 --rps 50 --window 60 --health-interval 30
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+
+from harness.config import BASE_URL
+from harness.ledger import ResourceLedger, print_teardown_summary
+from harness.load import REQUEST_TIMEOUT, SCENARIOS, LoadContext, LoadStats, RateLimiter, teardown_run, virtual_user
+
+
+class DriftDetector:
+    """Compares each closed window with a per-route baseline and reports sustained regressions"""
+
+    def __init__(self, warmup=1, baseline_windows=3, p99_factor=1.5, error_delta=0.01, sustain=3, min_count=20):
+        self.warmup = warmup
+        self.baseline_windows = baseline_windows
+        self.p99_factor = p99_factor
+        self.error_delta = error_delta
+        self.sustain = sustain
+        self.min_count = min_count
+        self.windows = 0
+        self.samples = {}
+        self.baseline = {}
+        self.strikes = {}
+        self.history = {}
+
+    def _strike(self, key, failing):
+        """Count consecutive failing windows, returning True exactly when the streak reaches sustain"""
+        count = self.strikes.get(key, 0) + 1 if failing else 0
+        self.strikes[key] = count
+        return count == self.sustain
+
+    def observe(self, summary):
+        """Feed one window's LoadStats summary, returning the alerts it triggers"""
+        self.windows += 1
+        alerts = []
+        if self.windows <= self.warmup:
+            return alerts
+
+        for route, entry in summary['routes'].items():
+            if entry['count'] < self.min_count:
+                continue
+            error_rate = entry['errors'] / entry['count']
+            self.history.setdefault(route, []).append((self.windows, entry['p99']))
+
+            if route not in self.baseline:
+                samples = self.samples.setdefault(route, [])
+                samples.append((entry['p99'], entry['errors'], entry['count']))
+                if len(samples) >= self.baseline_windows:
+                    self.baseline[route] = {
+                        'p99': statistics.median(p99 for p99, _, _ in samples),
+                        'error_rate': sum(errors for _, errors, _ in samples) / sum(count for _, _, count in samples)
+                    }
+                continue
+
+            baseline = self.baseline[route]
+            limit = baseline['p99'] * self.p99_factor
+            if self._strike((route, 'p99'), entry['p99'] > limit):
+                alerts.append({'window': self.windows, 'route': route, 'kind': 'p99',
+                               'message': f"p99 {entry['p99']:.1f}ms above {limit:.1f}ms "
+                                          f"(baseline {baseline['p99']:.1f}ms) for {self.sustain} windows"})
+            limit = baseline['error_rate'] + self.error_delta
+            if self._strike((route, 'errors'), error_rate > limit):
+                alerts.append({'window': self.windows, 'route': route, 'kind': 'errors',
+                               'message': f"error rate {error_rate * 100:.2f}% above {limit * 100:.2f}% "
+                                          f"for {self.sustain} windows"})
+        return alerts
+
+    def trends(self, window_seconds):
+        """Least-squares p99 slope per route in ms per hour over every post-warm-up window"""
+        trends = {}
+        for route, points in self.history.items():
+            if len(points) < 3:
+                continue
+            xs = [index * window_seconds / 3600 for index, _ in points]
+            ys = [p99 for _, p99 in points]
+            mean_x, mean_y = statistics.fmean(xs), statistics.fmean(ys)
+            variance = sum((x - mean_x) ** 2 for x in xs)
+            if variance:
+                trends[route] = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / variance
+        return trends
+
+
+class HealthMonitor:
+    """Tracks /health answers: failures, and changes to the reported status or feature list"""
+
+    def __init__(self):
+        self.polls = 0
+        self.failures = 0
+        self.last = None
+
+    def observe(self, status, body):
+        self.polls += 1
+        alerts = []
+        if status != 200 or not isinstance(body, dict):
+            self.failures += 1
+            return [{'route': 'GET /health', 'kind': 'health', 'message': f"health check answered {status}"}]
+        state = (body.get('status'), tuple(body.get('features') or ()))
+        if state[0] != 'healthy':
+            alerts.append({'route': 'GET /health', 'kind': 'health', 'message': f"status is {state[0]!r}"})
+        if self.last and state != self.last and state[0] == self.last[0]:
+            alerts.append({'route': 'GET /health', 'kind': 'health',
+                           'message': f"feature list changed to {', '.join(state[1]) or 'nothing'}"})
+        self.last = state
+        return alerts
+
+
+async def run_soak(base_url=BASE_URL, hours=1.0, users=10, rps=None, concurrency=50, window=60,
+                   health_interval=30, scenarios=None, detector=None, cleanup=True):
+    try:
+        import aiohttp
+    except ImportError:
+        raise SystemExit("Soak mode needs aiohttp: pip install aiohttp")
+
+    scenarios = scenarios or list(SCENARIOS)
+    unknown = [name for name in scenarios if name not in SCENARIOS]
+    if unknown:
+        raise ValueError(f"Unknown scenarios: {', '.join(unknown)}")
+
+    detector = detector or DriftDetector()
+    health = HealthMonitor()
+    windows = []
+    alerts = []
+    run_id = int(time.time())
+    ledger = ResourceLedger()
+    started = time.monotonic()
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+
+    def raise_alerts(new_alerts):
+        for alert in new_alerts:
+            alert['elapsed'] = time.monotonic() - started
+            print(f"🚨 {alert['route']}: {alert['message']}")
+        alerts.extend(new_alerts)
+
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as http:
+        ctx = LoadContext(http, base_url, RateLimiter(rps), concurrency, started + hours * 3600,
+                          (aiohttp.ClientError, asyncio.TimeoutError), ledger=ledger, persist=False)
+
+        async def close_windows():
+            while not ctx.stopped():
+                await asyncio.sleep(min(window, max(ctx.deadline - time.monotonic(), 0)))
+                # Requests in flight record into whichever window is current when they finish
+                closed, ctx.stats = ctx.stats, LoadStats()
+                closed.finished = time.monotonic()
+                summary = closed.summary()
+                summary['window'] = len(windows) + 1
+                summary['health_failures'] = health.failures
+                windows.append(summary)
+                slowest = max(summary['routes'].items(), key=lambda item: item[1]['p99'], default=None)
+                detail = f", slowest p99 {slowest[0]} {slowest[1]['p99']:.1f}ms" if slowest else ""
+                print(f"🕐 window {summary['window']} ({(closed.finished - started) / 60:.0f} min): "
+                      f"{summary['requests']} req at {summary['rps']:.1f}/s, "
+                      f"errors {summary['error_rate'] * 100:.2f}%{detail}")
+                raise_alerts(detector.observe(summary))
+
+        async def poll_health():
+            while not ctx.stopped():
+                status, body = await ctx.request('GET', '/health', limited=False)
+                raise_alerts(health.observe(status, body))
+                await asyncio.sleep(min(health_interval, max(ctx.deadline - time.monotonic(), 0)))
+
+        monitors = [asyncio.ensure_future(close_windows()), asyncio.ensure_future(poll_health())]
+        iterations = await asyncio.gather(*(virtual_user(ctx, run_id, index, scenarios, 0) for index in range(users)))
+        await asyncio.gather(*monitors)
+
+    report = {
+        'hours': (time.monotonic() - started) / 3600,
+        'users': users,
+        'iterations': sum(iterations),
+        'window_seconds': window,
+        'windows': windows,
+        'baseline': detector.baseline,
+        'p99_trend_ms_per_hour': detector.trends(window),
+        'health': {'polls': health.polls, 'failures': health.failures},
+        'alerts': alerts
+    }
+    if cleanup:
+        report['teardown'] = await teardown_run(base_url, ledger)
+    return report
+
+
+def print_soak_report(report):
+    print("=" * 60)
+    print("🛁 SOAK SUMMARY")
+    print("=" * 60)
+    requests_total = sum(window['requests'] for window in report['windows'])
+    errors_total = sum(window['errors'] for window in report['windows'])
+    print(f"{report['hours']:.2f}h, {len(report['windows'])} windows of {report['window_seconds']}s, "
+          f"{requests_total} requests, {errors_total} errors, {report['iterations']} scenario loops")
+    print(f"Health: {report['health']['polls']} polls, {report['health']['failures']} failed")
+    if report['baseline']:
+        print(f"{'Route':<32} {'Base p99':>9} {'Last p99':>9} {'ms/hour':>9}")
+        last = report['windows'][-1]['routes'] if report['windows'] else {}
+        for route, baseline in sorted(report['baseline'].items()):
+            trend = report['p99_trend_ms_per_hour'].get(route)
+            current = last.get(route, {}).get('p99')
+            print(f"{route:<32} {baseline['p99']:>9.1f} "
+                  f"{current if current is not None else float('nan'):>9.1f} "
+                  f"{trend if trend is not None else float('nan'):>+9.1f}")
+    if 'teardown' in report:
+        print_teardown_summary(report['teardown'])
+    if report['alerts']:
+        print(f"❌ {len(report['alerts'])} drift alerts")
+    else:
+        print("🎉 No latency, error-rate or health drift detected.")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Long-running soak test with latency and health drift alerts")
+    parser.add_argument('--base-url', default=BASE_URL)
+    parser.add_argument('--hours', type=float, default=1.0)
+    parser.add_argument('--users', type=int, default=10, help="Virtual users, one tenant each")
+    parser.add_argument('--rps', type=float, default=None, help="Target requests/second across all users")
+    parser.add_argument('--concurrency', type=int, default=50, help="Cap on requests in flight")
+    parser.add_argument('--window', type=float, default=60, help="Seconds per rolling stats window")
+    parser.add_argument('--health-interval', type=float, default=30, help="Seconds between /health polls")
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS),
+                        help=f"Comma-separated subset of: {', '.join(SCENARIOS)}")
+    parser.add_argument('--warmup', type=int, default=1, help="Windows ignored before the baseline is taken")
+    parser.add_argument('--baseline-windows', type=int, default=3, help="Windows averaged into the baseline")
+    parser.add_argument('--p99-factor', type=float, default=1.5, help="Alert when p99 exceeds baseline by this factor")
+    parser.add_argument('--error-delta', type=float, default=0.01, help="Alert when the error rate rises by this much")
+    parser.add_argument('--sustain', type=int, default=3, help="Consecutive bad windows before alerting")
+    parser.add_argument('--no-teardown', action='store_true', help="Leave the soak tenants in place")
+    parser.add_argument('--json', metavar='PATH', help="Also write the report to PATH as JSON")
+    args = parser.parse_args(argv)
+
+    detector = DriftDetector(warmup=args.warmup, baseline_windows=args.baseline_windows, p99_factor=args.p99_factor,
+                             error_delta=args.error_delta, sustain=args.sustain)
+    report = asyncio.run(run_soak(
+        base_url=args.base_url,
+        hours=args.hours,
+        users=args.users,
+        rps=args.rps,
+        concurrency=args.concurrency,
+        window=args.window,
+        health_interval=args.health_interval,
+        scenarios=[name.strip() for name in args.scenarios.split(',') if name.strip()],
+        detector=detector,
+        cleanup=not args.no_teardown
+    ))
+    print_soak_report(report)
+    if args.json:
+        with open(args.json, 'w') as handle:
+            json.dump(report, handle, indent=2)
+    return 1 if report['alerts'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,870 @@
+"""
+Local in-process stand-in for the BuildCRM /api surface used by the harness
+Standard library only; keeps per-tenant in-memory stores so runs are repeatable without network
+
+Response shapes follow what the harness scripts assert; list paging, query parsing, create status codes
+and bodies (POST /leads answers 201 with {lead, contactCreated}) and the webhook's status codes follow
+the app/api routes. A JSON body that is not an object gets a 400. Tokens use the same base64 JSON
+payload (with a millisecond exp) as lib/utils/auth.js.
+
+Usage:
+    python -m harness.stub_server --port 8000
+    HARNESS_BASE_URL=http://127.0.0.1:8000/api python backend_test.py
+"""
+
+import argparse
+import base64
+import hashlib
+import itertools
+import json
+import re
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from harness.config import DEMO_CLIENT_EMAIL, DEMO_CLIENT_PASSWORD, SUPER_ADMIN_EMAIL, SUPER_ADMIN_PASSWORD
+
+TOKEN_EXPIRY_MS = 24 * 60 * 60 * 1000
+DEFAULT_LIST_LIMIT = 100
+
+PLANS = [
+    {"id": "basic", "name": "Basic", "price": 999, "features": ["Leads", "Projects", "Tasks"]},
+    {"id": "professional", "name": "Professional", "price": 2499, "features": ["Everything in Basic", "Reports", "Integrations"]},
+    {"id": "enterprise", "name": "Enterprise", "price": 4999, "features": ["Everything in Professional", "White Labeling"]},
+]
+MODULES = [
+    {"id": "wooden-flooring", "name": "Wooden Flooring", "price": 1999, "active": True},
+    {"id": "doors-windows", "name": "Doors & Windows", "price": 1999, "active": True},
+    {"id": "paints-coatings", "name": "Paints & Coatings", "price": 1499, "active": True},
+    {"id": "interior-designers", "name": "Interior Designers", "price": 1499, "active": True},
+    {"id": "architects", "name": "Architects", "price": 1499, "active": True},
+]
+PLAN_PRICES = {plan['id']: plan['price'] for plan in PLANS}
+
+# Collection name -> defaults applied on create
+COLLECTION_DEFAULTS = {
+    'leads': {'status': 'new', 'value': 0, 'probability': 50},
+    'projects': {'status': 'planning', 'progress': 0},
+    'tasks': {'status': 'todo', 'priority': 'medium'},
+    'expenses': {'approved': False},
+    'contacts': {'type': 'customer', 'source': 'manual', 'tags': []},
+}
+# Collection name -> (default limit, or None for the whole collection; whether ?page= selects a page), as in
+# each app/api/<name>/route.js GET. None of them read ?offset=.
+LIST_PAGING = {
+    'leads': (DEFAULT_LIST_LIMIT, False),
+    'projects': (None, False),
+    'tasks': (500, True),
+    'expenses': (None, False),
+    'contacts': (50, True),
+}
+# Collection name -> status of a successful POST; contacts/route.js keeps successResponse's default 200
+CREATE_STATUS = {'leads': 201, 'projects': 201, 'tasks': 201, 'expenses': 201, 'contacts': 200}
+FUNNEL_STAGES = {
+    'contacted': ('contacted', 'qualified', 'proposal', 'negotiation', 'won'),
+    'qualified': ('qualified', 'proposal', 'negotiation', 'won'),
+    'proposal': ('proposal', 'negotiation', 'won'),
+    'won': ('won',),
+}
+
+
+class StubError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def _now():
+    return datetime.now().isoformat()
+
+
+def _parse_int(value):
+    """JavaScript parseInt: the leading integer of value, or None where JS gives NaN"""
+    match = re.match(r'\s*([+-]?\d+)', value or '')
+    return int(match.group(1)) if match else None
+
+
+def _hash_password(password):
+    return hashlib.sha256(f"{password}buildcrm_salt_2024".encode()).hexdigest()
+
+
+def _parse_date(value):
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value).replace('Z', '+00:00')).replace(tzinfo=None)
+    except ValueError:
+        return None
+
+
+def _months_ago(moment, months):
+    """Same month arithmetic as JS Date.setMonth(getMonth() - months)"""
+    month_index = moment.year * 12 + moment.month - 1 - months
+    year, month = divmod(month_index, 12)
+    day = moment.day
+    while True:
+        try:
+            return moment.replace(year=year, month=month + 1, day=day)
+        except ValueError:
+            day -= 1
+
+
+def issue_token(user):
+    payload = {
+        'id': user['id'],
+        'email': user['email'],
+        'role': user['role'],
+        'clientId': user.get('clientId'),
+        'databaseName': user.get('clientId'),
+        'permissions': user.get('permissions', []),
+        'iat': int(time.time() * 1000),
+        'exp': int(time.time() * 1000) + TOKEN_EXPIRY_MS
+    }
+    return base64.b64encode(json.dumps(payload).encode()).decode()
+
+
+def read_token(token):
+    try:
+        payload = json.loads(base64.b64decode(token))
+    except (ValueError, TypeError):
+        return None
+    if not isinstance(payload, dict) or payload.get('exp', 0) < time.time() * 1000:
+        return None
+    return payload
+
+
+class TenantStore:
+    """One client's isolated collections, like the per-client database in lib/db/multitenancy"""
+
+    def __init__(self, client_id):
+        self.client_id = client_id
+        self.collections = {name: OrderedDict() for name in COLLECTION_DEFAULTS}
+        self.whitelabel = None
+        self.lock = threading.Lock()
+
+    def create(self, name, body, created_by=None):
+        now = _now()
+        document = {'id': str(uuid.uuid4()), 'clientId': self.client_id}
+        document.update(body or {})
+        for field, default in COLLECTION_DEFAULTS[name].items():
+            if document.get(field) in (None, ''):
+                document[field] = default
+        if name == 'expenses' and not document.get('date'):
+            document['date'] = now
+        document.update(createdBy=created_by, createdAt=now, updatedAt=now)
+        with self.lock:
+            self.collections[name][document['id']] = document
+        return document
+
+    def page(self, name, limit=DEFAULT_LIST_LIMIT, offset=0, filters=None):
+        """Newest first, like .sort({ createdAt: -1 }).skip(offset).limit(limit); limit None reads to the end"""
+        with self.lock:
+            documents = reversed(list(self.collections[name].values()))
+            if filters:
+                documents = (doc for doc in documents if all(doc.get(key) == value for key, value in filters.items()))
+            return list(itertools.islice(documents, offset, offset + abs(limit) if limit else None))
+
+    def all(self, name):
+        with self.lock:
+            return list(self.collections[name].values())
+
+    def get(self, name, document_id):
+        with self.lock:
+            return self.collections[name].get(document_id)
+
+    def update(self, name, document_id, body):
+        with self.lock:
+            document = self.collections[name].get(document_id)
+            if document is None:
+                return None
+            document.update({key: value for key, value in (body or {}).items() if key not in ('id', 'clientId')})
+            document['updatedAt'] = _now()
+            return dict(document)
+
+    def delete(self, name, document_id):
+        with self.lock:
+            return self.collections[name].pop(document_id, None) is not None
+
+    def count(self, name):
+        with self.lock:
+            return len(self.collections[name])
+
+
+class StubState:
+    """Platform-level data (clients, users, module requests) plus one TenantStore per client"""
+
+    def __init__(self, login_delay=0.0):
+        self.login_delay = login_delay
+        self.lock = threading.RLock()
+        self.clients = OrderedDict()
+        self.users = OrderedDict()
+        self.users_by_email = {}
+        self.tenants = {}
+        self.module_requests = OrderedDict()
+        self.client_sequence = itertools.count(100001)
+        self._seed()
+
+    def _seed(self):
+        self.add_user({
+            'id': str(uuid.uuid4()), 'email': SUPER_ADMIN_EMAIL, 'name': 'Super Admin',
+            'role': 'super_admin', 'clientId': None, 'password': _hash_password(SUPER_ADMIN_PASSWORD)
+        })
+        self.register_client("Demo Construction Co", DEMO_CLIENT_EMAIL, DEMO_CLIENT_PASSWORD, "+91 9000000000", "professional")
+
+    def add_user(self, user):
+        with self.lock:
+            self.users[user['id']] = user
+            self.users_by_email[user['email'].lower()] = user
+        return user
+
+    def register_client(self, business_name, email, password, phone, plan_id):
+        with self.lock:
+            if email.lower() in self.users_by_email:
+                raise StubError(400, 'Email already registered')
+            client_id = f"CL-{next(self.client_sequence)}"
+            client = {
+                'id': client_id, 'clientId': client_id, 'businessName': business_name, 'email': email,
+                'phone': phone, 'planId': plan_id or 'basic', 'subscriptionStatus': 'active',
+                'modules': [], 'createdAt': _now(), 'updatedAt': _now()
+            }
+            self.clients[client_id] = client
+            self.tenants[client_id] = TenantStore(client_id)
+            user = self.add_user({
+                'id': str(uuid.uuid4()), 'email': email, 'name': business_name, 'role': 'client_admin',
+                'clientId': client_id, 'permissions': ['all'], 'password': _hash_password(password)
+            })
+        return client, user
+
+    def find_client(self, client_id):
+        with self.lock:
+            return self.clients.get(client_id)
+
+    def tenant(self, user):
+        tenant = self.tenants.get(user.get('clientId'))
+        if tenant is None:
+            raise StubError(401, 'Forbidden: Client access required')
+        return tenant
+
+
+def _public_user(user):
+    return {key: value for key, value in user.items() if key != 'password'}
+
+
+class StubAPI:
+    """Route handlers; each returns (status, payload) or raises StubError"""
+
+    def __init__(self, state):
+        self.state = state
+        self.routes = []
+        for method, pattern, handler in [
+            ('GET', r'', self.health),
+            ('GET', r'/health', self.health),
+            ('GET', r'/plans', self.plans),
+            ('GET', r'/modules/public', self.public_modules),
+            ('GET', r'/modules-public', self.public_modules),
+            ('POST', r'/auth/login', self.login),
+            ('POST', r'/auth/register', self.register),
+            ('GET', r'/auth/me', self.me),
+            ('GET', r'/admin/stats', self.admin_stats),
+            ('GET', r'/admin/clients', self.admin_clients),
+            ('GET', r'/admin/clients/(?P<client_id>[^/]+)', self.admin_client),
+            ('POST', r'/admin/clients/(?P<client_id>[^/]+)', self.admin_client_action),
+            ('POST', r'/admin/clients/(?P<client_id>[^/]+)/toggle-status', self.admin_toggle_status),
+            ('GET', r'/admin/modules', self.admin_modules),
+            ('GET', r'/client/stats', self.client_stats),
+            ('GET', r'/client/modules', self.client_modules),
+            ('GET', r'/module-requests', self.list_module_requests),
+            ('POST', r'/module-requests', self.create_module_request),
+            ('PUT', r'/module-requests', self.process_module_request),
+            ('GET', r'/whitelabel', self.whitelabel),
+            ('PUT', r'/whitelabel', self.whitelabel),
+            ('POST', r'/webhook/leads', self.webhook_leads),
+            ('POST', r'/webhook/clerk', self.webhook_clerk),
+            ('GET', r'/reports/sales', self.sales_report),
+            ('GET', r'/reports/expenses', self.expenses_report),
+            ('GET', r'/users', self.list_users),
+            ('POST', r'/users', self.create_user),
+            ('GET', r'/users/(?P<user_id>[^/]+)', self.get_user),
+            ('PUT', r'/users/(?P<user_id>[^/]+)', self.update_user),
+            ('DELETE', r'/users/(?P<user_id>[^/]+)', self.delete_user),
+        ]:
+            self.routes.append((method, re.compile(f'^{pattern}/?$'), handler))
+        for name in COLLECTION_DEFAULTS:
+            self.routes.extend([
+                ('GET', re.compile(f'^/{name}/?$'), self._list(name)),
+                ('POST', re.compile(f'^/{name}/?$'), self._create(name)),
+                ('GET', re.compile(f'^/{name}/(?P<doc_id>[^/]+)/?$'), self._get(name)),
+                ('PUT', re.compile(f'^/{name}/(?P<doc_id>[^/]+)/?$'), self._update(name)),
+                ('DELETE', re.compile(f'^/{name}/(?P<doc_id>[^/]+)/?$'), self._delete(name)),
+            ])
+
+    def dispatch(self, method, path, query, headers, body):
+        user = None
+        authorization = headers.get('Authorization', '')
+        if authorization.startswith('Bearer '):
+            payload = read_token(authorization[7:])
+            if payload and payload.get('id') in self.state.users:
+                user = payload
+
+        path_matched = False
+        for route_method, pattern, handler in self.routes:
+            match = pattern.match(path)
+            if not match:
+                continue
+            path_matched = True
+            if route_method == method:
+                return handler(user=user, body=body, query=query, **match.groupdict())
+        raise StubError(405 if path_matched else 404, 'Method not allowed' if path_matched else 'Route not found')
+
+    # ---------- guards ----------
+
+    @staticmethod
+    def _require_user(user):
+        if not user:
+            raise StubError(401, 'Unauthorized')
+        return user
+
+    def _require_super_admin(self, user):
+        self._require_user(user)
+        if user['role'] != 'super_admin':
+            raise StubError(401, 'Forbidden: Super Admin access required')
+        return user
+
+    def _require_client(self, user):
+        self._require_user(user)
+        if not user.get('clientId'):
+            raise StubError(401, 'Forbidden: Client access required')
+        return self.state.tenant(user)
+
+    # ---------- public ----------
+
+    def health(self, **_):
+        return 200, {
+            'status': 'healthy',
+            'message': 'BuildCRM API v2.0 (local stand-in)',
+            'timestamp': _now(),
+            'features': ['Multi-tenant Architecture', 'Industry Modules', 'White Labeling', 'Advanced Analytics']
+        }
+
+    def plans(self, **_):
+        return 200, PLANS
+
+    def public_modules(self, **_):
+        return 200, MODULES
+
+    # ---------- auth ----------
+
+    def login(self, body, **_):
+        body = body or {}
+        if self.state.login_delay:
+            time.sleep(self.state.login_delay)
+        user = self.state.users_by_email.get(str(body.get('email', '')).lower())
+        if not user or user['password'] != _hash_password(body.get('password', '')):
+            raise StubError(401, 'Invalid credentials')
+        response = {'token': issue_token(user), 'user': _public_user(user)}
+        if user.get('clientId'):
+            response['client'] = self.state.find_client(user['clientId'])
+        return 200, response
+
+    def register(self, body, **_):
+        body = body or {}
+        if not body.get('businessName') or not body.get('email') or not body.get('password'):
+            raise StubError(400, 'Business name, email and password are required')
+        if self.state.login_delay:
+            time.sleep(self.state.login_delay)
+        client, user = self.state.register_client(
+            body['businessName'], body['email'], body['password'], body.get('phone'), body.get('planId')
+        )
+        return 200, {'token': issue_token(user), 'user': _public_user(user), 'client': client}
+
+    def me(self, user, **_):
+        self._require_user(user)
+        account = self.state.users[user['id']]
+        return 200, {'user': _public_user(account), 'client': self.state.find_client(account.get('clientId'))}
+
+    # ---------- super admin ----------
+
+    def admin_stats(self, user, **_):
+        self._require_super_admin(user)
+        with self.state.lock:
+            clients = list(self.state.clients.values())
+            total_users = sum(1 for account in self.state.users.values() if account.get('clientId'))
+        active = [client for client in clients if client['subscriptionStatus'] == 'active']
+        overview = {
+            'totalClients': len(clients),
+            'activeClients': len(active),
+            'totalUsers': total_users,
+            'monthlyRevenue': sum(PLAN_PRICES.get(client['planId'], 0) for client in active)
+        }
+        growth = {}
+        plans = {}
+        for client in clients:
+            month = client['createdAt'][:7]
+            growth[month] = growth.get(month, 0) + 1
+            plans[client['planId']] = plans.get(client['planId'], 0) + 1
+        charts = {
+            'monthlyGrowth': [{'month': month, 'clients': count} for month, count in sorted(growth.items())],
+            'planDistribution': [{'plan': plan, 'count': count} for plan, count in sorted(plans.items())]
+        }
+        return 200, {**overview, 'overview': overview, 'charts': charts}
+
+    def admin_clients(self, user, **_):
+        self._require_super_admin(user)
+        with self.state.lock:
+            return 200, list(self.state.clients.values())
+
+    def admin_client(self, user, client_id, **_):
+        self._require_super_admin(user)
+        client = self.state.find_client(client_id)
+        if not client:
+            raise StubError(404, 'Client not found')
+        return 200, client
+
+    def admin_client_action(self, user, client_id, body, **_):
+        action = (body or {}).get('action')
+        module_id = (body or {}).get('moduleId')
+        if action == 'toggle-status':
+            return self.admin_toggle_status(user=user, client_id=client_id)
+        self._require_super_admin(user)
+        if action in ('add-module', 'remove-module') and module_id:
+            with self.state.lock:
+                client = self.state.find_client(client_id)
+                if client:
+                    modules = [module for module in client['modules'] if module != module_id]
+                    client['modules'] = modules + [module_id] if action == 'add-module' else modules
+                    client['updatedAt'] = _now()
+            verb = 'added' if action == 'add-module' else 'removed'
+            return 200, {'message': f'Module {verb} successfully'}
+        raise StubError(400, 'Invalid action')
+
+    def admin_toggle_status(self, user, client_id, **_):
+        self._require_super_admin(user)
+        with self.state.lock:
+            client = self.state.clients.get(client_id)
+            if not client:
+                raise StubError(404, 'Client not found')
+            client['subscriptionStatus'] = 'paused' if client['subscriptionStatus'] == 'active' else 'active'
+            client['updatedAt'] = _now()
+            return 200, {'message': 'Status toggled', 'newStatus': client['subscriptionStatus']}
+
+    def admin_modules(self, user, **_):
+        self._require_super_admin(user)
+        return 200, MODULES
+
+    # ---------- client ----------
+
+    def client_stats(self, user, **_):
+        tenant = self._require_client(user)
+        leads = tenant.all('leads')
+        tasks = tenant.all('tasks')
+        expenses = tenant.all('expenses')
+        won = [lead for lead in leads if lead.get('status') == 'won']
+        return 200, {
+            'totalLeads': len(leads),
+            'wonLeads': len(won),
+            'pipelineValue': sum(lead.get('value') or 0 for lead in leads if lead.get('status') not in ('won', 'lost')),
+            'wonValue': sum(lead.get('value') or 0 for lead in won),
+            'totalProjects': tenant.count('projects'),
+            'totalTasks': len(tasks),
+            'completedTasks': sum(1 for task in tasks if task.get('status') == 'completed'),
+            'totalExpenses': sum(expense.get('amount') or 0 for expense in expenses)
+        }
+
+    def client_modules(self, user, **_):
+        self._require_client(user)
+        client = self.state.find_client(user['clientId']) or {}
+        return 200, [{**module, 'enabled': module['id'] in client.get('modules', [])} for module in MODULES]
+
+    def whitelabel(self, user, body=None, **_):
+        tenant = self._require_client(user)
+        client = self.state.find_client(user['clientId']) or {}
+        if client.get('planId') != 'enterprise':
+            message = 'White labeling is only available on the Enterprise plan'
+            return 403, {'error': message, 'message': message, 'status': 403}
+        with tenant.lock:
+            if body:
+                tenant.whitelabel = {**(tenant.whitelabel or {}), **body, 'updatedAt': _now()}
+            return 200, tenant.whitelabel or {'clientId': tenant.client_id, 'enabled': False}
+
+    # ---------- module requests ----------
+
+    def list_module_requests(self, user, **_):
+        self._require_user(user)
+        with self.state.lock:
+            requests = list(reversed(self.state.module_requests.values()))
+            if user['role'] != 'super_admin':
+                requests = [request for request in requests if request['clientId'] == user.get('clientId')]
+            return 200, [dict(request) for request in requests]
+
+    def create_module_request(self, user, body, **_):
+        self._require_client(user)
+        module_id = (body or {}).get('moduleId')
+        if not module_id:
+            raise StubError(400, 'Module ID is required')
+        if module_id not in {module['id'] for module in MODULES}:
+            raise StubError(404, 'Module not found')
+        with self.state.lock:
+            client = self.state.clients.get(user['clientId']) or {}
+            if module_id in client.get('modules', []):
+                raise StubError(400, 'Module already active')
+            for request in self.state.module_requests.values():
+                if request['clientId'] == user['clientId'] and request['moduleId'] == module_id and request['status'] == 'pending':
+                    raise StubError(400, 'Request already pending')
+            request = {
+                'id': str(uuid.uuid4()), 'clientId': user['clientId'], 'moduleId': module_id,
+                'requestedBy': user['id'], 'message': body.get('message', ''), 'status': 'pending',
+                'createdAt': _now(), 'updatedAt': _now()
+            }
+            self.state.module_requests[request['id']] = request
+        return 201, {'message': 'Module request submitted successfully', 'request': dict(request)}
+
+    def process_module_request(self, user, body, **_):
+        self._require_super_admin(user)
+        body = body or {}
+        request_id, action = body.get('requestId'), body.get('action')
+        if not request_id or not action:
+            raise StubError(400, 'Request ID and action are required')
+        if action not in ('approve', 'reject'):
+            raise StubError(400, 'Invalid action. Use approve or reject')
+        new_status = 'approved' if action == 'approve' else 'rejected'
+        with self.state.lock:
+            request = self.state.module_requests.get(request_id)
+            if not request:
+                raise StubError(404, 'Request not found')
+            request.update(status=new_status, adminMessage=body.get('adminMessage', ''), processedBy=user['id'],
+                           processedAt=_now(), updatedAt=_now())
+            client = self.state.clients.get(request['clientId'])
+            if action == 'approve' and client and request['moduleId'] not in client['modules']:
+                client['modules'].append(request['moduleId'])
+        return 200, {'message': f'Module request {new_status}', 'status': new_status}
+
+    # ---------- webhooks ----------
+
+    def webhook_leads(self, body, **_):
+        body = body or {}
+        client_id = body.get('clientId')
+        if not client_id:
+            raise StubError(400, 'Client ID is required')
+        client = self.state.find_client(client_id)
+        if not client:
+            raise StubError(404, 'Invalid client ID')
+        if client.get('subscriptionStatus') != 'active':
+            raise StubError(403, 'Client subscription is not active')
+        lead_data = body.get('leadData') or {}
+        source = body.get('source') or 'Webhook'
+        lead = self.state.tenants[client_id].create('leads', {
+            'name': lead_data.get('name') or lead_data.get('full_name') or 'Unknown Lead',
+            'email': lead_data.get('email', ''),
+            'phone': lead_data.get('phone') or lead_data.get('phone_number') or '',
+            'source': source,
+            'status': 'new',
+            'value': lead_data.get('budget') or 0,
+            'notes': lead_data.get('message') or lead_data.get('inquiry') or '',
+            'tags': ['webhook', source.lower()],
+        })
+        return 201, {'message': 'Lead received successfully', 'leadId': lead['id'], 'source': source}
+
+    def webhook_clerk(self, **_):
+        raise StubError(400, 'Invalid webhook signature')
+
+    # ---------- reports ----------
+
+    def sales_report(self, user, **_):
+        tenant = self._require_client(user)
+        leads = tenant.all('leads')
+        since = _months_ago(datetime.now(), 6)
+
+        by_status, by_source, monthly = {}, {}, {}
+        funnel = {'total': len(leads), 'contacted': 0, 'qualified': 0, 'proposal': 0, 'won': 0}
+        for lead in leads:
+            value = lead.get('value') or 0
+            status = lead.get('status') or 'unknown'
+            source = lead.get('source') or 'Unknown'
+            entry = by_status.setdefault(status, {'status': status, 'count': 0, 'value': 0})
+            entry['count'] += 1
+            entry['value'] += value
+            entry = by_source.setdefault(source, {'source': source, 'count': 0, 'value': 0})
+            entry['count'] += 1
+            entry['value'] += value
+            created = _parse_date(lead.get('createdAt'))
+            if created and created >= since:
+                month = created.strftime('%Y-%m')
+                entry = monthly.setdefault(month, {'month': month, 'leads': 0, 'value': 0, 'won': 0})
+                entry['leads'] += 1
+                entry['value'] += value
+                entry['won'] += 1 if status == 'won' else 0
+            for stage, statuses in FUNNEL_STAGES.items():
+                if status in statuses:
+                    funnel[stage] += 1
+
+        top = sorted((lead for lead in leads if lead.get('status') == 'won'), key=lambda lead: -(lead.get('value') or 0))[:5]
+        return 200, {
+            'byStatus': list(by_status.values()),
+            'bySource': list(by_source.values()),
+            'monthlyData': [monthly[month] for month in sorted(monthly)],
+            'funnel': funnel,
+            'topLeads': [{'name': lead.get('name'), 'value': lead.get('value'), 'source': lead.get('source')} for lead in top]
+        }
+
+    def expenses_report(self, user, **_):
+        tenant = self._require_client(user)
+        expenses = tenant.all('expenses')
+        since = _months_ago(datetime.now(), 6)
+
+        by_category, monthly, projects = {}, {}, {}
+        approval = {True: {'total': 0, 'count': 0}, False: {'total': 0, 'count': 0}}
+        for expense in expenses:
+            amount = expense.get('amount') or 0
+            category = expense.get('category') or 'Other'
+            entry = by_category.setdefault(category, {'category': category, 'total': 0, 'count': 0})
+            entry['total'] += amount
+            entry['count'] += 1
+            spent = _parse_date(expense.get('date'))
+            if spent and spent >= since:
+                month = spent.strftime('%Y-%m')
+                entry = monthly.setdefault(month, {'month': month, 'total': 0, 'count': 0})
+                entry['total'] += amount
+                entry['count'] += 1
+            if expense.get('approved') in approval:
+                approval[expense['approved']]['total'] += amount
+                approval[expense['approved']]['count'] += 1
+            if expense.get('projectId'):
+                projects[expense['projectId']] = projects.get(expense['projectId'], 0) + amount
+
+        categories = sorted(by_category.values(), key=lambda entry: -entry['total'])
+        recent = sorted(expenses, key=lambda expense: str(expense.get('date') or ''), reverse=True)[:10]
+        return 200, {
+            'summary': {
+                'totalExpenses': sum(entry['total'] for entry in categories),
+                'approvedExpenses': approval[True]['total'],
+                'pendingExpenses': approval[False]['total'],
+                'totalTransactions': sum(entry['count'] for entry in categories)
+            },
+            'byCategory': categories,
+            'monthlyData': [monthly[month] for month in sorted(monthly)],
+            'approvalStats': {'approved': approval[True], 'pending': approval[False]},
+            'projectExpenses': [{'projectId': project_id, 'total': total} for project_id, total in projects.items()],
+            'recentExpenses': [
+                {key: expense.get(key) for key in ('id', 'description', 'amount', 'category', 'date', 'approved')}
+                for expense in recent
+            ]
+        }
+
+    # ---------- users ----------
+
+    def _client_user(self, user, user_id):
+        self._require_client(user)
+        account = self.state.users.get(user_id)
+        if not account or account.get('clientId') != user['clientId']:
+            raise StubError(404, 'User not found')
+        return account
+
+    def list_users(self, user, **_):
+        self._require_client(user)
+        with self.state.lock:
+            return 200, [_public_user(account) for account in self.state.users.values()
+                         if account.get('clientId') == user['clientId']]
+
+    def create_user(self, user, body, **_):
+        self._require_client(user)
+        body = body or {}
+        if not body.get('email') or not body.get('password'):
+            raise StubError(400, 'Email and password are required')
+        with self.state.lock:
+            if body['email'].lower() in self.state.users_by_email:
+                raise StubError(400, 'Email already exists')
+            account = self.state.add_user({
+                'id': str(uuid.uuid4()), 'email': body['email'], 'name': body.get('name', ''),
+                'role': body.get('role', 'sales_rep'), 'clientId': user['clientId'],
+                'password': _hash_password(body['password']), 'createdAt': _now()
+            })
+        return 200, _public_user(account)
+
+    def get_user(self, user, user_id, **_):
+        return 200, _public_user(self._client_user(user, user_id))
+
+    def update_user(self, user, user_id, body, **_):
+        with self.state.lock:
+            account = self._client_user(user, user_id)
+            account.update({key: value for key, value in (body or {}).items() if key in ('name', 'role', 'phone')})
+            return 200, _public_user(account)
+
+    def delete_user(self, user, user_id, **_):
+        with self.state.lock:
+            account = self._client_user(user, user_id)
+            del self.state.users[user_id]
+            self.state.users_by_email.pop(account['email'].lower(), None)
+        return 200, {'message': 'User deleted successfully'}
+
+    # ---------- tenant collections ----------
+
+    def _list(self, name):
+        def handler(user, query, **_):
+            tenant = self._require_client(user)
+            default_limit, paged = LIST_PAGING[name]
+            # parseInt(...) || default, so a missing, zero or non-numeric limit falls back to the default
+            limit = (_parse_int(query.get('limit')) or default_limit) if default_limit else None
+            page = (_parse_int(query.get('page')) or 1) if paged else 1
+            offset = (page - 1) * limit if limit else 0
+            filters = {key: query[key] for key in ('status', 'source', 'category') if query.get(key)}
+            return 200, tenant.page(name, limit, offset, filters)
+        return handler
+
+    def _create(self, name):
+        def handler(user, body, **_):
+            tenant = self._require_client(user)
+            if name == 'leads':
+                return CREATE_STATUS[name], self._create_lead(tenant, user, body or {})
+            return CREATE_STATUS[name], tenant.create(name, body, created_by=user['id'])
+        return handler
+
+    @staticmethod
+    def _create_lead(tenant, user, body):
+        """Store a lead and file its contact as leads/route.js does, answering {lead, contactCreated}"""
+        lead = tenant.create('leads', body, created_by=user['id'])
+        contact = None
+        if body.get('name') or body.get('company') or body.get('email'):
+            email = str(body.get('email') or '').lower() or None
+            existing = email and next((entry for entry in tenant.all('contacts') if entry.get('email') == email), None)
+            if existing:
+                contact_id = existing['id']
+            else:
+                contact = tenant.create('contacts', {
+                    'name': body.get('name') or body.get('company') or 'Unknown',
+                    'email': email,
+                    'phone': body.get('phone'),
+                    'company': body.get('company'),
+                    'type': 'lead',
+                    'status': 'active',
+                    'sourceType': 'lead',
+                    'sourceId': lead['id'],
+                    'leadId': lead['id'],
+                    'tags': ['new-lead', *(body.get('tags') or [])],
+                    'notes': f"Contact auto-created from new lead: {body.get('title') or body.get('name') or 'Untitled'}"
+                }, created_by=user['id'])
+                contact_id = contact['id']
+            lead = tenant.update('leads', lead['id'], {'contactId': contact_id})
+        return {'lead': lead, 'contactCreated': contact}
+
+    def _get(self, name):
+        def handler(user, doc_id, **_):
+            document = self._require_client(user).get(name, doc_id)
+            if document is None:
+                raise StubError(404, f'{name[:-1].capitalize()} not found')
+            return 200, document
+        return handler
+
+    def _update(self, name):
+        def handler(user, doc_id, body, **_):
+            document = self._require_client(user).update(name, doc_id, body)
+            if document is None:
+                raise StubError(404, f'{name[:-1].capitalize()} not found')
+            return 200, document
+        return handler
+
+    def _delete(self, name):
+        def handler(user, doc_id, **_):
+            if not self._require_client(user).delete(name, doc_id):
+                raise StubError(404, f'{name[:-1].capitalize()} not found')
+            return 200, {'message': f'{name[:-1].capitalize()} deleted successfully'}
+        return handler
+
+
+class StubRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Send headers and body in one segment; otherwise delayed ACKs add ~40 ms per response
+    wbufsize = -1
+    disable_nagle_algorithm = True
+    api = None
+    quiet = True
+
+    def _handle(self, method):
+        parts = urlsplit(self.path)
+        path = parts.path
+        if path == '/api' or path.startswith('/api/'):
+            path = path[4:]
+        query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+
+        body = None
+        length = int(self.headers.get('Content-Length') or 0)
+        try:
+            if length:
+                raw = self.rfile.read(length)
+                body = json.loads(raw) if raw.strip() else None
+            if body is not None and not isinstance(body, dict):
+                raise StubError(400, 'Request body must be a JSON object')
+            status, payload = self.api.dispatch(method, path, query, self.headers, body)
+        except StubError as error:
+            status, payload = error.status, {'error': error.message, 'status': error.status, 'timestamp': _now()}
+        except ValueError:
+            status, payload = 400, {'error': 'Invalid JSON body', 'status': 400, 'timestamp': _now()}
+        except Exception as error:
+            # Like the routes' catch blocks: answer 500 instead of dropping the connection
+            status, payload = 500, {'error': 'Internal server error', 'status': 500, 'details': repr(error),
+                                    'timestamp': _now()}
+
+        encoded = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(encoded)))
+        self.end_headers()
+        self.wfile.write(encoded)
+
+    def do_GET(self):
+        self._handle('GET')
+
+    def do_POST(self):
+        self._handle('POST')
+
+    def do_PUT(self):
+        self._handle('PUT')
+
+    def do_DELETE(self):
+        self._handle('DELETE')
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256
+
+
+def start_stub_server(host='127.0.0.1', port=0, login_delay=0.0, quiet=True):
+    """Start the stand-in on a background thread; returns (server, base_url)"""
+    handler = type('BoundStubRequestHandler', (StubRequestHandler,), {
+        'api': StubAPI(StubState(login_delay=login_delay)),
+        'quiet': quiet
+    })
+    server = StubServer((host, port), handler)
+    threading.Thread(target=server.serve_forever, name='buildcrm-stub', daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}/api"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local stand-in for the BuildCRM API")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--login-delay', type=float, default=0.0,
+                        help="Seconds to sleep in login/register, to mimic password hashing cost")
+    parser.add_argument('--verbose', action='store_true', help="Log every request")
+    args = parser.parse_args(argv)
+
+    server, base_url = start_stub_server(args.host, args.port, args.login_delay, quiet=not args.verbose)
+    print(f"🧪 BuildCRM stand-in listening on {base_url}")
+    print(f"   export HARNESS_BASE_URL={base_url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
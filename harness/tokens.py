@@ -0,0 +1,152 @@
+"""
+On-disk cache of login responses and throwaway tenants shared by every harness script
+Tokens are reused across runs and parallel workers until they near expiry, so the bcrypt-bound login runs rarely
+"""
+
+import base64
+import binascii
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to an in-process lock
+    fcntl = None
+
+TOKEN_CACHE = os.environ.get('HARNESS_TOKEN_CACHE', '.harness/tokens.json')
+# Tokens expiring within this many seconds are refreshed before use
+EXPIRY_MARGIN = int(os.environ.get('HARNESS_TOKEN_MARGIN', '300'))
+FRESH_TENANT = os.environ.get('HARNESS_FRESH_TENANT', '') not in ('', '0')
+
+_process_lock = threading.Lock()
+
+
+def private_opener(path, flags):
+    """open() opener for files holding tokens and passwords: created owner-only, never briefly world-readable"""
+    fd = os.open(path, flags, 0o600)
+    # Also tightens a file an older run created with the default umask
+    if hasattr(os, 'fchmod'):
+        os.fchmod(fd, 0o600)
+    return fd
+
+
+def _b64decode(text):
+    text = text.replace('-', '+').replace('_', '/')
+    return base64.b64decode(text + '=' * (-len(text) % 4))
+
+
+def token_expiry(token):
+    """Expiry of a JWT or BuildCRM token as epoch seconds, or None if it cannot be read"""
+    parts = token.split('.')
+    try:
+        payload = json.loads(_b64decode(parts[1] if len(parts) == 3 else token))
+        exp = payload['exp']
+    except (ValueError, KeyError, TypeError, IndexError, binascii.Error):
+        return None
+    # BuildCRM tokens carry exp in milliseconds (Date.now()), JWTs in seconds
+    return exp / 1000 if exp > 1e11 else exp
+
+
+def token_valid(token, margin=EXPIRY_MARGIN):
+    expiry = token_expiry(token) if token else None
+    return expiry is not None and expiry - margin > time.time()
+
+
+class TokenCache:
+    """JSON file of cached entries, read and written under an exclusive file lock"""
+
+    def __init__(self, path=TOKEN_CACHE):
+        self.path = path
+
+    @contextmanager
+    def locked(self):
+        """Yield the cache contents while holding the lock, saving them on exit"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with _process_lock, open(f"{self.path}.lock", 'w') as lock_file:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                entries = self._read()
+                before = json.dumps(entries, sort_keys=True)
+                yield entries
+                if json.dumps(entries, sort_keys=True) != before:
+                    self._write(entries)
+            finally:
+                if fcntl:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read(self):
+        try:
+            with open(self.path) as handle:
+                return json.load(handle)
+        except (OSError, ValueError):
+            return {}
+
+    def _write(self, entries):
+        temporary = f"{self.path}.tmp"
+        with open(temporary, 'w', opener=private_opener) as handle:
+            json.dump(entries, handle, indent=2)
+        os.replace(temporary, self.path)
+
+    def clear(self):
+        with self.locked() as entries:
+            entries.clear()
+
+
+def _key(base_url, name):
+    return f"{base_url.rstrip('/')} {name}"
+
+
+def cached_login(make_request, base_url, email, password, cache=None):
+    """Login response for email, reusing a cached token while it is valid
+
+    Returns (data, response): data is None when the login failed, response is None when served from the cache.
+    """
+    cache = cache or TokenCache()
+    key = _key(base_url, f"login:{email.lower()}")
+    with cache.locked() as entries:
+        entry = entries.get(key)
+        if entry and token_valid(entry.get('token')):
+            return entry, None
+        response = make_request('POST', '/auth/login', {"email": email, "password": password})
+        if not response or response.status_code != 200:
+            entries.pop(key, None)
+            return None, response
+        data = response.json()
+        entries[key] = data
+        return data, response
+
+
+def cached_tenant(make_request, base_url, name, register_data, fresh=None, cache=None):
+    """Throwaway client tenant for a suite, registered only when none is cached or fresh is requested
+
+    register_data is called with no arguments to build the /auth/register body when a new tenant is needed.
+    Returns (tenant, response, reused); tenant holds email, password, token, user and client.
+    """
+    fresh = FRESH_TENANT if fresh is None else fresh
+    cache = cache or TokenCache()
+    key = _key(base_url, f"tenant:{name}")
+    with cache.locked() as entries:
+        tenant = entries.get(key)
+        if tenant and not fresh:
+            if token_valid(tenant.get('token')):
+                return tenant, None, True
+            response = make_request('POST', '/auth/login', {"email": tenant['email'], "password": tenant['password']})
+            if response and response.status_code == 200:
+                tenant.update(response.json())
+                return tenant, response, True
+
+        body = register_data()
+        response = make_request('POST', '/auth/register', body)
+        if not response or response.status_code != 200:
+            return None, response, False
+        tenant = dict(response.json(), email=body['email'], password=body['password'],
+                      businessName=body['businessName'])
+        if 'token' in tenant and 'client' in tenant:
+            entries[key] = tenant
+        return tenant, response, False
@@ -0,0 +1,182 @@
+"""
+Webhook ingestion throughput and dedup benchmark for /webhook/leads
+Posts a rate-controlled burst of campaign leads across many clientIds, then checks every accepted leadId
+exists exactly once with one streaming pass over each tenant's GET /leads
+
+Requires aiohttp (pip install aiohttp).
+
+Usage:
+    python -m harness.webhook_burst --leads 50000 --clients 100 --rps 500 --concurrency 200
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from harness.config import BASE_URL
+from harness.ledger import ResourceLedger, print_teardown_summary, teardown
+from harness.listing import PAGE_SIZE, ListReadError, iter_records
+from harness.load import REQUEST_TIMEOUT, LoadContext, RateLimiter
+from harness.seeder import register_tenant
+
+# Sources the marketing integrations push through the webhook
+SOURCES = ['IndiaMART', 'JustDial', 'Meta Ads', 'Google Ads', 'Website']
+ACCEPTED_STATUSES = (200, 201)
+
+
+def webhook_payload(run_id, tenant, sequence):
+    return {
+        "clientId": tenant['client_id'],
+        "source": SOURCES[sequence % len(SOURCES)],
+        "leadData": {
+            "name": f"Burst Lead {sequence}",
+            "email": f"burst{run_id}-{sequence}@example.com",
+            "phone": f"+91 9{sequence % 1000000000:09d}",
+            "message": "Campaign enquiry"
+        }
+    }
+
+
+async def post_burst(base_url, tenants, leads, rps=None, concurrency=100, run_id=0):
+    """Post leads round-robin across tenants, returning (stats summary, accepted ids per client)"""
+    try:
+        import aiohttp
+    except ImportError:
+        raise SystemExit("Webhook burst mode needs aiohttp: pip install aiohttp")
+
+    accepted = {tenant['client_id']: [] for tenant in tenants}
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as http:
+        ctx = LoadContext(http, base_url, RateLimiter(rps), concurrency, float('inf'),
+                          (aiohttp.ClientError, asyncio.TimeoutError))
+
+        async def worker():
+            while True:
+                sequence = next(ctx.sequence)
+                if sequence >= leads:
+                    return
+                tenant = tenants[sequence % len(tenants)]
+                status, result = await ctx.request('POST', '/webhook/leads', webhook_payload(run_id, tenant, sequence))
+                if status in ACCEPTED_STATUSES and result and 'leadId' in result:
+                    accepted[tenant['client_id']].append(result['leadId'])
+
+        await asyncio.gather(*(worker() for _ in range(min(concurrency, leads) or 1)))
+        ctx.stats.finished = time.monotonic()
+
+    return ctx.stats.summary(), accepted
+
+
+def verify_tenant(base_url, tenant, lead_ids):
+    """One streaming pass over the tenant's leads, counting how often each accepted id appears"""
+    expected = set(lead_ids)
+    seen = dict.fromkeys(expected, 0)
+    # A page larger than the burst keeps deployments without offset support to one complete page
+    page_size = max(PAGE_SIZE, len(expected) + 1)
+    try:
+        for lead in iter_records(base_url, '/leads', tenant['token'], page_size=page_size):
+            lead_id = lead.get('id') if isinstance(lead, dict) else None
+            if lead_id in seen:
+                seen[lead_id] += 1
+    except ListReadError as e:
+        return {'client_id': tenant['client_id'], 'error': str(e), 'missing': len(expected), 'duplicates': 0}
+    return {
+        'client_id': tenant['client_id'],
+        'missing': sum(1 for count in seen.values() if count == 0),
+        'duplicates': sum(1 for count in seen.values() if count > 1)
+    }
+
+
+def run_burst(base_url=BASE_URL, leads=1000, clients=10, rps=None, concurrency=100, workers=16, cleanup=True):
+    from harness.session import bind_requests
+
+    make_request = bind_requests(base_url)
+    ledger = ResourceLedger()
+    run_id = int(time.time())
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        tenants = [tenant for tenant in executor.map(
+            lambda index: register_tenant(make_request, run_id, index, prefix='burst'), range(clients))
+            if tenant]
+    if not tenants:
+        raise SystemExit("No burst tenants could be registered")
+    for tenant in tenants:
+        ledger.record(base_url, 'clients', tenant['client_id'], token=tenant['token'],
+                      email=tenant['email'], password=tenant['password'])
+
+    stats, accepted = asyncio.run(post_burst(base_url, tenants, leads, rps, concurrency, run_id))
+    for tenant in tenants:
+        ledger.record_many(base_url, 'leads', accepted[tenant['client_id']], token=tenant['token'],
+                           owner=tenant['client_id'])
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        checks = list(executor.map(lambda tenant: verify_tenant(base_url, tenant, accepted[tenant['client_id']]),
+                                   tenants))
+
+    route = stats['routes'].get('POST /webhook/leads', {})
+    total_accepted = sum(len(ids) for ids in accepted.values())
+    report = {
+        'clients': len(tenants),
+        'posted': stats['requests'],
+        'accepted': total_accepted,
+        'seconds': stats['duration'],
+        'accepted_per_second': total_accepted / stats['duration'] if stats['duration'] else 0.0,
+        'error_rate': stats['error_rate'],
+        'statuses': route.get('statuses', {}),
+        'latency': {key: route.get(key, 0.0) for key in ('p50', 'p90', 'p95', 'p99', 'max', 'mean')},
+        'missing': sum(check['missing'] for check in checks),
+        'duplicates': sum(check['duplicates'] for check in checks),
+        'unverified_clients': [check['client_id'] for check in checks if 'error' in check]
+    }
+    if cleanup:
+        report['teardown'] = teardown(make_request, base_url, ledger, workers)
+    return report
+
+
+def print_burst_report(report):
+    print("=" * 60)
+    print("📨 WEBHOOK BURST")
+    print("=" * 60)
+    print(f"Posted {report['posted']} leads across {report['clients']} clients in {report['seconds']:.1f}s")
+    print(f"Accepted: {report['accepted']} ({report['accepted_per_second']:.1f}/s), "
+          f"error rate {report['error_rate'] * 100:.2f}%, statuses {report['statuses']}")
+    latency = report['latency']
+    print(f"Latency ms: p50 {latency['p50']:.1f}  p90 {latency['p90']:.1f}  p95 {latency['p95']:.1f}  "
+          f"p99 {latency['p99']:.1f}  max {latency['max']:.1f}")
+    if report['unverified_clients']:
+        print(f"⚠️  Could not list leads for {len(report['unverified_clients'])} clients")
+    if 'teardown' in report:
+        print_teardown_summary(report['teardown'])
+    if report['missing'] or report['duplicates']:
+        print(f"❌ {report['missing']} accepted leads missing from GET /leads, {report['duplicates']} duplicated")
+    else:
+        print("🎉 Every accepted lead is listed exactly once.")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark /webhook/leads ingestion and verify no lead is lost or doubled")
+    parser.add_argument('--base-url', default=BASE_URL)
+    parser.add_argument('--leads', type=int, default=1000, help="Webhook posts in the burst")
+    parser.add_argument('--clients', type=int, default=10, help="Tenants (clientIds) the burst is spread over")
+    parser.add_argument('--rps', type=float, default=None, help="Target posts/second (default: unthrottled)")
+    parser.add_argument('--concurrency', type=int, default=100, help="Cap on posts in flight")
+    parser.add_argument('--workers', type=int, default=16, help="Threads for registration, verification and teardown")
+    parser.add_argument('--no-teardown', action='store_true', help="Leave the burst tenants and leads in place")
+    parser.add_argument('--json', metavar='PATH', help="Also write the report to PATH as JSON")
+    args = parser.parse_args(argv)
+
+    report = run_burst(args.base_url, args.leads, args.clients, args.rps, args.concurrency, args.workers,
+                       cleanup=not args.no_teardown)
+    print_burst_report(report)
+    if args.json:
+        with open(args.json, 'w') as handle:
+            json.dump(report, handle, indent=2)
+    return 1 if report['missing'] or report['duplicates'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,37 +4,63 @@ Comprehensive Testing for BuildCRM Modular API Routes
 Tests the new modular API structure after refactoring
 """
 
+import argparse
+import sys
+import threading
 import requests
 import json
 import uuid
 from datetime import datetime, timedelta
 import time
 
-# Configuration
-BASE_URL = "https://expense-fix.preview.emergentagent.com/api"
-SUPER_ADMIN_EMAIL = "admin@buildcrm.com"
-SUPER_ADMIN_PASSWORD = "admin123"
-DEMO_CLIENT_EMAIL = "demo@example.com"
-DEMO_CLIENT_PASSWORD = "demo123"
+from harness.baseline import add_baseline_arguments, handle_baseline_options
+from harness.cassette import add_cassette_arguments, close_cassette, install_cassette
+from harness.config import (BASE_URL, DEMO_CLIENT_EMAIL, DEMO_CLIENT_PASSWORD, SUPER_ADMIN_EMAIL,
+                            SUPER_ADMIN_PASSWORD)
+from harness.ledger import ResourceLedger, print_teardown_summary, teardown
+from harness.listing import ListReadError, count_records
+from harness.results import add_result_arguments, get_result_sink, handle_result_options
+from harness.schemas import validate
+from harness.session import get_session, print_connection_summary, print_latency_report
+from harness.tokens import cached_login, cached_tenant
+
+# Every category except the public one needs the tokens test_auth_endpoints logs in for
+TEST_DEPENDENCIES = {
+    name: ['auth_endpoints'] for name in (
+        'super_admin_endpoints', 'module_request_workflow', 'client_endpoints', 'white_label_access',
+        'webhook_endpoints', 'crud_sample', 'reports'
+    )
+}
 
 class ModularAPITester:
-    def __init__(self):
-        self.base_url = BASE_URL
+    def __init__(self, base_url=BASE_URL, fresh_tenant=None, tenant_name='modular'):
+        self.base_url = base_url
+        self.session = get_session()
+        self.fresh_tenant = fresh_tenant
+        # Cache key of the throwaway client tenant; sharded workers each get their own
+        self.tenant_name = tenant_name
+        self.results = get_result_sink('modular')
         self.super_admin_token = None
         self.client_token = None
         self.demo_client_token = None
         self.test_client_id = None
         self.test_module_request_id = None
+        self.ledger = ResourceLedger()
+        # Failed log_test records per thread, which decide the checks that return nothing
+        self.failures = threading.local()
         
     def log_test(self, test_name, success, message="", response_data=None):
-        """Log test results with detailed information"""
-        status = "✅ PASS" if success else "❌ FAIL"
-        print(f"{status} {test_name}")
-        if message:
-            print(f"   {message}")
-        if not success and response_data:
-            print(f"   Response: {response_data}")
-        print()
+        """Log test results with detailed information, attaching the request that preceded them"""
+        request = self.session.take_last_request() or {}
+        self.results.record(test_name, success, message, response=response_data, suite='modular', **request)
+        if not success:
+            self.failures.count = getattr(self.failures, 'count', 0) + 1
+        
+    def run_test(self, test):
+        """Run one check: its own verdict when it returns one, otherwise whether it logged no failure"""
+        failures = getattr(self.failures, 'count', 0)
+        result = test()
+        return getattr(self.failures, 'count', 0) == failures if result is None else bool(result)
         
     def make_request(self, method, endpoint, data=None, token=None, expected_status=200):
         """Make HTTP request with proper error handling"""
@@ -45,16 +71,9 @@ class ModularAPITester:
             headers['Authorization'] = f'Bearer {token}'
             
         try:
-            if method == 'GET':
-                response = requests.get(url, headers=headers, timeout=30)
-            elif method == 'POST':
-                response = requests.post(url, headers=headers, json=data, timeout=30)
-            elif method == 'PUT':
-                response = requests.put(url, headers=headers, json=data, timeout=30)
-            elif method == 'DELETE':
-                response = requests.delete(url, headers=headers, timeout=30)
-            else:
+            if method not in ('GET', 'POST', 'PUT', 'DELETE'):
                 raise ValueError(f"Unsupported method: {method}")
+            response = self.session.request(method, url, headers=headers, json=data)
                 
             return response
             
@@ -73,11 +92,12 @@ class ModularAPITester:
         response = self.make_request('GET', '/health')
         if response and response.status_code == 200:
             data = response.json()
-            if 'status' in data and 'features' in data:
+            error = validate('GET /health', data)
+            if not error:
                 self.log_test("Health Check", True, f"API Status: {data.get('status')}, Features: {len(data.get('features', []))}")
                 success_count += 1
             else:
-                self.log_test("Health Check", False, "Missing required fields in health response")
+                self.log_test("Health Check", False, f"Missing required fields in health response: {error}")
         else:
             self.log_test("Health Check", False, "Health endpoint failed")
             
@@ -85,7 +105,7 @@ class ModularAPITester:
         response = self.make_request('GET', '/plans')
         if response and response.status_code == 200:
             plans = response.json()
-            if isinstance(plans, list) and len(plans) > 0:
+            if not validate('GET /plans', plans):
                 self.log_test("Get Subscription Plans", True, f"Found {len(plans)} plans")
                 success_count += 1
             else:
@@ -97,7 +117,7 @@ class ModularAPITester:
         response = self.make_request('GET', '/modules/public')
         if response and response.status_code == 200:
             modules = response.json()
-            if isinstance(modules, list):
+            if not validate('GET /modules/public', modules):
                 self.log_test("Get Public Modules", True, f"Found {len(modules)} public modules")
                 success_count += 1
             else:
@@ -109,7 +129,7 @@ class ModularAPITester:
         response = self.make_request('GET', '/modules-public')
         if response and response.status_code == 200:
             modules = response.json()
-            if isinstance(modules, list):
+            if not validate('GET /modules-public', modules):
                 self.log_test("Get Modules Public (Alternative)", True, f"Found {len(modules)} modules")
                 success_count += 1
             else:
@@ -127,15 +147,9 @@ class ModularAPITester:
         total_tests = 4
         
         # Test super admin login
-        login_data = {
-            "email": SUPER_ADMIN_EMAIL,
-            "password": SUPER_ADMIN_PASSWORD
-        }
-        
-        response = self.make_request('POST', '/auth/login', login_data)
-        if response and response.status_code == 200:
-            data = response.json()
-            if 'token' in data and data['user']['role'] == 'super_admin':
+        data, response = cached_login(self.make_request, self.base_url, SUPER_ADMIN_EMAIL, SUPER_ADMIN_PASSWORD)
+        if data:
+            if not validate('POST /auth/login', data) and data['user']['role'] == 'super_admin':
                 self.super_admin_token = data['token']
                 self.log_test("Super Admin Login", True, f"Logged in as {data['user']['email']}")
                 success_count += 1
@@ -152,15 +166,9 @@ class ModularAPITester:
             self.log_test("Super Admin Login", False, error_msg)
             
         # Test demo client login
-        demo_login_data = {
-            "email": DEMO_CLIENT_EMAIL,
-            "password": DEMO_CLIENT_PASSWORD
-        }
-        
-        response = self.make_request('POST', '/auth/login', demo_login_data)
-        if response and response.status_code == 200:
-            data = response.json()
-            if 'token' in data and 'client' in data:
+        data, response = cached_login(self.make_request, self.base_url, DEMO_CLIENT_EMAIL, DEMO_CLIENT_PASSWORD)
+        if data:
+            if not validate('POST /auth/login', data) and 'client' in data:
                 self.demo_client_token = data['token']
                 self.log_test("Demo Client Login", True, f"Logged in as {data['user']['email']}")
                 success_count += 1
@@ -170,22 +178,27 @@ class ModularAPITester:
             self.log_test("Demo Client Login", False, "Demo client login failed")
             
         # Test client registration
-        timestamp = int(time.time())
-        register_data = {
-            "businessName": f"Test Modular Co {timestamp}",
-            "email": f"modular{timestamp}@buildcrm.com",
-            "password": "testpass123",
-            "phone": "+91 9876543210",
-            "planId": "basic"
-        }
+        def register_data():
+            timestamp = int(time.time())
+            return {
+                "businessName": f"Test Modular Co {timestamp}",
+                "email": f"{self.tenant_name}{timestamp}@buildcrm.com",
+                "password": "testpass123",
+                "phone": "+91 9876543210",
+                "planId": "basic"
+            }
         
-        response = self.make_request('POST', '/auth/register', register_data)
-        if response and response.status_code == 200:
-            data = response.json()
+        data, response, reused = cached_tenant(self.make_request, self.base_url, self.tenant_name, register_data,
+                                               fresh=self.fresh_tenant)
+        if data:
             if 'token' in data and 'client' in data:
                 self.client_token = data['token']
                 self.test_client_id = data['client']['id']
-                self.log_test("Client Registration", True, f"Registered {register_data['businessName']}")
+                action = "Reusing cached tenant" if reused else "Registered"
+                if not reused:
+                    self.ledger.record(self.base_url, 'clients', self.test_client_id, token=self.client_token,
+                                       email=data['email'], password=data['password'])
+                self.log_test("Client Registration", True, f"{action} {data['businessName']}")
                 success_count += 1
             else:
                 self.log_test("Client Registration", False, "Invalid registration response")
@@ -197,7 +210,7 @@ class ModularAPITester:
             response = self.make_request('GET', '/auth/me', token=self.client_token)
             if response and response.status_code == 200:
                 data = response.json()
-                if 'user' in data and 'client' in data:
+                if not validate('GET /auth/me', data):
                     self.log_test("Auth Me Endpoint", True, f"Retrieved user: {data['user']['email']}")
                     success_count += 1
                 else:
@@ -221,19 +234,14 @@ class ModularAPITester:
         response = self.make_request('GET', '/admin/stats', token=self.super_admin_token)
         if response and response.status_code == 200:
             stats = response.json()
-            required_fields = ['overview', 'charts']
-            overview_fields = ['totalClients', 'activeClients', 'totalUsers', 'monthlyRevenue']
-            chart_fields = ['monthlyGrowth', 'planDistribution']
-            
-            if (all(field in stats for field in required_fields) and
-                all(field in stats['overview'] for field in overview_fields) and
-                all(field in stats['charts'] for field in chart_fields)):
+            error = validate('GET /admin/stats', stats)
+            if not error:
                 self.log_test("Admin Stats with Charts", True, 
                             f"Total Clients: {stats['overview']['totalClients']}, "
                             f"Revenue: ₹{stats['overview']['monthlyRevenue']}, "
                             f"Chart Data: {len(stats['charts']['monthlyGrowth'])} months")
             else:
-                self.log_test("Admin Stats with Charts", False, "Missing required fields in stats")
+                self.log_test("Admin Stats with Charts", False, f"Missing required fields in stats: {error}")
         else:
             self.log_test("Admin Stats with Charts", False, "Failed to get admin stats")
             
@@ -241,7 +249,7 @@ class ModularAPITester:
         response = self.make_request('GET', '/admin/clients', token=self.super_admin_token)
         if response and response.status_code == 200:
             clients = response.json()
-            if isinstance(clients, list):
+            if not validate('GET /admin/clients', clients):
                 self.log_test("Admin Get All Clients", True, f"Found {len(clients)} clients")
             else:
                 self.log_test("Admin Get All Clients", False, "Invalid clients response")
@@ -253,7 +261,7 @@ class ModularAPITester:
             response = self.make_request('GET', f'/admin/clients/{self.test_client_id}', token=self.super_admin_token)
             if response and response.status_code == 200:
                 client = response.json()
-                if 'businessName' in client:
+                if not validate('GET /admin/clients/{id}', client):
                     self.log_test("Admin Get Client Details", True, f"Retrieved client: {client['businessName']}")
                 else:
                     self.log_test("Admin Get Client Details", False, "Invalid client details response")
@@ -264,7 +272,7 @@ class ModularAPITester:
         response = self.make_request('GET', '/admin/modules', token=self.super_admin_token)
         if response and response.status_code == 200:
             modules = response.json()
-            if isinstance(modules, list):
+            if not validate('GET /admin/modules', modules):
                 self.log_test("Admin Get All Modules", True, f"Found {len(modules)} modules")
             else:
                 self.log_test("Admin Get All Modules", False, "Invalid modules response")
@@ -288,8 +296,9 @@ class ModularAPITester:
         response = self.make_request('POST', '/module-requests', request_data, token=self.client_token)
         if response and response.status_code == 201:
             data = response.json()
-            if 'request' in data and 'id' in data['request']:
+            if not validate('POST /module-requests', data):
                 self.test_module_request_id = data['request']['id']
+                self.ledger.record(self.base_url, 'module_requests', self.test_module_request_id)
                 self.log_test("Create Module Request", True, f"Created request: {self.test_module_request_id}")
             else:
                 self.log_test("Create Module Request", False, "Invalid create request response")
@@ -302,7 +311,7 @@ class ModularAPITester:
         response = self.make_request('GET', '/module-requests', token=self.client_token)
         if response and response.status_code == 200:
             requests_list = response.json()
-            if isinstance(requests_list, list) and len(requests_list) > 0:
+            if not validate('GET /module-requests', requests_list) and len(requests_list) > 0:
                 self.log_test("Get Module Requests (Client)", True, f"Found {len(requests_list)} requests")
             else:
                 self.log_test("Get Module Requests (Client)", False, "No requests found for client")
@@ -313,7 +322,7 @@ class ModularAPITester:
         response = self.make_request('GET', '/module-requests', token=self.super_admin_token)
         if response and response.status_code == 200:
             requests_list = response.json()
-            if isinstance(requests_list, list):
+            if not validate('GET /module-requests', requests_list):
                 self.log_test("Get Module Requests (Admin)", True, f"Admin sees {len(requests_list)} total requests")
             else:
                 self.log_test("Get Module Requests (Admin)", False, "Invalid admin requests response")
@@ -332,6 +341,8 @@ class ModularAPITester:
             if response and response.status_code == 200:
                 data = response.json()
                 if data.get('status') == 'approved':
+                    self.ledger.release(self.base_url, 'module_requests', self.test_module_request_id)
+                    self.ledger.record(self.base_url, 'client_modules', f"{self.test_client_id}/{request_data['moduleId']}")
                     self.log_test("Approve Module Request", True, "Request approved successfully")
                 else:
                     self.log_test("Approve Module Request", False, "Invalid approval response")
@@ -350,12 +361,12 @@ class ModularAPITester:
         response = self.make_request('GET', '/client/stats', token=self.client_token)
         if response and response.status_code == 200:
             stats = response.json()
-            required_fields = ['totalLeads', 'totalProjects', 'totalTasks', 'totalExpenses']
-            if all(field in stats for field in required_fields):
+            error = validate('GET /client/stats', stats)
+            if not error:
                 self.log_test("Client Dashboard Stats", True, 
                             f"Leads: {stats['totalLeads']}, Projects: {stats['totalProjects']}")
             else:
-                self.log_test("Client Dashboard Stats", False, "Missing required fields in client stats")
+                self.log_test("Client Dashboard Stats", False, f"Missing required fields in client stats: {error}")
         else:
             self.log_test("Client Dashboard Stats", False, "Failed to get client stats")
             
@@ -363,7 +374,7 @@ class ModularAPITester:
         response = self.make_request('GET', '/client/modules', token=self.client_token)
         if response and response.status_code == 200:
             modules = response.json()
-            if isinstance(modules, list):
+            if not validate('GET /client/modules', modules):
                 self.log_test("Client Get Modules", True, f"Found {len(modules)} available modules")
             else:
                 self.log_test("Client Get Modules", False, "Invalid client modules response")
@@ -380,7 +391,7 @@ class ModularAPITester:
             
         # Test white label GET (should fail for non-Enterprise clients)
         response = self.make_request('GET', '/whitelabel', token=self.client_token)
-        if response and response.status_code == 403:
+        if response is not None and response.status_code == 403:
             data = response.json()
             if 'Enterprise' in data.get('message', ''):
                 self.log_test("White Label Access Control (GET)", True, "Correctly blocked non-Enterprise client")
@@ -399,7 +410,7 @@ class ModularAPITester:
         }
         
         response = self.make_request('PUT', '/whitelabel', update_data, token=self.client_token)
-        if response and response.status_code == 403:
+        if response is not None and response.status_code == 403:
             data = response.json()
             if 'Enterprise' in data.get('message', ''):
                 self.log_test("White Label Access Control (PUT)", True, "Correctly blocked non-Enterprise client")
@@ -432,9 +443,11 @@ class ModularAPITester:
         }
         
         response = self.make_request('POST', '/webhook/leads', webhook_data)
-        if response and response.status_code == 200:
+        if response and response.status_code in (200, 201):  # the live route answers 201 Created
             result = response.json()
             if 'leadId' in result:
+                self.ledger.record(self.base_url, 'leads', result['leadId'], token=self.client_token,
+                                   owner=self.test_client_id)
                 self.log_test("Webhook Leads Endpoint", True, f"Lead created via webhook: {result['leadId']}")
             else:
                 self.log_test("Webhook Leads Endpoint", False, "Invalid webhook response")
@@ -451,7 +464,7 @@ class ModularAPITester:
         }
         
         response = self.make_request('POST', '/webhook/clerk', clerk_data)
-        if response and (response.status_code == 200 or response.status_code == 400):
+        if response is not None and response.status_code in (200, 400):
             # 400 is acceptable for invalid webhook signature
             self.log_test("Webhook Clerk Endpoint", True, "Clerk webhook endpoint accessible")
         else:
@@ -466,37 +479,25 @@ class ModularAPITester:
             return
             
         # Test leads endpoint
-        response = self.make_request('GET', '/leads', token=self.client_token)
-        if response and response.status_code == 200:
-            leads = response.json()
-            if isinstance(leads, list):
-                self.log_test("Leads CRUD (GET)", True, f"Found {len(leads)} leads")
-            else:
-                self.log_test("Leads CRUD (GET)", False, "Invalid leads response")
-        else:
-            self.log_test("Leads CRUD (GET)", False, "Failed to get leads")
+        try:
+            leads_count = count_records(self.base_url, '/leads', token=self.client_token, session=self.session)
+            self.log_test("Leads CRUD (GET)", True, f"Found {leads_count} leads")
+        except ListReadError as e:
+            self.log_test("Leads CRUD (GET)", False, f"Failed to get leads: {e}")
             
         # Test projects endpoint
-        response = self.make_request('GET', '/projects', token=self.client_token)
-        if response and response.status_code == 200:
-            projects = response.json()
-            if isinstance(projects, list):
-                self.log_test("Projects CRUD (GET)", True, f"Found {len(projects)} projects")
-            else:
-                self.log_test("Projects CRUD (GET)", False, "Invalid projects response")
-        else:
-            self.log_test("Projects CRUD (GET)", False, "Failed to get projects")
+        try:
+            projects_count = count_records(self.base_url, '/projects', token=self.client_token, session=self.session)
+            self.log_test("Projects CRUD (GET)", True, f"Found {projects_count} projects")
+        except ListReadError as e:
+            self.log_test("Projects CRUD (GET)", False, f"Failed to get projects: {e}")
             
         # Test tasks endpoint
-        response = self.make_request('GET', '/tasks', token=self.client_token)
-        if response and response.status_code == 200:
-            tasks = response.json()
-            if isinstance(tasks, list):
-                self.log_test("Tasks CRUD (GET)", True, f"Found {len(tasks)} tasks")
-            else:
-                self.log_test("Tasks CRUD (GET)", False, "Invalid tasks response")
-        else:
-            self.log_test("Tasks CRUD (GET)", False, "Failed to get tasks")
+        try:
+            tasks_count = count_records(self.base_url, '/tasks', token=self.client_token, session=self.session)
+            self.log_test("Tasks CRUD (GET)", True, f"Found {tasks_count} tasks")
+        except ListReadError as e:
+            self.log_test("Tasks CRUD (GET)", False, f"Failed to get tasks: {e}")
 
     def test_reports_endpoints(self):
         """Test reports endpoints"""
@@ -510,11 +511,11 @@ class ModularAPITester:
         response = self.make_request('GET', '/reports/sales', token=self.client_token)
         if response and response.status_code == 200:
             report = response.json()
-            required_fields = ['byStatus', 'bySource', 'monthlyData']
-            if all(field in report for field in required_fields):
+            error = validate('GET /reports/sales', report)
+            if not error:
                 self.log_test("Sales Report", True, f"Generated sales report with {len(report['monthlyData'])} months")
             else:
-                self.log_test("Sales Report", False, "Missing required fields in sales report")
+                self.log_test("Sales Report", False, f"Missing required fields in sales report: {error}")
         else:
             self.log_test("Sales Report", False, "Failed to get sales report")
             
@@ -522,31 +523,39 @@ class ModularAPITester:
         response = self.make_request('GET', '/reports/expenses', token=self.client_token)
         if response and response.status_code == 200:
             report = response.json()
-            required_fields = ['byCategory', 'monthlyData']
-            if all(field in report for field in required_fields):
+            error = validate('GET /reports/expenses', report)
+            if not error:
                 self.log_test("Expenses Report", True, f"Generated expenses report with {len(report['monthlyData'])} months")
             else:
-                self.log_test("Expenses Report", False, "Missing required fields in expenses report")
+                self.log_test("Expenses Report", False, f"Missing required fields in expenses report: {error}")
         else:
             self.log_test("Expenses Report", False, "Failed to get expenses report")
 
-    def run_modular_tests(self):
+    def test_plan(self):
+        """(name, test) pairs for the modular structure, in run order"""
+        return [
+            ('public_endpoints', self.test_public_endpoints),
+            ('auth_endpoints', self.test_auth_endpoints),
+            ('super_admin_endpoints', self.test_super_admin_endpoints),
+            ('module_request_workflow', self.test_module_request_workflow),
+            ('client_endpoints', self.test_client_endpoints),
+            ('white_label_access', self.test_white_label_access_control),
+            ('webhook_endpoints', self.test_webhook_endpoints),
+            ('crud_sample', self.test_crud_endpoints_sample),
+            ('reports', self.test_reports_endpoints),
+        ]
+
+    def run_modular_tests(self, latency_json=None, cleanup=True):
         """Run comprehensive test suite for modular API structure"""
         print("🚀 STARTING BUILDCRM MODULAR API TESTING")
         print("=" * 60)
         
-        test_results = {}
-        
         # Test new modular structure
-        test_results['public_endpoints'] = self.test_public_endpoints()
-        test_results['auth_endpoints'] = self.test_auth_endpoints()
-        test_results['super_admin_endpoints'] = self.test_super_admin_endpoints()
-        test_results['module_request_workflow'] = self.test_module_request_workflow()
-        test_results['client_endpoints'] = self.test_client_endpoints()
-        test_results['white_label_access'] = self.test_white_label_access_control()
-        test_results['webhook_endpoints'] = self.test_webhook_endpoints()
-        test_results['crud_sample'] = self.test_crud_endpoints_sample()
-        test_results['reports'] = self.test_reports_endpoints()
+        test_results = {name: self.run_test(test) for name, test in self.test_plan()}
+        
+        if cleanup:
+            print("=== TEARDOWN ===")
+            print_teardown_summary(teardown(self.make_request, self.base_url, self.ledger))
         
         # Summary
         print("=" * 60)
@@ -561,6 +570,8 @@ class ModularAPITester:
             print(f"{status} {test_name.replace('_', ' ').title()}")
             
         print(f"\nOverall Result: {passed}/{total} test categories passed")
+        print_connection_summary()
+        print_latency_report(json_path=latency_json)
         
         if passed == total:
             print("🎉 ALL MODULAR API TESTS PASSED! New API structure is working correctly.")
@@ -569,6 +580,32 @@ class ModularAPITester:
             
         return test_results
 
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="BuildCRM modular API tests")
+    parser.add_argument('--base-url', default=BASE_URL,
+                        help="API root to test (default: HARNESS_BASE_URL or the preview host)")
+    parser.add_argument('--latency-json', metavar='PATH',
+                        help="Also write per-route latency percentiles to PATH as JSON")
+    parser.add_argument('--fresh-tenant', action='store_true', default=None,
+                        help="Register a new test client instead of reusing the cached one")
+    parser.add_argument('--no-teardown', action='store_true',
+                        help="Leave created resources in place (they stay in the ledger for a later teardown)")
+    add_baseline_arguments(parser)
+    add_cassette_arguments(parser)
+    add_result_arguments(parser)
+    args = parser.parse_args(argv)
+    results_sink = handle_result_options(args, 'modular')
+    install_cassette(args, get_session())
+    
+    tester = ModularAPITester(base_url=args.base_url, fresh_tenant=args.fresh_tenant)
+    results = tester.run_modular_tests(latency_json=args.latency_json, cleanup=not args.no_teardown)
+    close_cassette(get_session())
+    results_sink.close()
+    
+    # Record or gate the baseline whether or not the tests passed
+    baseline_ok = handle_baseline_options(args, tester.session.latency, 'modular')
+    return 0 if baseline_ok and all(results.values()) else 1
+
+
 if __name__ == "__main__":
-    tester = ModularAPITester()
-    results = tester.run_modular_tests()
\ No newline at end of file
+    sys.exit(main())
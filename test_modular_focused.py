@@ -4,22 +4,19 @@ Focused Testing for BuildCRM Modular API Routes
 Tests the key new modular API endpoints
 """
 
-import requests
 import json
 import time
 
-# Configuration
-BASE_URL = "https://expense-fix.preview.emergentagent.com/api"
-SUPER_ADMIN_EMAIL = "admin@buildcrm.com"
-SUPER_ADMIN_PASSWORD = "admin123"
+from harness.config import BASE_URL, SUPER_ADMIN_EMAIL, SUPER_ADMIN_PASSWORD
+from harness.ledger import ResourceLedger, print_teardown_summary, teardown
+from harness.results import get_result_sink
+from harness.session import get_session, print_connection_summary, print_latency_report
+from harness.tokens import cached_login, cached_tenant
 
 def log_test(test_name, success, message=""):
-    """Log test results"""
-    status = "✅ PASS" if success else "❌ FAIL"
-    print(f"{status} {test_name}")
-    if message:
-        print(f"   {message}")
-    print()
+    """Log test results to the shared result sink"""
+    request = get_session().take_last_request() or {}
+    get_result_sink('focused').record(test_name, success, message, suite='focused', **request)
 
 def make_request(method, endpoint, data=None, token=None):
     """Make HTTP request"""
@@ -30,14 +27,9 @@ def make_request(method, endpoint, data=None, token=None):
         headers['Authorization'] = f'Bearer {token}'
         
     try:
-        if method == 'GET':
-            response = requests.get(url, headers=headers, timeout=30)
-        elif method == 'POST':
-            response = requests.post(url, headers=headers, json=data, timeout=30)
-        elif method == 'PUT':
-            response = requests.put(url, headers=headers, json=data, timeout=30)
-        else:
+        if method not in ('GET', 'POST', 'PUT', 'DELETE'):
             return None
+        response = get_session().request(method, url, headers=headers, json=data)
         return response
     except Exception as e:
         print(f"Request failed: {e}")
@@ -48,6 +40,7 @@ def main():
     print("=" * 60)
     
     results = {}
+    ledger = ResourceLedger()
     
     # Test 1: Public Endpoints
     print("=== TESTING PUBLIC ENDPOINTS ===")
@@ -90,12 +83,10 @@ def main():
     print("=== TESTING AUTHENTICATION ===")
     
     # Super admin login
-    login_data = {"email": SUPER_ADMIN_EMAIL, "password": SUPER_ADMIN_PASSWORD}
-    response = make_request('POST', '/auth/login', login_data)
+    data, response = cached_login(make_request, BASE_URL, SUPER_ADMIN_EMAIL, SUPER_ADMIN_PASSWORD)
     
     super_admin_token = None
-    if response and response.status_code == 200:
-        data = response.json()
+    if data:
         if 'token' in data and data['user']['role'] == 'super_admin':
             super_admin_token = data['token']
             log_test("Super Admin Login", True, f"Logged in as {data['user']['email']}")
@@ -107,26 +98,30 @@ def main():
         log_test("Super Admin Login", False, f"Login failed - Status: {response.status_code if response else 'No response'}")
         results['super_admin_login'] = False
     
-    # Client registration
-    timestamp = int(time.time())
-    register_data = {
-        "businessName": f"Test Modular Co {timestamp}",
-        "email": f"modular{timestamp}@buildcrm.com",
-        "password": "testpass123",
-        "phone": "+91 9876543210",
-        "planId": "basic"
-    }
+    # Client registration (reuses the cached tenant unless HARNESS_FRESH_TENANT is set)
+    def register_data():
+        timestamp = int(time.time())
+        return {
+            "businessName": f"Test Modular Co {timestamp}",
+            "email": f"focused{timestamp}@buildcrm.com",
+            "password": "testpass123",
+            "phone": "+91 9876543210",
+            "planId": "basic"
+        }
     
-    response = make_request('POST', '/auth/register', register_data)
+    data, response, reused = cached_tenant(make_request, BASE_URL, 'focused', register_data)
     client_token = None
     client_id = None
     
-    if response and response.status_code == 200:
-        data = response.json()
+    if data:
         if 'token' in data and 'client' in data:
             client_token = data['token']
             client_id = data['client']['id']
-            log_test("Client Registration", True, f"Registered {register_data['businessName']}")
+            action = "Reusing cached tenant" if reused else "Registered"
+            if not reused:
+                ledger.record(BASE_URL, 'clients', client_id, token=client_token,
+                              email=data['email'], password=data['password'])
+            log_test("Client Registration", True, f"{action} {data['businessName']}")
             results['client_registration'] = True
         else:
             log_test("Client Registration", False, "Invalid registration response")
@@ -226,6 +221,7 @@ def main():
             data = response.json()
             if 'request' in data:
                 request_id = data['request']['id']
+                ledger.record(BASE_URL, 'module_requests', request_id)
                 log_test("Create Module Request", True, f"Created request: {request_id}")
                 results['create_module_request'] = True
             else:
@@ -250,7 +246,7 @@ def main():
         print("=== TESTING WHITE LABEL ACCESS CONTROL ===")
         
         response = make_request('GET', '/whitelabel', token=client_token)
-        if response and response.status_code == 403:
+        if response is not None and response.status_code == 403:
             data = response.json()
             if 'Enterprise' in data.get('message', ''):
                 log_test("White Label Access Control", True, "Correctly blocked non-Enterprise client")
@@ -281,9 +277,10 @@ def main():
         }
         
         response = make_request('POST', '/webhook/leads', webhook_data)
-        if response and response.status_code == 200:
+        if response and response.status_code in (200, 201):  # the live route answers 201 Created
             result = response.json()
             if 'leadId' in result:
+                ledger.record(BASE_URL, 'leads', result['leadId'], token=client_token, owner=client_id)
                 log_test("Webhook Leads", True, f"Lead created: {result['leadId']}")
                 results['webhook_leads'] = True
             else:
@@ -322,6 +319,9 @@ def main():
             results['sales_report'] = False
     
     # Summary
+    print("=== TEARDOWN ===")
+    print_teardown_summary(teardown(make_request, BASE_URL, ledger))
+    
     print("=" * 60)
     print("🏁 MODULAR API TEST SUMMARY")
     print("=" * 60)
@@ -334,6 +334,8 @@ def main():
         print(f"{status} {test_name.replace('_', ' ').title()}")
     
     print(f"\nOverall Result: {passed}/{total} tests passed ({passed/total*100:.1f}%)")
+    print_connection_summary()
+    print_latency_report()
     
     if passed >= total * 0.8:  # 80% pass rate
         print("🎉 MODULAR API STRUCTURE IS WORKING WELL!")
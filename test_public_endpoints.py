@@ -6,7 +6,7 @@ Quick test for public endpoints to verify they're working
 import requests
 import time
 
-BASE_URL = "https://expense-fix.preview.emergentagent.com/api"
+from harness.config import BASE_URL
 
 def test_public_endpoints():
     print("Testing public endpoints...")
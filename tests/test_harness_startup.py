@@ -0,0 +1,30 @@
+"""
+Start-up budget of the python -m harness CLI (harness.cli.check_startup)
+Set HARNESS_STARTUP_BUDGET_MS to loosen the budget on a slow machine.
+"""
+
+import pytest
+
+from harness.cli import STARTUP_PROBES, check_startup
+
+PROBE_IDS = [' '.join(argv) for argv in STARTUP_PROBES]
+
+
+@pytest.fixture(scope='module')
+def startup_report():
+    return check_startup(runs=3)
+
+
+@pytest.mark.parametrize('index', range(len(STARTUP_PROBES)), ids=PROBE_IDS)
+def test_light_commands_skip_heavy_imports(startup_report, index):
+    probe = startup_report['probes'][index]
+    assert not probe['heavy'], f"python -m harness {probe['argv']} imports {', '.join(probe['heavy'])}"
+
+
+@pytest.mark.parametrize('index', range(len(STARTUP_PROBES)), ids=PROBE_IDS)
+def test_start_up_within_budget(startup_report, index):
+    probe = startup_report['probes'][index]
+    slowest = ', '.join(f"{name} {micros / 1000:.1f}ms" for name, micros in probe['slowest_imports'])
+    assert probe['wall_ms'] <= startup_report['budget_ms'], (
+        f"python -m harness {probe['argv']} took {probe['wall_ms']:.0f}ms "
+        f"(budget {startup_report['budget_ms']:.0f}ms; slowest imports: {slowest})")